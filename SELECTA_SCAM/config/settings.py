@@ -42,4 +42,91 @@ APP_NAME = "SELECTA SCAM"
 APP_VERSION = "1.0.0"
 
 # Cadena de conexión para SQLAlchemy
-SQLALCHEMY_DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
\ No newline at end of file
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
+
+# Perfil de rendimiento de SQLite.
+# Estos PRAGMAs se aplican a cada conexión nueva que abre el engine de SQLAlchemy
+# (ver SELECTA_SCAM/utils/db_manager.py).
+# WAL permite que las lecturas de la interfaz no se bloqueen detrás de una escritura
+# de otro módulo. OJO: WAL necesita memoria compartida; si la base vive en una unidad
+# de red que no la soporte, cambia SQLITE_JOURNAL_MODE a "DELETE".
+SQLITE_JOURNAL_MODE = "WAL"
+SQLITE_SYNCHRONOUS = "NORMAL"          # OFF | NORMAL | FULL | EXTRA
+SQLITE_CACHE_SIZE_KB = 65536           # Caché de páginas por conexión (64 MB)
+SQLITE_MMAP_SIZE = 268435456           # Bytes mapeados en memoria (256 MB); 0 lo desactiva
+SQLITE_TEMP_STORE = "MEMORY"           # DEFAULT | FILE | MEMORY
+SQLITE_FOREIGN_KEYS = True
+SQLITE_BUSY_TIMEOUT_MS = 5000          # Espera ante un bloqueo antes de lanzar "database is locked"
+
+# Pool de conexiones y caché de sentencias del engine único (utils/db_manager.py).
+SQLALCHEMY_POOL_SIZE = 5               # Conexiones que el pool mantiene abiertas
+SQLALCHEMY_MAX_OVERFLOW = 10           # Conexiones extra permitidas en picos de carga
+SQLALCHEMY_QUERY_CACHE_SIZE = 1000     # Sentencias SQL compiladas que SQLAlchemy reutiliza
+SQLITE_CACHED_STATEMENTS = 256         # Sentencias preparadas que sqlite3 guarda por conexión
+
+# Consultas en segundo plano (utils/consultas_async.py).
+# Hilos del pool que ejecuta las consultas lanzadas desde la interfaz. Con WAL las
+# lecturas corren en paralelo; las escrituras siguen serializadas por SQLite.
+CONSULTAS_MAX_HILOS = 4
+
+# Búsqueda mientras se escribe (documentos y contabilidad): milisegundos sin teclear
+# antes de lanzar la búsqueda. 0 busca en cada tecla.
+BUSQUEDA_DEBOUNCE_MS = 250
+
+# Tabla de documentos: filas por página. La tabla pide la siguiente página
+# (paginación por clave sobre fecha_subida, id) al llegar al final del scroll.
+DOCUMENTOS_TAMANO_PAGINA = 300
+
+# Calendario: meses cuyos eventos se guardan en memoria (LRU). Se invalidan al
+# añadir, editar o eliminar eventos y al volver a mostrar el calendario.
+CALENDARIO_MESES_CACHE = 6
+CALENDARIO_MES_VIGENCIA_S = 60         # Un mes más antiguo se vuelve a consultar (radicados o clientes editados)
+
+# Cola de operaciones de archivos (utils/cola_archivos.py): copias y borrados fuera del
+# hilo de la interfaz, con diario en la tabla operaciones_archivo.
+ARCHIVOS_MAX_HILOS = 2
+# Reintentos cuando el archivo está bloqueado (p. ej. por el cliente de sincronización);
+# la espera se duplica en cada intento hasta ARCHIVOS_ESPERA_MAXIMA_MS.
+ARCHIVOS_REINTENTOS = 6
+ARCHIVOS_ESPERA_INICIAL_MS = 500
+ARCHIVOS_ESPERA_MAXIMA_MS = 30000
+# Bloque de lectura/escritura de las copias (utils/archivos.py); el SHA-256 se calcula en la misma pasada.
+ARCHIVOS_TAMANO_BLOQUE = 4 * 1024 * 1024
+
+# Visor de documentos: páginas que se renderizan por encima y por debajo de las visibles.
+# Las demás páginas son marcadores del tamaño de la página, sin pixmap.
+VISOR_PAGINAS_PRECARGA = 2
+# Memoria para páginas ya renderizadas (todas las resoluciones, compartida entre visores).
+VISOR_CACHE_PAGINAS_MB = 256
+
+# Miniaturas de la primera página (modulos/documentos/miniaturas.py): se generan en
+# procesos aparte y se guardan en disco; las ya usadas quedan también en memoria.
+MINIATURAS_DIR = os.path.join(DATA_DIR, 'miniaturas')
+MINIATURAS_LADO = 256                  # Píxeles del lado mayor
+MINIATURAS_PROCESOS = 2
+MINIATURAS_EN_MEMORIA = 500
+
+# Capas de texto del visor (modulos/documentos/capa_texto.py): palabras con su posición
+# por página, guardadas por contenido del documento para no volver a extraerlas ni a hacer OCR.
+CAPAS_TEXTO_DIR = os.path.join(DATA_DIR, 'capas_texto')
+
+# OCR (utils/ocr.py): las páginas escaneadas se reconocen en un pool de procesos.
+TESSERACT_CMD = r'C:\Program Files\Tesseract-OCR\tesseract.exe'  # Si no existe, se usa el del PATH
+OCR_DPI = 200
+OCR_PROCESOS = 0                       # 0 = un proceso por núcleo
+OCR_PAGINAS_EN_CURSO = 2               # Páginas encargadas a la vez por proceso (limita la memoria)
+OCR_CACHE_DIR = os.path.join(DATA_DIR, 'ocr')  # Resultados por (SHA-256 del archivo, página)
+
+# Vigilante de Descargas (modulos/procesos/procesos_watcher.py): un PDF se procesa cuando su
+# tamaño y fecha de modificación no cambian durante WATCHER_ESTABILIDAD_S segundos.
+WATCHER_SONDEO_S = 0.5                 # Cada cuánto se revisan los archivos en espera
+WATCHER_ESTABILIDAD_S = 2.0
+WATCHER_COLA_MAX = 100                 # Archivos listos esperando trabajador (la detección se frena si se llena)
+WATCHER_HILOS = 2                      # Trabajadores de extracción y movimiento (el OCR va al pool de procesos)
+WATCHER_REINTENTOS = 3                 # Intentos antes de marcar el trabajo como fallido
+WATCHER_REINTENTO_ESPERA_S = 5.0       # Espera antes del primer reintento; se duplica en cada intento
+# Índice en memoria radicado/cliente -> proceso del vigilante (modulos/procesos/procesos_clasificador.py)
+WATCHER_INDICE_REFRESCO_S = 30         # Cada cuánto se buscan procesos o clientes nuevos en la base de datos
+WATCHER_INDICE_RECARGA_S = 600         # Cada cuánto se recarga entero (recoge radicados editados)
+WATCHER_PAGINAS_CLASIFICACION = 3      # Páginas que se leen (y, si son escaneadas, se reconocen) para clasificar
+WATCHER_INDEXAR_COMPLETO = True        # OCR completo de lo movido si es escaneado, en segundo plano (caché de OCR)
@@ -0,0 +1,248 @@
+# SELECTA_SCAM/db/busqueda.py
+
+import logging
+import re
+import unicodedata
+from sqlalchemy import text, Integer, Float
+
+logger = logging.getLogger(__name__)
+
+# Tokenizador común: unicode61 sin diacríticos, para que "Perez" encuentre "Pérez"
+# y "Nunez" encuentre "Núñez". 'prefix' crea índices auxiliares para búsquedas
+# por prefijo (búsqueda mientras se escribe).
+TOKENIZADOR_FTS = "tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'"
+# Para el contenido de los archivos no se crean índices de prefijo: multiplicarían
+# el tamaño del índice y las búsquedas por prefijo siguen funcionando sin ellos.
+TOKENIZADOR_CONTENIDO = "tokenize='unicode61 remove_diacritics 2'"
+
+# Índices de texto completo disponibles: nombre lógico -> tabla FTS5.
+# El rowid de cada tabla FTS es el id de la fila original.
+INDICES_FTS = {
+    'clientes': 'clientes_fts',
+    'documentos': 'documentos_fts',
+    'procesos': 'procesos_fts',
+    'contenido': 'documento_texto_fts',
+}
+
+# Las revisiones de Alembic (0002, 0003) llevan su propia copia de este SQL: si se cambia
+# aquí, hay que agregar una revisión nueva que lo aplique a las bases existentes.
+SENTENCIAS_INSTALACION = [
+    # --- Tablas virtuales ---
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS clientes_fts USING fts5(nombre, numero_identificacion, {TOKENIZADOR_FTS})",
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS documentos_fts USING fts5(nombre, {TOKENIZADOR_FTS})",
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS procesos_fts USING fts5("
+    f"radicado, tipo, estado, juzgado, cliente_nombre, {TOKENIZADOR_FTS})",
+
+    # --- Clientes ---
+    """CREATE TRIGGER IF NOT EXISTS clientes_fts_ai AFTER INSERT ON clientes BEGIN
+        INSERT INTO clientes_fts(rowid, nombre, numero_identificacion)
+        VALUES (new.id, new.nombre, new.numero_identificacion);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS clientes_fts_ad AFTER DELETE ON clientes BEGIN
+        DELETE FROM clientes_fts WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS clientes_fts_au AFTER UPDATE OF nombre, numero_identificacion ON clientes BEGIN
+        DELETE FROM clientes_fts WHERE rowid = old.id;
+        INSERT INTO clientes_fts(rowid, nombre, numero_identificacion)
+        VALUES (new.id, new.nombre, new.numero_identificacion);
+        UPDATE procesos_fts SET cliente_nombre = new.nombre
+        WHERE rowid IN (SELECT id FROM procesos WHERE cliente_id = new.id);
+    END""",
+
+    # --- Documentos ---
+    """CREATE TRIGGER IF NOT EXISTS documentos_fts_ai AFTER INSERT ON documentos BEGIN
+        INSERT INTO documentos_fts(rowid, nombre) VALUES (new.id, new.nombre);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS documentos_fts_ad AFTER DELETE ON documentos BEGIN
+        DELETE FROM documentos_fts WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS documentos_fts_au AFTER UPDATE OF nombre ON documentos BEGIN
+        DELETE FROM documentos_fts WHERE rowid = old.id;
+        INSERT INTO documentos_fts(rowid, nombre) VALUES (new.id, new.nombre);
+    END""",
+
+    # --- Procesos (incluye el nombre del cliente para buscar "por cliente") ---
+    """CREATE TRIGGER IF NOT EXISTS procesos_fts_ai AFTER INSERT ON procesos BEGIN
+        INSERT INTO procesos_fts(rowid, radicado, tipo, estado, juzgado, cliente_nombre)
+        VALUES (new.id, new.radicado, new.tipo, new.estado, new.juzgado,
+                (SELECT nombre FROM clientes WHERE id = new.cliente_id));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS procesos_fts_ad AFTER DELETE ON procesos BEGIN
+        DELETE FROM procesos_fts WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS procesos_fts_au
+    AFTER UPDATE OF radicado, tipo, estado, juzgado, cliente_id ON procesos BEGIN
+        DELETE FROM procesos_fts WHERE rowid = old.id;
+        INSERT INTO procesos_fts(rowid, radicado, tipo, estado, juzgado, cliente_nombre)
+        VALUES (new.id, new.radicado, new.tipo, new.estado, new.juzgado,
+                (SELECT nombre FROM clientes WHERE id = new.cliente_id));
+    END""",
+]
+
+SENTENCIAS_RECONSTRUCCION = [
+    "DELETE FROM clientes_fts",
+    """INSERT INTO clientes_fts(rowid, nombre, numero_identificacion)
+       SELECT id, nombre, numero_identificacion FROM clientes""",
+    "DELETE FROM documentos_fts",
+    "INSERT INTO documentos_fts(rowid, nombre) SELECT id, nombre FROM documentos",
+    "DELETE FROM procesos_fts",
+    """INSERT INTO procesos_fts(rowid, radicado, tipo, estado, juzgado, cliente_nombre)
+       SELECT p.id, p.radicado, p.tipo, p.estado, p.juzgado, c.nombre
+       FROM procesos p LEFT JOIN clientes c ON c.id = p.cliente_id""",
+]
+
+# --- Contenido de los archivos (tabla documento_texto, ver models.DocumentoTexto) ---
+# Índice de contenido externo: el texto se guarda una sola vez, en documento_texto.
+SENTENCIAS_INSTALACION_CONTENIDO = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS documento_texto_fts USING fts5("
+    f"texto, content='documento_texto', content_rowid='documento_id', {TOKENIZADOR_CONTENIDO})",
+    """CREATE TRIGGER IF NOT EXISTS documento_texto_fts_ai AFTER INSERT ON documento_texto BEGIN
+        INSERT INTO documento_texto_fts(rowid, texto) VALUES (new.documento_id, new.texto);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS documento_texto_fts_ad AFTER DELETE ON documento_texto BEGIN
+        INSERT INTO documento_texto_fts(documento_texto_fts, rowid, texto)
+        VALUES ('delete', old.documento_id, old.texto);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS documento_texto_fts_au AFTER UPDATE ON documento_texto BEGIN
+        INSERT INTO documento_texto_fts(documento_texto_fts, rowid, texto)
+        VALUES ('delete', old.documento_id, old.texto);
+        INSERT INTO documento_texto_fts(rowid, texto) VALUES (new.documento_id, new.texto);
+    END""",
+    # Aunque foreign_keys esté desactivado, el texto se borra junto con su documento.
+    """CREATE TRIGGER IF NOT EXISTS documentos_texto_ad AFTER DELETE ON documentos BEGIN
+        DELETE FROM documento_texto WHERE documento_id = old.id;
+    END""",
+]
+
+SENTENCIAS_RECONSTRUCCION_CONTENIDO = [
+    "INSERT INTO documento_texto_fts(documento_texto_fts) VALUES ('rebuild')",
+]
+
+# Caché de las tablas FTS existentes en la base de datos (None = aún no comprobado).
+_tablas_fts = None
+
+
+def instalar_indices_busqueda(connection, reconstruir: bool = True):
+    """
+    Crea las tablas FTS5 y los triggers que las mantienen sincronizadas.
+    Con reconstruir=True vuelve a poblar los índices a partir de las tablas originales.
+    'connection' es una conexión de SQLAlchemy (engine.begin() u op.get_bind()).
+    """
+    global _tablas_fts
+    for sentencia in SENTENCIAS_INSTALACION + SENTENCIAS_INSTALACION_CONTENIDO:
+        connection.execute(text(sentencia))
+    if reconstruir:
+        for sentencia in SENTENCIAS_RECONSTRUCCION + SENTENCIAS_RECONSTRUCCION_CONTENIDO:
+            connection.execute(text(sentencia))
+    _tablas_fts = set(INDICES_FTS.values())
+    logger.info("Índices de búsqueda de texto completo instalados.")
+
+
+def fts_disponible(session, indice: str) -> bool:
+    """Indica si la tabla FTS5 del índice existe en la base de datos (se consulta una sola vez)."""
+    global _tablas_fts
+    if _tablas_fts is None:
+        nombres = ", ".join(f"'{nombre}'" for nombre in INDICES_FTS.values())
+        _tablas_fts = set(session.execute(
+            text(f"SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ({nombres})")
+        ).scalars())
+        faltantes = set(INDICES_FTS.values()) - _tablas_fts
+        if faltantes:
+            logger.warning(f"Índices FTS5 no instalados ({', '.join(sorted(faltantes))}); esas búsquedas usarán LIKE.")
+    return INDICES_FTS[indice] in _tablas_fts
+
+
+# Carácter de escape para LIKE: con él, '%' y '_' escritos por el usuario se buscan literalmente.
+ESCAPE_LIKE = "\\"
+_ASCII_MINUSCULAS = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+_TERMINO_NUMERICO = re.compile(r"[\d\s./-]*\d[\d\s./-]*")
+
+
+def construir_consulta_fts(termino: str) -> str | None:
+    """
+    Convierte el texto del buscador en una expresión MATCH de FTS5.
+    Cada palabra se busca como prefijo y todas deben aparecer ("juan per" -> "juan"* AND "per"*).
+    """
+    if not termino:
+        return None
+    palabras = re.findall(r"[^\W_]+", termino, flags=re.UNICODE)
+    if not palabras:
+        return None
+    return " ".join(f'"{palabra}"*' for palabra in palabras)
+
+
+def es_termino_numerico(termino: str | None) -> bool:
+    """
+    Indica si el término tiene forma de radicado o número de identificación (dígitos
+    con guiones, puntos o espacios). FTS5 solo encuentra prefijos de cada token, así que
+    para estos términos hay que sumar un LIKE '%termino%' que encuentre dígitos del medio o del final.
+    """
+    return bool(termino) and _TERMINO_NUMERICO.fullmatch(termino.strip()) is not None
+
+
+def subconsulta_ranking(indice: str, termino: str):
+    """
+    Devuelve una subconsulta (id, rank) con las coincidencias del índice indicado,
+    lista para hacer JOIN con la tabla original. rank es bm25: menor = más relevante.
+    Retorna None si el término no contiene palabras buscables.
+    """
+    expresion = construir_consulta_fts(termino)
+    if expresion is None:
+        return None
+    tabla = INDICES_FTS[indice]
+    return (
+        text(f"SELECT rowid AS id, bm25({tabla}) AS rank FROM {tabla} WHERE {tabla} MATCH :fts_{indice}")
+        .bindparams(**{f"fts_{indice}": expresion})
+        .columns(id=Integer, rank=Float)
+        .subquery(f"{tabla}_hits")
+    )
+
+
+def buscar(session, indice: str, termino: str, limite: int | None = None) -> list[tuple[int, float]]:
+    """
+    API de búsqueda ordenada por relevancia: devuelve [(id, rank), ...] del índice indicado.
+    """
+    expresion = construir_consulta_fts(termino)
+    if expresion is None:
+        return []
+    tabla = INDICES_FTS[indice]
+    sql = f"SELECT rowid, bm25({tabla}) AS rank FROM {tabla} WHERE {tabla} MATCH :expresion ORDER BY rank"
+    parametros = {'expresion': expresion}
+    if limite:
+        sql += " LIMIT :limite"
+        parametros['limite'] = int(limite)
+    return [tuple(fila) for fila in session.execute(text(sql), parametros).all()]
+
+
+def _normalizar_fts(texto: str) -> str:
+    """Minúsculas y sin diacríticos, como el tokenizador unicode61 remove_diacritics 2."""
+    descompuesto = unicodedata.normalize('NFKD', texto.casefold())
+    return "".join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+def patron_like(termino: str) -> str:
+    """'%termino%' con los comodines de LIKE escapados; usar con .like(patron, escape=ESCAPE_LIKE)."""
+    escapado = termino.replace(ESCAPE_LIKE, ESCAPE_LIKE * 2)
+    escapado = escapado.replace("%", ESCAPE_LIKE + "%").replace("_", ESCAPE_LIKE + "_")
+    return f"%{escapado}%"
+
+
+def coincide_like(texto: str | None, termino: str) -> bool:
+    """
+    Evalúa en memoria lower(texto) LIKE lower(patron_like(termino)) de SQLite: subcadena literal,
+    sin distinguir mayúsculas solo en letras ASCII (lower() de SQLite no convierte las demás).
+    """
+    return termino.translate(_ASCII_MINUSCULAS) in (texto or "").translate(_ASCII_MINUSCULAS)
+
+
+def coincide_fts(texto: str | None, termino: str) -> bool:
+    """
+    Evalúa en memoria la misma condición que construir_consulta_fts genera para MATCH:
+    cada palabra del término debe ser prefijo de alguna palabra del texto.
+    Sirve para refinar un resultado ya obtenido sin volver a la base de datos.
+    """
+    palabras = [_normalizar_fts(p) for p in re.findall(r"[^\W_]+", termino or "", flags=re.UNICODE)]
+    if not palabras:
+        return True
+    tokens = re.findall(r"[^\W_]+", _normalizar_fts(texto or ""), flags=re.UNICODE)
+    return all(any(token.startswith(palabra) for token in tokens) for palabra in palabras)
@@ -1,5 +1,5 @@
 # SELECTA_SCAM/db/models.py
-from sqlalchemy import Column, Integer, String, Date, DateTime, Boolean, ForeignKey, Text, Float
+from sqlalchemy import Column, Integer, String, Date, DateTime, Boolean, ForeignKey, Text, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import date, datetime 
 from sqlalchemy.ext.declarative import declarative_base
@@ -55,6 +55,13 @@ class Proceso(Base):
     robot_busquedas = relationship('RobotBusqueda', back_populates='proceso', cascade="all, delete-orphan")
     eventos = relationship('Evento', back_populates='proceso', cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Listado de procesos de un cliente (ProcesosDB.get_procesos_by_cliente_id)
+        Index('ix_procesos_cliente_eliminado', 'cliente_id', 'eliminado'),
+        # Listado filtrado de la pestaña Procesos (ProcesosDB.get_procesos_filtrados)
+        Index('ix_procesos_eliminado_estado_cliente', 'eliminado', 'estado', 'cliente_id'),
+    )
+
     def __repr__(self):
         return f"<Proceso(id={self.id}, radicado='{self.radicado}', cliente_id={self.cliente_id})>"
 
@@ -71,14 +78,94 @@ class Documento(Base):
     tipo_documento = Column(String)
     fecha_subida = Column(DateTime, default=datetime.now)
     eliminado = Column(Boolean, default=False)
+    # Huella del contenido: los documentos con el mismo sha256 comparten el objeto del almacén
+    sha256 = Column(String(64), nullable=True)
 
     proceso = relationship('Proceso', back_populates='documentos')
     cliente = relationship('Cliente', back_populates='documentos')
 
+    __table_args__ = (
+        # Filtros de DocumentosDB.get_documentos_filtered_as_tuples, ordenados por fecha_subida
+        Index('ix_documentos_eliminado_cliente_tipo_fecha',
+              'eliminado', 'cliente_id', 'tipo_documento', 'fecha_subida'),
+        # Listado sin filtro de cliente: papelera/activos ordenados por fecha
+        Index('ix_documentos_eliminado_fecha', 'eliminado', 'fecha_subida'),
+        # Detección de duplicados al subir (DocumentosDB.get_ubicacion_por_sha256)
+        Index('ix_documentos_sha256', 'sha256'),
+    )
+
     def __repr__(self):
         return f"<Documento(id={self.id}, nombre='{self.nombre}', proceso_id={self.proceso_id})>"
 
 
+class DocumentoTexto(Base):
+    __tablename__ = 'documento_texto'
+
+    # Texto extraído del archivo (capa de texto del PDF u OCR), indexado en documento_texto_fts
+    documento_id = Column(Integer, ForeignKey('documentos.id', ondelete='CASCADE'), primary_key=True)
+    texto = Column(Text, nullable=False, default='')
+    origen = Column(String, nullable=False)  # 'pdf', 'ocr', 'texto' o 'sin_texto'
+    paginas = Column(Integer, nullable=True)
+    fecha_extraccion = Column(DateTime, default=datetime.now)
+
+    def __repr__(self):
+        return (f"<DocumentoTexto(documento_id={self.documento_id}, origen='{self.origen}', "
+                f"caracteres={len(self.texto or '')})>")
+
+
+class OperacionArchivo(Base):
+    __tablename__ = 'operaciones_archivo'
+
+    # Diario de la cola de archivos (utils/cola_archivos.py): cada copia o borrado se registra
+    # antes de ejecutarse para poder retomarlo si la aplicación se cierra a mitad de camino.
+    id = Column(Integer, primary_key=True, index=True)
+    tipo = Column(String, nullable=False)  # 'copiar' o 'eliminar'
+    origen = Column(String, nullable=False)
+    destino = Column(String, nullable=True)
+    documento_id = Column(Integer, nullable=True)  # Sin FK: el documento puede borrarse antes que su archivo
+    estado = Column(String, nullable=False, default='pendiente')  # 'pendiente', 'hecha' o 'fallida'
+    intentos = Column(Integer, nullable=False, default=0)
+    ultimo_error = Column(Text, nullable=True)
+    fecha_creacion = Column(DateTime, default=datetime.now)
+    fecha_actualizacion = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    __table_args__ = (
+        # Operaciones por retomar al iniciar (ColaArchivos.reanudar)
+        Index('ix_operaciones_archivo_estado', 'estado'),
+    )
+
+    def __repr__(self):
+        return f"<OperacionArchivo(id={self.id}, tipo='{self.tipo}', estado='{self.estado}')>"
+
+
+class TrabajoDescarga(Base):
+    __tablename__ = 'trabajos_descargas'
+
+    # Diario del vigilante de Descargas (modulos/procesos/procesos_watcher.py). Un archivo
+    # descargado se identifica por (ruta, tamaño, mtime): el mismo archivo no se procesa dos
+    # veces y un movimiento interrumpido se completa al reiniciar.
+    id = Column(Integer, primary_key=True, index=True)
+    ruta_origen = Column(String, nullable=False)
+    tamano = Column(Integer, nullable=False)
+    mtime_ns = Column(Integer, nullable=False)
+    # 'pendiente', 'moviendo', 'movido', 'sin_proceso' o 'fallido'
+    estado = Column(String, nullable=False, default='pendiente')
+    destino = Column(String, nullable=True)
+    radicado = Column(String, nullable=True)
+    intentos = Column(Integer, nullable=False, default=0)
+    ultimo_error = Column(Text, nullable=True)
+    fecha_creacion = Column(DateTime, default=datetime.now)
+    fecha_actualizacion = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    __table_args__ = (
+        Index('ux_trabajos_descargas_archivo', 'ruta_origen', 'tamano', 'mtime_ns', unique=True),
+        Index('ix_trabajos_descargas_estado', 'estado'),
+    )
+
+    def __repr__(self):
+        return f"<TrabajoDescarga(id={self.id}, ruta_origen='{self.ruta_origen}', estado='{self.estado}')>"
+
+
 class TipoContable(Base):
     __tablename__ = 'tipos_contables'
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -112,11 +199,40 @@ class Contabilidad(Base):
     cliente = relationship("Cliente", back_populates="contabilidad")
     proceso = relationship("Proceso", back_populates="contabilidad")
 
+    __table_args__ = (
+        # Filtros de ContabilidadDB.get_filtered_contabilidad_records, ordenados por fecha
+        Index('ix_contabilidad_cliente_proceso_tipo_fecha', 'cliente_id', 'proceso_id', 'tipo_contable_id', 'fecha'),
+        # Listado completo ordenado por fecha
+        Index('ix_contabilidad_fecha', 'fecha'),
+    )
+
     def __repr__(self):
         tipo_nombre = self.tipo.nombre if self.tipo else 'N/A'
         return f"<Contabilidad(id={self.id}, tipo='{tipo_nombre}', monto={self.monto})>"
 
 
+class Saldo(Base):
+    __tablename__ = 'saldos'
+
+    # Totales de contabilidad por (cliente, proceso, tipo, mes). Los mantienen los triggers de
+    # db/saldos.py en cada INSERT, UPDATE o DELETE sobre contabilidad; no se escriben a mano.
+    cliente_id = Column(Integer, primary_key=True)
+    proceso_id = Column(Integer, primary_key=True, default=0)  # 0 = movimiento sin proceso
+    tipo_contable_id = Column(Integer, primary_key=True)
+    periodo = Column(String, primary_key=True)  # 'AAAA-MM'
+    total = Column(Float, nullable=False, default=0.0)
+    movimientos = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # Resumen de un proceso (la clave primaria ya cubre los filtros por cliente)
+        Index('ix_saldos_proceso', 'proceso_id'),
+    )
+
+    def __repr__(self):
+        return (f"<Saldo(cliente_id={self.cliente_id}, proceso_id={self.proceso_id}, "
+                f"tipo_contable_id={self.tipo_contable_id}, periodo='{self.periodo}', total={self.total})>")
+
+
 class Evento(Base):
     __tablename__ = 'eventos'
 
@@ -128,6 +244,11 @@ class Evento(Base):
 
     proceso = relationship('Proceso', back_populates='eventos')
 
+    __table_args__ = (
+        # Consultas por día/rango del calendario (CalendarioDB)
+        Index('ix_eventos_fecha_evento', 'fecha_evento'),
+    )
+
     def __repr__(self):
         return f"<Evento(id={self.id}, titulo='{self.titulo}', proceso_id={self.proceso_id})>"
 
@@ -0,0 +1,129 @@
+# SELECTA_SCAM/db/saldos.py
+
+import argparse
+import logging
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# Clave de la fila de saldos de un movimiento: el proceso nulo se guarda como 0 (las claves
+# con NULL no chocan en ON CONFLICT) y el periodo es el mes de la fecha.
+_CLAVE = ("{f}.cliente_id, COALESCE({f}.proceso_id, 0), {f}.tipo_contable_id, "
+          "COALESCE(strftime('%Y-%m', {f}.fecha), '')")
+_COLUMNAS_CLAVE = "cliente_id, proceso_id, tipo_contable_id, periodo"
+_DONDE_CLAVE_OLD = ("cliente_id = old.cliente_id AND proceso_id = COALESCE(old.proceso_id, 0) "
+                    "AND tipo_contable_id = old.tipo_contable_id "
+                    "AND periodo = COALESCE(strftime('%Y-%m', old.fecha), '')")
+
+_SUMAR_NEW = f"""INSERT INTO saldos({_COLUMNAS_CLAVE}, total, movimientos)
+        VALUES ({_CLAVE.format(f='new')}, new.monto, 1)
+        ON CONFLICT({_COLUMNAS_CLAVE})
+        DO UPDATE SET total = total + excluded.total, movimientos = movimientos + 1;"""
+_RESTAR_OLD = f"""UPDATE saldos SET total = total - old.monto, movimientos = movimientos - 1
+        WHERE {_DONDE_CLAVE_OLD};
+        DELETE FROM saldos WHERE {_DONDE_CLAVE_OLD} AND movimientos <= 0;"""
+
+# La revisión 0008 de Alembic lleva su propia copia de este SQL: si se cambia aquí,
+# hay que agregar una revisión nueva que lo aplique a las bases existentes.
+TRIGGERS = ['contabilidad_saldos_ai', 'contabilidad_saldos_ad', 'contabilidad_saldos_au']
+
+SENTENCIAS_INSTALACION = [
+    f"""CREATE TRIGGER IF NOT EXISTS contabilidad_saldos_ai AFTER INSERT ON contabilidad BEGIN
+        {_SUMAR_NEW}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS contabilidad_saldos_ad AFTER DELETE ON contabilidad BEGIN
+        {_RESTAR_OLD}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS contabilidad_saldos_au
+    AFTER UPDATE OF cliente_id, proceso_id, tipo_contable_id, monto, fecha ON contabilidad BEGIN
+        {_RESTAR_OLD}
+        {_SUMAR_NEW}
+    END""",
+]
+
+_AGREGADO_CONTABILIDAD = f"""SELECT {_CLAVE.format(f='contabilidad')}, SUM(monto), COUNT(*)
+    FROM contabilidad GROUP BY 1, 2, 3, 4"""
+
+SENTENCIAS_RECONSTRUCCION = [
+    "DELETE FROM saldos",
+    f"INSERT INTO saldos({_COLUMNAS_CLAVE}, total, movimientos) {_AGREGADO_CONTABILIDAD}",
+]
+
+# Diferencia admitida entre el saldo guardado y el recalculado (sumas y restas de Float).
+TOLERANCIA = 0.005
+
+# Caché de la existencia de la tabla saldos (None = aún no comprobado).
+_saldos_instalados = None
+
+
+def instalar_saldos(connection, reconstruir: bool = True):
+    """
+    Crea los triggers que mantienen la tabla saldos al día con contabilidad.
+    Con reconstruir=True la vuelve a calcular desde cero.
+    'connection' es una conexión de SQLAlchemy (engine.begin() u op.get_bind()).
+    """
+    global _saldos_instalados
+    for sentencia in SENTENCIAS_INSTALACION:
+        connection.execute(text(sentencia))
+    if reconstruir:
+        reconstruir_saldos(connection)
+    _saldos_instalados = True
+    logger.info("Saldos de contabilidad instalados.")
+
+
+def reconstruir_saldos(connection):
+    for sentencia in SENTENCIAS_RECONSTRUCCION:
+        connection.execute(text(sentencia))
+
+
+def verificar_saldos(connection) -> list[tuple]:
+    """
+    Compara la tabla saldos con el agregado de contabilidad.
+    Retorna las diferencias: [(clave, total guardado o None, total recalculado o None), ...].
+    """
+    esperados = {tuple(fila[:4]): (fila[4], fila[5]) for fila in connection.execute(text(_AGREGADO_CONTABILIDAD))}
+    guardados = {tuple(fila[:4]): (fila[4], fila[5]) for fila in connection.execute(
+        text(f"SELECT {_COLUMNAS_CLAVE}, total, movimientos FROM saldos")
+    )}
+    diferencias = []
+    for clave in esperados.keys() | guardados.keys():
+        esperado = esperados.get(clave)
+        guardado = guardados.get(clave)
+        if (esperado is None or guardado is None or esperado[1] != guardado[1]
+                or abs(esperado[0] - guardado[0]) > TOLERANCIA):
+            diferencias.append((clave, guardado[0] if guardado else None, esperado[0] if esperado else None))
+    return sorted(diferencias)
+
+
+def saldos_disponibles(session) -> bool:
+    """Indica si la tabla saldos y sus triggers existen (se consulta una sola vez)."""
+    global _saldos_instalados
+    if _saldos_instalados is None:
+        trigger = session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = :nombre"),
+            {'nombre': TRIGGERS[0]}
+        ).first()
+        _saldos_instalados = trigger is not None
+        if not _saldos_instalados:
+            logger.warning("Tabla saldos no instalada; los resúmenes de contabilidad "
+                           "se calcularán sobre los movimientos.")
+    return _saldos_instalados
+
+
+if __name__ == "__main__":
+    # Uso: python -m SELECTA_SCAM.db.saldos [--reconstruir]
+    from SELECTA_SCAM.utils.db_manager import engine
+
+    parser = argparse.ArgumentParser(description="Verifica (o reconstruye) la tabla saldos a partir de contabilidad.")
+    parser.add_argument("--reconstruir", action="store_true", help="Recalcula la tabla desde cero")
+    args = parser.parse_args()
+
+    with engine.begin() as connection:
+        if args.reconstruir:
+            instalar_saldos(connection, reconstruir=True)
+            print("Saldos reconstruidos.")
+        diferencias = verificar_saldos(connection)
+    for clave, guardado, esperado in diferencias:
+        print(f"[DIFERENCIA] {clave}: guardado={guardado} recalculado={esperado}")
+    print(f"{len(diferencias)} diferencias.")
+    raise SystemExit(1 if diferencias else 0)
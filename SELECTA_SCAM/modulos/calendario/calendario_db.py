@@ -9,7 +9,7 @@ from datetime import datetime, date
 
 # --- INICIO DE CORRECCIONES ---
 # Importaciones del nuevo sistema unificado
-from ...db.models import Evento
+from ...db.models import Evento, Proceso, Cliente
 from ...utils.db_manager import get_db_session
 # --- FIN DE CORRECCIONES ---
 
@@ -59,6 +59,29 @@ class CalendarioDB:
                 Evento.fecha_evento <= end_of_day
             ).all()
 
+    def get_eventos_para_lista(self, fecha: date) -> list[tuple]:
+        """Eventos de una fecha (ver get_eventos_para_lista_entre)."""
+        return self.get_eventos_para_lista_entre(fecha, fecha)
+
+    def get_eventos_para_lista_entre(self, start_date: date, end_date: date) -> list[tuple]:
+        """
+        Eventos de un rango de fechas con el radicado del proceso y el nombre del cliente, en una sola consulta.
+        Retorna tuplas (id, fecha_evento, titulo, descripcion, radicado, nombre_cliente), seguras fuera de la sesión.
+        """
+        with self.get_session() as session:
+            start_dt = datetime.combine(start_date, datetime.min.time())
+            end_dt = datetime.combine(end_date, datetime.max.time())
+            filas = session.query(
+                Evento.id, Evento.fecha_evento, Evento.titulo, Evento.descripcion,
+                Proceso.radicado, Cliente.nombre
+            ).outerjoin(Proceso, Proceso.id == Evento.proceso_id).outerjoin(
+                Cliente, Cliente.id == Proceso.cliente_id
+            ).filter(
+                Evento.fecha_evento >= start_dt,
+                Evento.fecha_evento <= end_dt
+            ).order_by(Evento.fecha_evento, Evento.id).all()
+            return [tuple(fila) for fila in filas]
+
     def update_evento(self, evento_id: int, **data) -> bool:
         """Actualiza un evento existente."""
         with self.get_session() as session:
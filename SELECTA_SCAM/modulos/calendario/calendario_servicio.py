@@ -0,0 +1,122 @@
+# SELECTA_SCAM/modulos/calendario/calendario_servicio.py
+
+import calendar
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+
+from .calendario_db import CalendarioDB
+from ...config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CalendarioServicio:
+    """
+    Datos del calendario por mes. Cada mes se trae con una sola consulta (eventos con
+    radicado y cliente) y se guarda en un caché LRU; los clics sobre días de un mes ya
+    cargado no vuelven a la base de datos.
+
+    Las escrituras deben pasar por add_evento/update_evento/delete_evento para que el
+    caché se invalide. Los cambios hechos fuera del calendario (un cliente renombrado, un
+    radicado corregido, un proceso eliminado con sus eventos) se ven al pasar
+    CALENDARIO_MES_VIGENCIA_S o al llamar a invalidar().
+    get_eventos_mes puede llamarse desde un hilo del pool de consultas.
+    """
+
+    def __init__(self, calendario_db: CalendarioDB, max_meses: int = None):
+        self.logger = logger
+        self.calendario_db = calendario_db
+        self.max_meses = max_meses or settings.CALENDARIO_MESES_CACHE
+        self._meses = OrderedDict()  # (anio, mes) -> (instante de la consulta, {date: [tuplas de evento]})
+        self._lock = threading.Lock()
+        # Aumenta con cada invalidación: un mes consultado antes de una escritura no se guarda.
+        self._version = 0
+
+    @staticmethod
+    def _clave_mes(fecha: date) -> tuple[int, int]:
+        return fecha.year, fecha.month
+
+    def _mes_vigente(self, clave: tuple[int, int]) -> dict | None:
+        """Eventos del mes si está en caché y no ha vencido (llamar con el lock tomado)."""
+        entrada = self._meses.get(clave)
+        if entrada is None:
+            return None
+        if time.monotonic() - entrada[0] >= settings.CALENDARIO_MES_VIGENCIA_S:
+            del self._meses[clave]
+            return None
+        self._meses.move_to_end(clave)
+        return entrada[1]
+
+    def get_eventos_mes(self, anio: int, mes: int) -> dict[date, list[tuple]]:
+        """
+        Eventos del mes agrupados por día. Cada evento es una tupla
+        (id, fecha_evento, titulo, descripcion, radicado, nombre_cliente).
+        """
+        clave = (anio, mes)
+        with self._lock:
+            por_dia = self._mes_vigente(clave)
+            if por_dia is not None:
+                return por_dia
+            version = self._version
+            consultado = time.monotonic()
+
+        ultimo_dia = calendar.monthrange(anio, mes)[1]
+        filas = self.calendario_db.get_eventos_para_lista_entre(date(anio, mes, 1), date(anio, mes, ultimo_dia))
+        por_dia = {}
+        for fila in filas:
+            por_dia.setdefault(fila[1].date(), []).append(fila)
+
+        with self._lock:
+            if version == self._version:
+                self._meses[clave] = (consultado, por_dia)
+                self._meses.move_to_end(clave)
+                while len(self._meses) > self.max_meses:
+                    self._meses.popitem(last=False)
+        self.logger.debug(f"Calendario: mes {anio}-{mes:02d} cargado ({len(filas)} eventos).")
+        return por_dia
+
+    def get_eventos_dia(self, fecha: date) -> list[tuple]:
+        """Eventos de un día, a partir del mes (cacheado o no)."""
+        return self.get_eventos_mes(fecha.year, fecha.month).get(fecha, [])
+
+    def get_eventos_dia_en_cache(self, fecha: date) -> list[tuple] | None:
+        """Eventos de un día si su mes está en memoria; None si hay que consultar."""
+        with self._lock:
+            mes = self._mes_vigente(self._clave_mes(fecha))
+            return None if mes is None else mes.get(fecha, [])
+
+    def get_conteos_mes(self, anio: int, mes: int) -> dict[date, int]:
+        """Número de eventos por día del mes (solo días con eventos), para resaltar el calendario."""
+        return {dia: len(eventos) for dia, eventos in self.get_eventos_mes(anio, mes).items()}
+
+    def invalidar(self, *fechas):
+        """Olvida los meses de las fechas indicadas, o todos si no se indica ninguna."""
+        with self._lock:
+            self._version += 1
+            if not fechas:
+                self._meses.clear()
+                return
+            for fecha in fechas:
+                if fecha is not None:
+                    self._meses.pop(self._clave_mes(fecha), None)
+
+    # --- Escrituras (invalidan el caché) ---
+
+    def add_evento(self, proceso_id: int, titulo: str, descripcion: str, fecha_evento: datetime) -> int | None:
+        evento_id = self.calendario_db.add_evento(proceso_id, titulo, descripcion, fecha_evento)
+        self.invalidar(fecha_evento)
+        return evento_id
+
+    def update_evento(self, evento_id: int, **data) -> bool:
+        actualizado = self.calendario_db.update_evento(evento_id, **data)
+        # Se desconoce la fecha anterior del evento: puede haberse movido de mes.
+        self.invalidar()
+        return actualizado
+
+    def delete_evento(self, evento_id: int) -> bool:
+        eliminado = self.calendario_db.delete_evento(evento_id)
+        self.invalidar()
+        return eliminado
@@ -2,10 +2,13 @@
 
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QCalendarWidget, QLabel, QListWidget, QListWidgetItem, QPushButton, QHBoxLayout, QMessageBox, QInputDialog, QDateTimeEdit, QDialog, QFormLayout
 from PyQt5.QtCore import QDate, QDateTime, Qt, pyqtSignal
-from PyQt5.QtGui import QFont
+from PyQt5.QtGui import QFont, QTextCharFormat, QColor
+from datetime import datetime
 from SELECTA_SCAM.utils.db_manager import get_db_session # <-- Importación CORRECTA para SQLAlchemy
 from SELECTA_SCAM.db.models import Evento, Proceso # Necesitamos el modelo Evento y Proceso si se relaciona
 from SELECTA_SCAM.modulos.calendario.calendario_db import CalendarioDB # Importa la nueva clase CalendarioDB
+from SELECTA_SCAM.modulos.calendario.calendario_servicio import CalendarioServicio
+from SELECTA_SCAM.utils.consultas_async import EjecutorConsultas
 
 import logging
 
@@ -81,7 +84,14 @@ class AddEventDialog(QDialog):
 class CalendarioWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.calendario_db = CalendarioDB()
+        # Meses de eventos en caché; las escrituras pasan por el servicio para invalidarlo
+        self.servicio = CalendarioServicio(self.calendario_db)
+        self.consultas = EjecutorConsultas(self)
+        self._dias_resaltados = []
+        self._mostrado = False
         self.init_ui()
+        self.load_month(self.calendar.yearShown(), self.calendar.monthShown())
         self.load_events_for_date(QDate.currentDate()) # Carga los eventos para la fecha actual al inicio
 
     def init_ui(self):
@@ -90,6 +100,7 @@ class CalendarioWidget(QWidget):
         # Calendar Widget
         self.calendar = QCalendarWidget(self)
         self.calendar.clicked[QDate].connect(self.load_events_for_date)
+        self.calendar.currentPageChanged.connect(self.load_month)
         main_layout.addWidget(self.calendar)
 
         # Event List Label
@@ -138,43 +149,81 @@ class CalendarioWidget(QWidget):
                 session.close()
         return procesos_list
 
+    def load_month(self, year: int, month: int):
+        """Pide en segundo plano los conteos por día del mes visible para resaltar los días con eventos."""
+        self.consultas.ejecutar(
+            'conteos_mes', self.servicio.get_conteos_mes, year, month,
+            al_terminar=self.on_month_loaded, al_fallar=self.on_events_failed
+        )
+
+    def on_month_loaded(self, conteos: dict):
+        # Quita el resaltado del mes anterior y marca los días con eventos
+        for dia in self._dias_resaltados:
+            self.calendar.setDateTextFormat(dia, QTextCharFormat())
+        self._dias_resaltados = []
+        for dia, cantidad in conteos.items():
+            formato = QTextCharFormat()
+            formato.setFontWeight(QFont.Bold)
+            formato.setBackground(QColor("#F3D3E0"))
+            formato.setToolTip(f"{cantidad} evento(s)")
+            fecha_q = QDate(dia.year, dia.month, dia.day)
+            self.calendar.setDateTextFormat(fecha_q, formato)
+            self._dias_resaltados.append(fecha_q)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Al volver al calendario, lo editado en otros módulos (clientes, procesos) se vuelve a consultar
+        if self._mostrado:
+            self.servicio.invalidar()
+            self.refresh_events()
+        self._mostrado = True
+
+    def refresh_events(self):
+        """Recarga el mes visible y los eventos del día seleccionado (después de una escritura)."""
+        self.load_month(self.calendar.yearShown(), self.calendar.monthShown())
+        self.load_events_for_date(self.calendar.selectedDate())
+
     def load_events_for_date(self, date_q: QDate):
+        """
+        Muestra los eventos de la fecha desde el caché del mes; si el mes no está cargado,
+        lo pide en segundo plano y la lista se llena en on_events_loaded.
+        Si se hace clic en otra fecha antes de que termine, el resultado anterior se descarta.
+        """
         logging.debug(f"Cargando eventos para la fecha: {date_q.toString(Qt.ISODate)}")
-        self.event_list_widget.clear()
         selected_date = date_q.toPyDate() # Convierte QDate a Python date
-        
-        session = None
-        try:
-            session = get_db_session()
-            calendario_db = CalendarioDB(session)
-            events = calendario_db.get_eventos_by_date(selected_date)
+        eventos = self.servicio.get_eventos_dia_en_cache(selected_date)
+        if eventos is not None:
+            self.consultas.cancelar('eventos_del_dia')
+            self.on_events_loaded(eventos)
+            return
+        self.consultas.ejecutar(
+            'eventos_del_dia', self.servicio.get_eventos_dia, selected_date,
+            al_terminar=self.on_events_loaded, al_fallar=self.on_events_failed
+        )
 
-            if not events:
-                self.event_list_widget.addItem("No hay eventos para esta fecha.")
-                return
+    def on_events_loaded(self, events: list):
+        self.event_list_widget.clear()
+        if not events:
+            self.event_list_widget.addItem("No hay eventos para esta fecha.")
+            return
 
-            for event in events:
-                # Mostrar el radicado del proceso si es posible
-                proceso_radicado = "N/A"
-                if event.proceso_id:
-                    proceso = session.query(Proceso).filter(Proceso.id == event.proceso_id).first()
-                    if proceso:
-                        proceso_radicado = proceso.radicado
-
-                item_text = (f"[{event.fecha_evento.strftime('%H:%M')}] "
-                             f"Proceso: {proceso_radicado} - "
-                             f"{event.titulo}: {event.descripcion}")
-                
-                item = QListWidgetItem(item_text)
-                item.setData(Qt.UserRole, event.id) # Guarda el ID del evento en el item
-                self.event_list_widget.addItem(item)
-            logging.debug(f"Eventos cargados: {len(events)}")
-        except Exception as e:
-            logging.error(f"Error al cargar eventos: {e}")
-            QMessageBox.critical(self, "Error de BD", f"Error al cargar eventos: {e}")
-        finally:
-            if session:
-                session.close()
+        for event_id, fecha_evento, titulo, descripcion, radicado, nombre_cliente in events:
+            # Mostrar el radicado del proceso y el cliente si es posible
+            proceso_radicado = radicado or "N/A"
+            cliente = f" ({nombre_cliente})" if nombre_cliente else ""
+            item_text = (f"[{fecha_evento.strftime('%H:%M')}] "
+                         f"Proceso: {proceso_radicado}{cliente} - "
+                         f"{titulo}: {descripcion}")
+
+            item = QListWidgetItem(item_text)
+            item.setData(Qt.UserRole, event_id) # Guarda el ID del evento en el item
+            self.event_list_widget.addItem(item)
+        logging.debug(f"Eventos cargados: {len(events)}")
+
+    def on_events_failed(self, error: Exception):
+        logging.error(f"Error al cargar eventos: {error}")
+        self.event_list_widget.clear()
+        QMessageBox.critical(self, "Error de BD", f"Error al cargar eventos: {error}")
 
     def add_event(self):
         procesos = self.get_procesos_for_dialog()
@@ -189,22 +238,16 @@ class CalendarioWidget(QWidget):
                 QMessageBox.warning(self, "Datos Incompletos", "Por favor, complete todos los campos requeridos para el evento.")
                 return
             
-            session = None
             try:
-                session = get_db_session()
-                calendario_db = CalendarioDB(session)
-                event_id = calendario_db.add_evento(proceso_id, titulo, descripcion, fecha_hora)
+                event_id = self.servicio.add_evento(proceso_id, titulo, descripcion, fecha_hora)
                 if event_id:
                     QMessageBox.information(self, "Éxito", "Evento añadido correctamente.")
-                    self.load_events_for_date(self.calendar.selectedDate())
+                    self.refresh_events()
                 else:
                     QMessageBox.critical(self, "Error", "No se pudo añadir el evento.")
             except Exception as e:
                 logging.error(f"Error al añadir evento desde el diálogo: {e}")
                 QMessageBox.critical(self, "Error de BD", f"Error al añadir evento: {e}")
-            finally:
-                if session:
-                    session.close()
 
     def edit_event(self):
         selected_item = self.event_list_widget.currentItem()
@@ -217,7 +260,6 @@ class CalendarioWidget(QWidget):
         session = None
         try:
             session = get_db_session()
-            calendario_db = CalendarioDB(session)
             evento_a_editar = session.query(Evento).filter(Evento.id == event_id).first()
             if not evento_a_editar:
                 QMessageBox.warning(self, "Evento no encontrado", "El evento seleccionado no existe en la base de datos.")
@@ -252,7 +294,7 @@ class CalendarioWidget(QWidget):
 
             if ok1 and ok2 and ok3:
                 # No modificamos el proceso_id en la edición por simplicidad, se podría añadir
-                success = calendario_db.update_evento(
+                success = self.servicio.update_evento(
                     event_id, 
                     titulo=new_title, 
                     descripcion=new_description, 
@@ -260,7 +302,7 @@ class CalendarioWidget(QWidget):
                 )
                 if success:
                     QMessageBox.information(self, "Éxito", "Evento actualizado correctamente.")
-                    self.load_events_for_date(self.calendar.selectedDate())
+                    self.refresh_events()
                 else:
                     QMessageBox.critical(self, "Error", "No se pudo actualizar el evento.")
             else:
@@ -285,19 +327,13 @@ class CalendarioWidget(QWidget):
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         
         if reply == QMessageBox.Yes:
-            session = None
             try:
-                session = get_db_session()
-                calendario_db = CalendarioDB(session)
-                success = calendario_db.delete_evento(event_id)
+                success = self.servicio.delete_evento(event_id)
                 if success:
                     QMessageBox.information(self, "Éxito", "Evento eliminado correctamente.")
-                    self.load_events_for_date(self.calendar.selectedDate())
+                    self.refresh_events()
                 else:
                     QMessageBox.critical(self, "Error", "No se pudo eliminar el evento.")
             except Exception as e:
                 logging.error(f"Error al eliminar evento: {e}")
-                QMessageBox.critical(self, "Error de BD", f"Error al eliminar evento: {e}")
-            finally:
-                if session:
-                    session.close()
\ No newline at end of file
+                QMessageBox.critical(self, "Error de BD", f"Error al eliminar evento: {e}")
\ No newline at end of file
@@ -4,6 +4,7 @@ from contextlib import contextmanager
 from datetime import datetime
 from sqlalchemy import or_, cast, String
 from ...db.models import Cliente
+from ...db import busqueda
 from ...utils.db_manager import get_db_session
 
 logger = logging.getLogger(__name__)
@@ -42,13 +43,30 @@ class ClientesDB:
             )
 
             conditions = []
+            orden = [Cliente.id]
             if solo_eliminados: conditions.append(Cliente.eliminado == True)
             elif not incluir_eliminados: conditions.append(Cliente.eliminado == False)
             if query:
-                pattern = f"%{query}%"
-                conditions.append(or_(Cliente.nombre.ilike(pattern), cast(Cliente.id, String).ilike(pattern)))
+                hits = None
+                if busqueda.fts_disponible(session, 'clientes'):
+                    hits = busqueda.subconsulta_ranking('clientes', query)
+                if hits is not None:
+                    # Índice FTS5: coincidencias por prefijo, sin tildes, ordenadas por relevancia
+                    q = q.outerjoin(hits, hits.c.id == Cliente.id)
+                    condicion = hits.c.id.isnot(None)
+                    if busqueda.es_termino_numerico(query):
+                        # FTS5 solo busca prefijos: como en el LIKE de abajo, el id y la identificación
+                        # se buscan también por contenido ("2" encuentra al cliente 12)
+                        patron = f"%{query.strip()}%"
+                        condicion = or_(condicion, cast(Cliente.id, String).ilike(patron),
+                                        Cliente.numero_identificacion.ilike(patron))
+                    conditions.append(condicion)
+                    orden = [hits.c.rank.is_(None), hits.c.rank, Cliente.id]
+                else:
+                    pattern = f"%{query}%"
+                    conditions.append(or_(Cliente.nombre.ilike(pattern), cast(Cliente.id, String).ilike(pattern)))
             if conditions: q = q.filter(*conditions)
-            resultados = q.order_by(Cliente.id).all()
+            resultados = q.order_by(*orden).all()
             return resultados
 
 
@@ -124,6 +142,13 @@ class ClientesDB:
             try:
                 # Usa .options(joinedload(Cliente.procesos)) para cargar datos relacionados
                 # Usa .all() para forzar la ejecución de la consulta antes de que la sesión se cierre
+                hits = None
+                if busqueda.fts_disponible(session, 'clientes'):
+                    hits = busqueda.subconsulta_ranking('clientes', name_text)
+                if hits is not None:
+                    return session.query(Cliente.id, Cliente.nombre).join(
+                        hits, hits.c.id == Cliente.id
+                    ).order_by(hits.c.rank).all()
                 clientes = session.query(Cliente).filter(Cliente.nombre.ilike(f'%{name_text}%')).all()
                 # Extrae los datos necesarios en un formato simple (list of tuples)
                 return [(c.id, c.nombre) for c in clientes]
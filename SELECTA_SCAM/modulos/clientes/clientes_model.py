@@ -3,6 +3,7 @@ import logging
 from PyQt5.QtCore import QAbstractTableModel, QVariant, Qt, pyqtSignal
 from PyQt5.QtGui import QColor
 from datetime import datetime
+from SELECTA_SCAM.utils.consultas_async import EjecutorConsultas
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +16,7 @@ class ClientesModel(QAbstractTableModel):
         super().__init__(parent)
         self.clientes_logic = clientes_logic_instance
         self._data = []
+        self.consultas = EjecutorConsultas(self)
         #self.load_data()
 
     def rowCount(self, parent=None): return len(self._data)
@@ -60,12 +62,32 @@ class ClientesModel(QAbstractTableModel):
 
     def load_data(self, incluir_eliminados: bool = False, solo_eliminados: bool = False, query: str = None):
         """Refresca la tabla y emite una señal si la papelera queda vacía."""
-        self.beginResetModel()
-        self._data = self.clientes_logic.get_clientes_data(
+        # Una carga síncrona deja obsoleta cualquier carga en segundo plano en curso.
+        self.consultas.cancelar('clientes')
+        data = self.clientes_logic.get_clientes_data(
             incluir_eliminados=incluir_eliminados,
             solo_eliminados=solo_eliminados,
             query=query
         )
+        self._set_data(data, solo_eliminados)
+
+    def load_data_async(self, incluir_eliminados: bool = False, solo_eliminados: bool = False, query: str = None):
+        """
+        Igual que load_data, pero la consulta corre en el pool de consultas.
+        Si entretanto se pide otra carga, el resultado de esta se descarta.
+        """
+        self.consultas.ejecutar(
+            'clientes', self.clientes_logic.get_clientes_data,
+            incluir_eliminados=incluir_eliminados,
+            solo_eliminados=solo_eliminados,
+            query=query,
+            al_terminar=lambda data: self._set_data(data, solo_eliminados),
+            al_fallar=lambda e: self.error_occurred.emit(f"Error al cargar clientes: {e}")
+        )
+
+    def _set_data(self, data: list, solo_eliminados: bool):
+        self.beginResetModel()
+        self._data = data
         self.endResetModel()
 
         # --- LÓGICA DE RETORNO AUTOMÁTICO ---
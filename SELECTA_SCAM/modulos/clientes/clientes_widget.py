@@ -157,9 +157,9 @@ class ClientesWidget(QWidget):
         layout.addLayout(bottom_layout)
 
     def filtrar_datos(self):
-        """Llama a load_data respetando si la vista de papelera está activa."""
+        """Carga en segundo plano respetando si la vista de papelera está activa."""
         texto_busqueda = self.search_input.text()
-        self.clientes_model.load_data(query=texto_busqueda, solo_eliminados=self.mostrando_papelera)
+        self.clientes_model.load_data_async(query=texto_busqueda, solo_eliminados=self.mostrando_papelera)
 
     def toggle_papelera_view(self):
         """El interruptor principal entre la vista de activos y la papelera."""
@@ -8,6 +8,8 @@ from SELECTA_SCAM.modulos.procesos.procesos_logic import ProcesosLogic
 from SELECTA_SCAM.modulos.contabilidad.contabilidad_model import ContabilidadModel
 
 from SELECTA_SCAM.modulos.contabilidad.contabilidad_pdf import generar_pdf_resumen_contabilidad
+from SELECTA_SCAM.utils.consultas_async import EjecutorConsultas
+from SELECTA_SCAM.utils.busqueda_incremental import BusquedaIncremental
 from PyQt5.QtWidgets import QMessageBox
 
 
@@ -34,6 +36,8 @@ class ContabilidadController(QObject):
         self.clientes_logic = clientes_logic
         self.procesos_logic = procesos_logic
         self.logger = logger
+        self.consultas = EjecutorConsultas(self)
+        self.busqueda_incremental = BusquedaIncremental(ContabilidadLogic.filtrar_registros_display)
         self.logger.info("ContabilidadController: Inicializado.")
 
     def get_filtered_documents(self, cliente_id: int = None, search_term: str = None, tipo_doc_id: int = None):
@@ -47,56 +51,107 @@ class ContabilidadController(QObject):
         # En: contabilidad_controller.py
     # Reemplaza el método completo con este:
 
+    def _consultar_registros_y_resumen(self, cliente_id: int = None, proceso_id: int = None,
+                                       search_term: str = None, tipo_id: int = None) -> tuple[list, dict]:
+        """
+        Obtiene los registros para la tabla y el resumen de totales con los MISMOS filtros.
+        El resumen es una consulta agregada aparte. No emite señales.
+        """
+        filtros = dict(cliente_id=cliente_id, proceso_id=proceso_id, search_term=search_term, tipo_id=tipo_id)
+        records = self.contabilidad_logic.get_contabilidad_data_for_display(**filtros)
+        return records, self.contabilidad_logic.get_summary_data(**filtros)
+
+    @staticmethod
+    def _termino_refinable(search_term: str | None) -> bool:
+        """
+        Un término numérico también busca por ID exacto: el resultado no es un subconjunto
+        del anterior y hay que ir a la DB.
+        """
+        if not search_term:
+            return True
+        try:
+            int(search_term)
+            return False
+        except ValueError:
+            return True
+
+    def _emitir_registros_y_resumen(self, resultado: tuple[list, dict]):
+        records, summary_data = resultado
+        self.data_updated.emit(records)
+        self.logger.info(f"ContabilidadController: Registros de contabilidad emitidos ({len(records)}).")
+        # Emitimos la señal para que el widget actualice las cajas de texto
+        self.summary_data_loaded.emit(summary_data)
+        self.logger.info(f"ContabilidadController: Resumen de totales emitido.")
+
     def get_contabilidad_records_sync(self, cliente_id: int = None, proceso_id: int = None, search_term: str = None, tipo_id: int = None):
         """
         Recupera los registros, los emite para actualizar la tabla,
         Y ADEMÁS, calcula y emite el resumen de totales.
         """
+        # Una carga síncrona deja obsoleta cualquier carga en segundo plano en curso.
+        self.consultas.cancelar('registros_contabilidad')
+        self.consultas.cancelar('resumen_contabilidad')
         try:
-            # 1. Obtenemos los datos formateados para la tabla desde la lógica (esto ya lo tenías)
-            records = self.contabilidad_logic.get_contabilidad_data_for_display(
-                cliente_id=cliente_id,
-                proceso_id=proceso_id,
-                search_term=search_term,
-                tipo_id=tipo_id
-            )
-            self.data_updated.emit(records) 
-            self.logger.info(f"ContabilidadController: Registros de contabilidad emitidos ({len(records)}).")
-
-            # --- INICIO DE LA NUEVA LÓGICA ---
-            # 2. Calculamos los totales a partir de los MISMOS datos que se muestran en la tabla
-            total_ingresos = 0.0
-            total_gastos = 0.0
-            
-            for record in records:
-                # En la tupla que preparamos, el valor está en la 6ª posición (índice 5)
-                # y el tipo está en la 4ª posición (índice 3).
-                valor = record[5]
-                tipo_str = record[3].lower()
-
-                if "ingreso" in tipo_str:
-                    total_ingresos += valor
-                else: # Asumimos que si no es ingreso, es gasto
-                    total_gastos += valor
-            
-            saldo = total_ingresos - total_gastos
-
-            # 3. Preparamos el diccionario de resumen
-            summary_data = {
-                'total_ingresos': total_ingresos,
-                'total_gastos': total_gastos,
-                'saldo': saldo
-            }
-            
-            # 4. Emitimos la señal para que el widget actualice las cajas de texto
-            self.summary_data_loaded.emit(summary_data)
-            self.logger.info(f"ContabilidadController: Resumen de totales emitido.")
-            # --- FIN DE LA NUEVA LÓGICA ---
-
+            resultado = self._consultar_registros_y_resumen(cliente_id, proceso_id, search_term, tipo_id)
+            filtros = {'cliente_id': cliente_id, 'proceso_id': proceso_id, 'tipo_id': tipo_id}
+            self._recordar_busqueda(filtros, search_term, resultado[0])
+            self._emitir_registros_y_resumen(resultado)
         except Exception as e:
             self.logger.exception("ContabilidadController: Error al cargar registros y calcular resumen.")
             self.operation_failed.emit(f"Error al cargar datos y resumen: {str(e)}")
 
+    def get_contabilidad_records_async(self, cliente_id: int = None, proceso_id: int = None, search_term: str = None,
+                                       tipo_id: int = None):
+        """
+        Igual que get_contabilidad_records_sync, pero la consulta corre en el pool de consultas.
+        Los resultados llegan por data_updated y summary_data_loaded; si entretanto se pide
+        otra carga, el resultado de esta se descarta.
+        Si el término de búsqueda solo se alargó, se filtra en memoria el resultado anterior.
+        """
+        filtros = {'cliente_id': cliente_id, 'proceso_id': proceso_id, 'tipo_id': tipo_id}
+        if self._termino_refinable(search_term):
+            records = self.busqueda_incremental.refinar(filtros, search_term)
+            if records is not None:
+                self.consultas.cancelar('registros_contabilidad')
+                self.data_updated.emit(records)
+                # Las filas salen de memoria; los totales, de la consulta agregada
+                self.get_summary_data_async(cliente_id, proceso_id, search_term, tipo_id)
+                return
+
+        # Esta carga trae su propio resumen: uno pedido antes ya no vale
+        self.consultas.cancelar('resumen_contabilidad')
+
+        def al_terminar(resultado):
+            self._recordar_busqueda(filtros, search_term, resultado[0])
+            self._emitir_registros_y_resumen(resultado)
+
+        def al_fallar(error):
+            self.operation_failed.emit(f"Error al cargar datos y resumen: {str(error)}")
+
+        self.consultas.ejecutar(
+            'registros_contabilidad', self._consultar_registros_y_resumen,
+            cliente_id, proceso_id, search_term, tipo_id,
+            al_terminar=al_terminar, al_fallar=al_fallar
+        )
+
+    def get_summary_data_async(self, cliente_id: int = None, proceso_id: int = None, search_term: str = None,
+                               tipo_id: int = None):
+        """
+        Solo el resumen de totales, en el pool de consultas y sin cargar registros.
+        El resultado llega por summary_data_loaded.
+        """
+        self.consultas.ejecutar(
+            'resumen_contabilidad', self.contabilidad_logic.get_summary_data,
+            cliente_id, proceso_id, search_term=search_term, tipo_id=tipo_id,
+            al_terminar=self.summary_data_loaded.emit,
+            al_fallar=lambda error: self.operation_failed.emit(f"Error al obtener resumen: {error}")
+        )
+
+    def _recordar_busqueda(self, filtros: dict, search_term: str | None, records: list):
+        if self._termino_refinable(search_term):
+            self.busqueda_incremental.recordar(filtros, search_term, records)
+        else:
+            self.busqueda_incremental.invalidar()
 
     def get_contabilidad_data_for_table(self, cliente_id=None, proceso_id=None):
         """
@@ -107,6 +162,7 @@ class ContabilidadController(QObject):
 
     def add_record(self, cliente_id, proceso_id, tipo_id, descripcion, valor, fecha,
                     current_filter_cliente_id: int = None, current_filter_proceso_id: int = None):
+        self.busqueda_incremental.invalidar()
         try:
             # Ahora se pasa directamente el 'tipo_id' en lugar del nombre
             self.contabilidad_logic.add_contabilidad_record(cliente_id, proceso_id, tipo_id, descripcion, valor, fecha)
@@ -128,6 +184,7 @@ class ContabilidadController(QObject):
         """
         Actualiza el registro y luego pide al widget que se refresque.
         """
+        self.busqueda_incremental.invalidar()
         try:
             # Llama a la lógica para que actualice la base de datos
             self.contabilidad_logic.update_contabilidad_record(
@@ -144,6 +201,7 @@ class ContabilidadController(QObject):
 
     def delete_record(self, record_id, current_filter_cliente_id: int = None, current_filter_proceso_id: int = None):
         ##logger.info(f"ContabilidadController: Solicitando eliminar registro ID {record_id}.")
+        self.busqueda_incremental.invalidar()
         try:
             self.contabilidad_logic.delete_contabilidad_record(record_id)
             self.get_contabilidad_records_sync(cliente_id=current_filter_cliente_id, proceso_id=current_filter_proceso_id)
@@ -3,11 +3,13 @@
 import logging
 from contextlib import contextmanager
 from sqlalchemy.orm import joinedload
-from sqlalchemy import func, or_
+from sqlalchemy import func, or_, case
 
 # --- INICIO DE CORRECCIONES ---
 # Importaciones del nuevo sistema unificado
-from ...db.models import Contabilidad, Cliente, Proceso
+from ...db.models import Contabilidad, Cliente, Proceso, TipoContable, Saldo
+from ...db.busqueda import patron_like, ESCAPE_LIKE
+from ...db.saldos import saldos_disponibles
 from ...utils.db_manager import get_db_session
 # --- FIN DE CORRECCIONES ---
 
@@ -35,6 +37,41 @@ class ContabilidadDB:
         finally:
             session.close()
 
+    @staticmethod
+    def _aplicar_filtros(query, cliente_id=None, proceso_id=None, search_term=None, tipo_id=None, record_ids=None):
+        """Filtros comunes del listado y del resumen: ambos deben ver exactamente las mismas filas."""
+        if record_ids is not None:
+            query = query.filter(Contabilidad.id.in_(record_ids))
+        if cliente_id:
+            query = query.filter(Contabilidad.cliente_id == cliente_id)
+        if proceso_id:
+            query = query.filter(Contabilidad.proceso_id == proceso_id)
+        if tipo_id:
+            query = query.filter(Contabilidad.tipo_contable_id == tipo_id)
+
+        if search_term:
+            # JOIN explícito: sin él, filtrar por Cliente.nombre hace un producto cartesiano
+            query = query.outerjoin(Cliente, Contabilidad.cliente_id == Cliente.id)
+            # Comodines escapados: '%' y '_' se buscan literalmente, igual que al refinar en memoria
+            search_pattern = patron_like(search_term.lower())
+            try:
+                record_id_int = int(search_term)
+                query = query.filter(
+                    or_(
+                        Contabilidad.id == record_id_int,
+                        func.lower(Contabilidad.descripcion).like(search_pattern, escape=ESCAPE_LIKE),
+                        func.lower(Cliente.nombre).like(search_pattern, escape=ESCAPE_LIKE)
+                    )
+                )
+            except ValueError:
+                query = query.filter(
+                    or_(
+                        func.lower(Contabilidad.descripcion).like(search_pattern, escape=ESCAPE_LIKE),
+                        func.lower(Cliente.nombre).like(search_pattern, escape=ESCAPE_LIKE)
+                    )
+                )
+        return query
+
     def get_filtered_contabilidad_records(self, cliente_id=None, proceso_id=None, search_term=None, tipo_id=None):
         """Obtiene una lista de registros de contabilidad con filtros."""
         with self.get_session() as session:
@@ -45,34 +82,55 @@ class ContabilidadDB:
                 joinedload(Contabilidad.proceso),
                 joinedload(Contabilidad.tipo)
             )
+            query = self._aplicar_filtros(query, cliente_id, proceso_id, search_term, tipo_id)
+            return query.order_by(Contabilidad.fecha.desc()).all()
 
-            if cliente_id:
-                query = query.filter(Contabilidad.cliente_id == cliente_id)
-            if proceso_id:
-                query = query.filter(Contabilidad.proceso_id == proceso_id)
-            if tipo_id:
-                query = query.filter(Contabilidad.tipo_contable_id == tipo_id)
-                
-            if search_term:
-                search_pattern = f"%{search_term.lower()}%"
-                try:
-                    record_id_int = int(search_term)
-                    query = query.filter(
-                        or_(
-                            Contabilidad.id == record_id_int,
-                            func.lower(Contabilidad.descripcion).like(search_pattern),
-                            func.lower(Cliente.nombre).like(search_pattern)
-                        )
-                    )
-                except ValueError:
-                    query = query.filter(
-                        or_(
-                            func.lower(Contabilidad.descripcion).like(search_pattern),
-                            func.lower(Cliente.nombre).like(search_pattern)
-                        )
-                    )
+    def get_resumen(self, cliente_id=None, proceso_id=None, search_term=None, tipo_id=None, record_ids=None) -> dict:
+        """
+        Totales de ingresos, gastos y saldo con los mismos filtros que el listado, en una sola
+        consulta agregada: no se carga ninguna fila. Un tipo es ingreso según tipos_contables.es_ingreso.
+        Sin búsqueda de texto ni selección se suman las filas de saldos (una por cliente, proceso,
+        tipo y mes) en lugar de los movimientos.
+        """
+        es_ingreso = TipoContable.es_ingreso.is_(True)
+        with self.get_session() as session:
+            if not search_term and record_ids is None and saldos_disponibles(session):
+                return self._resumen_desde_saldos(session, cliente_id, proceso_id, tipo_id)
+            query = session.query(
+                func.coalesce(func.sum(case((es_ingreso, Contabilidad.monto), else_=0.0)), 0.0),
+                func.coalesce(func.sum(case((es_ingreso, 0.0), else_=Contabilidad.monto)), 0.0),
+                func.count(Contabilidad.id),
+            ).select_from(Contabilidad).outerjoin(TipoContable, Contabilidad.tipo_contable_id == TipoContable.id)
+            query = self._aplicar_filtros(query, cliente_id, proceso_id, search_term, tipo_id, record_ids)
+            total_ingresos, total_gastos, registros = query.one()
+        return {
+            'total_ingresos': float(total_ingresos),
+            'total_gastos': float(total_gastos),
+            'saldo': float(total_ingresos) - float(total_gastos),
+            'registros': registros,
+        }
 
-            return query.order_by(Contabilidad.fecha.desc()).all()
+    @staticmethod
+    def _resumen_desde_saldos(session, cliente_id=None, proceso_id=None, tipo_id=None) -> dict:
+        es_ingreso = TipoContable.es_ingreso.is_(True)
+        query = session.query(
+            func.coalesce(func.sum(case((es_ingreso, Saldo.total), else_=0.0)), 0.0),
+            func.coalesce(func.sum(case((es_ingreso, 0.0), else_=Saldo.total)), 0.0),
+            func.coalesce(func.sum(Saldo.movimientos), 0),
+        ).select_from(Saldo).outerjoin(TipoContable, Saldo.tipo_contable_id == TipoContable.id)
+        if cliente_id:
+            query = query.filter(Saldo.cliente_id == cliente_id)
+        if proceso_id:
+            query = query.filter(Saldo.proceso_id == proceso_id)
+        if tipo_id:
+            query = query.filter(Saldo.tipo_contable_id == tipo_id)
+        total_ingresos, total_gastos, registros = query.one()
+        return {
+            'total_ingresos': float(total_ingresos),
+            'total_gastos': float(total_gastos),
+            'saldo': float(total_ingresos) - float(total_gastos),
+            'registros': registros,
+        }
 
     def get_contabilidad_records_by_ids(self, record_ids: list):
         """Obtiene registros específicos por una lista de IDs."""
@@ -14,6 +14,13 @@ from ...db.models import Contabilidad, TipoContable as TipoContableORM
 
 logger = logging.getLogger(__name__)
 
+_ASCII_MINUSCULAS = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def _lower_ascii(texto: str) -> str:
+    """Equivalente a lower() de SQLite: solo convierte letras ASCII."""
+    return texto.translate(_ASCII_MINUSCULAS)
+
 @dataclass
 class TipoContable:
     id: int
@@ -64,6 +71,33 @@ class ContabilidadLogic:
         self.logger.debug(f"Logic: {len(display_records)} registros formateados para la vista.")
         return display_records
 
+    @staticmethod
+    def filtrar_registros_display(records: list, search_term: str) -> list:
+        """
+        Aplica en memoria el mismo filtro de texto que get_filtered_contabilidad_records
+        (LIKE sobre descripción o nombre del cliente) a tuplas ya formateadas para la vista.
+        """
+        patron = search_term.lower()
+        resultado = []
+        for rec in records:
+            cliente_nombre = rec[1] if rec[1] != "SIN CLIENTE" else None
+            for valor in (rec[4], cliente_nombre):
+                # lower() y LIKE de SQLite solo ignoran mayúsculas en ASCII
+                if valor is not None and patron in _lower_ascii(str(valor)):
+                    resultado.append(rec)
+                    break
+        return resultado
+
+    def get_summary_data(self, cliente_id: Optional[int] = None, proceso_id: Optional[int] = None,
+                         search_term: Optional[str] = None, tipo_id: Optional[int] = None) -> dict:
+        """
+        Resumen de ingresos, gastos y saldo con los mismos filtros que get_contabilidad_data_for_display,
+        calculado en la base de datos.
+        """
+        return self.contabilidad_db.get_resumen(
+            cliente_id=cliente_id, proceso_id=proceso_id, search_term=search_term, tipo_id=tipo_id
+        )
+
     def update_contabilidad_record(self, record_id, cliente_id, proceso_id, tipo_id, descripcion, valor, fecha):
         """
         Valida y pasa la solicitud de actualización al modelo.
@@ -112,12 +146,14 @@ class ContabilidadLogic:
             records = self.contabilidad_db.get_filtered_contabilidad_records(
                 cliente_id=cliente_id, proceso_id=proceso_id, tipo_id=tipo_id, search_term=search_term
             )
-        # ... (resto de la lógica para calcular totales y filtros)
-        total_ingresos = sum(r.monto for r in records if r.tipo_contable_id in {1, 3})
-        total_gastos = sum(r.monto for r in records if r.tipo_contable_id not in {1, 3})
-        
+        # Totales con la consulta agregada (tipos_contables.es_ingreso), no sumando en Python
+        if record_ids:
+            resumen = self.contabilidad_db.get_resumen(record_ids=record_ids)
+        else:
+            resumen = self.get_summary_data(cliente_id, proceso_id, search_term=search_term, tipo_id=tipo_id)
+
         return ContabilidadReportData(
-            records=records, total_ingresos=total_ingresos, total_gastos=total_gastos,
-            saldo_neto=(total_ingresos - total_gastos), filtros="Filtros Aplicados", # Simplificado
+            records=records, total_ingresos=resumen['total_ingresos'], total_gastos=resumen['total_gastos'],
+            saldo_neto=resumen['saldo'], filtros="Filtros Aplicados", # Simplificado
             tipos_contables_map=self.tipos_contables_map
         )
\ No newline at end of file
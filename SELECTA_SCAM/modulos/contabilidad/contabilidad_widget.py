@@ -18,6 +18,7 @@ from SELECTA_SCAM.modulos.clientes.clientes_logic import ClientesLogic
 from SELECTA_SCAM.modulos.procesos.procesos_logic import ProcesosLogic
 from PyQt5.QtWidgets import QDialog # Asegúrate de tener esta línea
 from .contabilidad_pdf import generar_pdf_resumen_contabilidad
+from SELECTA_SCAM.config import settings
 
 from SELECTA_SCAM.modulos.contabilidad.contabilidad_logic import ContabilidadLogic
 
@@ -232,14 +233,16 @@ class ContabilidadWidget(QWidget):
         self.controller.record_updated.connect(self.reselect_row_by_id)
 
         self.controller.procesos_loaded_for_dialog.connect(self.handle_procesos_for_dialog)
+        # Búsqueda mientras se escribe: se espera a que el usuario deje de teclear
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(settings.BUSQUEDA_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.perform_search)
         self.init_ui() # Llama a init_ui para construir el resto de la interfaz
         self.controller.get_all_clientes_sync()
         self.controller.get_tipos_contables_sync()
         self.update_contabilidad_display() 
         self.check_user_permissions()
-        self.search_timer = QTimer(self) 
-        self.search_timer.setSingleShot(True) 
-        self.search_timer.timeout.connect(self.perform_search) 
         self.connect_signals()
 
     def init_ui(self):
@@ -436,7 +439,7 @@ class ContabilidadWidget(QWidget):
        
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Buscar por descripción...")
-        self.search_input.textChanged.connect(self.update_contabilidad_display)
+        self.search_input.textChanged.connect(self.search_timer.start)
         top_filter_and_action_layout.addWidget(self.search_input)
 
         self.btn_limpiar_filtros = QPushButton("Limpiar Filtros")
@@ -672,7 +675,6 @@ class ContabilidadWidget(QWidget):
         self.btn_agregar.clicked.connect(self.agregar_contabilidad)
         self.cliente_filter_combo.currentIndexChanged.connect(self.on_cliente_filter_changed)
         self.cliente_search_input.textChanged.connect(self.search_timer.start) 
-        self.search_timer.setInterval(300) # Establece el retardo en milisegundos (ej. 300ms)
 
         # En: contabilidad_widget.py
 # Añade este método nuevo a la clase ContabilidadWidget
@@ -948,33 +950,39 @@ class ContabilidadWidget(QWidget):
     # En: contabilidad_widget.py
 # Reemplaza el método completo con este:
 
+    def _filtros_actuales(self) -> tuple:
+        """(cliente_id, proceso_id, search_term, tipo_id) según los filtros de la vista."""
+        # Obtenemos los IDs de los filtros de los ComboBox
+        cliente_id = self.cliente_filter_combo.currentData()
+        proceso_id = self.proceso_input.currentData()
+        tipo_id = self.tipo_input.currentData()
+
+        # Verificamos si el modo de búsqueda por cliente está activo
+        if self.is_search_mode_active:
+            # Si es así, usamos el texto del campo de búsqueda de cliente
+            search_term = self.cliente_search_input.text()
+            # Y nos aseguramos de que el filtro del ComboBox de cliente no interfiera
+            cliente_id = None
+        else:
+            # Si no, usamos el campo de búsqueda general (el de la derecha)
+            search_term = self.search_input.text()
+        return cliente_id, proceso_id, search_term, tipo_id
+
     def update_contabilidad_display(self):
         """
         Actualiza la QTableView y los resúmenes.
         Este método ahora es inteligente y sabe de qué campo de búsqueda leer.
         """
         self.logger.info("Widget: Solicitando actualización de la vista al controlador.")
+        # Una actualización explícita reemplaza a la búsqueda que esperaba el debounce
+        self.search_timer.stop()
         try:
-            # Obtenemos los IDs de los filtros de los ComboBox
-            cliente_id = self.cliente_filter_combo.currentData()
-            proceso_id = self.proceso_input.currentData()
-            tipo_id = self.tipo_input.currentData()
-            
-            # --- INICIO DE LA CORRECCIÓN ---
-            search_term = ""
-            # Verificamos si el modo de búsqueda por cliente está activo
-            if self.is_search_mode_active:
-                # Si es así, usamos el texto del campo de búsqueda de cliente
-                search_term = self.cliente_search_input.text()
-                # Y nos aseguramos de que el filtro del ComboBox de cliente no interfiera
-                cliente_id = None 
-            else:
-                # Si no, usamos el campo de búsqueda general (el de la derecha)
-                search_term = self.search_input.text()
-            # --- FIN DE LA CORRECCIÓN ---
+            cliente_id, proceso_id, search_term, tipo_id = self._filtros_actuales()
 
-            # Le pedimos al controlador que nos traiga los datos con los filtros correctos
-            self.controller.get_contabilidad_records_sync(
+            # Le pedimos al controlador que nos traiga los datos con los filtros correctos.
+            # La consulta corre en segundo plano; la tabla y el resumen se actualizan
+            # al llegar data_updated y summary_data_loaded.
+            self.controller.get_contabilidad_records_async(
                 cliente_id=cliente_id,
                 proceso_id=proceso_id,
                 search_term=search_term, # Pasamos el término de búsqueda correcto
@@ -1184,7 +1192,9 @@ class ContabilidadWidget(QWidget):
             self.saldo_display.setText(f"${saldo_neto_seleccion:,.2f}")
         else:
             # Si no hay nada seleccionado, volvemos a mostrar los totales generales
-            self.update_contabilidad_display()
+            # (solo el resumen: la tabla no cambió)
+            cliente_id, proceso_id, search_term, tipo_id = self._filtros_actuales()
+            self.controller.get_summary_data_async(cliente_id, proceso_id, search_term, tipo_id)
     
     def clear_inputs(self):
         self.cliente_input.blockSignals(True)
@@ -0,0 +1,183 @@
+# SELECTA_SCAM/modulos/documentos/capa_texto.py
+
+import bisect
+import gzip
+import hashlib
+import json
+import logging
+import os
+
+import fitz
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from .visor_paginas import clave_archivo
+from ...config import settings
+from ...utils.ocr import ocr_paginas, ocr_disponible
+
+logger = logging.getLogger(__name__)
+
+VERSION_CAPA = 1
+
+
+class CapaTexto:
+    """
+    Palabras de cada página con su caja (get_text("words") o, en páginas escaneadas, OCR).
+    Una selección se resuelve en memoria: las palabras cuyo centro cae dentro del rectángulo,
+    en orden de lectura. No vuelve a abrir la página ni a rasterizarla.
+    """
+
+    def __init__(self, paginas: dict[int, list] = None, origenes: dict[int, str] = None):
+        self.paginas = {}
+        self.origenes = dict(origenes or {})
+        self._centros_y = {}
+        for numero, palabras in (paginas or {}).items():
+            self.poner_pagina(numero, palabras, self.origenes.get(numero, 'pdf'))
+
+    def poner_pagina(self, numero: int, palabras: list, origen: str):
+        # Ordenadas por el centro vertical: un rectángulo solo revisa la franja que cubre.
+        ordenadas = sorted((tuple(p) for p in palabras), key=lambda p: (p[1] + p[3]) / 2)
+        self.paginas[numero] = ordenadas
+        self._centros_y[numero] = [(p[1] + p[3]) / 2 for p in ordenadas]
+        self.origenes[numero] = origen
+
+    def tiene_pagina(self, numero: int) -> bool:
+        return numero in self.paginas
+
+    def paginas_sin_texto(self) -> list[int]:
+        return [n for n, palabras in self.paginas.items() if not palabras and self.origenes.get(n) != 'ocr']
+
+    def texto_en(self, numero: int, x0: float, y0: float, x1: float, y1: float) -> str:
+        """Texto de las palabras de la página cuyo centro está dentro del rectángulo (en puntos)."""
+        palabras = self.paginas.get(numero) or []
+        centros = self._centros_y.get(numero) or []
+        inicio = bisect.bisect_left(centros, y0)
+        fin = bisect.bisect_right(centros, y1)
+        elegidas = [
+            p for p in palabras[inicio:fin]
+            if x0 <= (p[0] + p[2]) / 2 <= x1
+        ]
+        return self._unir(elegidas)
+
+    def texto_pagina(self, numero: int) -> str:
+        return self._unir(self.paginas.get(numero) or [])
+
+    @staticmethod
+    def _unir(palabras: list) -> str:
+        """Orden de lectura (bloque, línea, palabra): espacios entre palabras, saltos entre líneas."""
+        lineas = []
+        clave_anterior = None
+        for p in sorted(palabras, key=lambda p: (p[5], p[6], p[7])):
+            clave = (p[5], p[6])
+            if clave != clave_anterior:
+                lineas.append([])
+                clave_anterior = clave
+            lineas[-1].append(p[4])
+        return "\n".join(" ".join(linea) for linea in lineas)
+
+    # --- Persistencia ---
+
+    def a_dict(self) -> dict:
+        return {
+            'version': VERSION_CAPA,
+            'paginas': {str(n): [list(p) for p in palabras] for n, palabras in self.paginas.items()},
+            'origenes': {str(n): o for n, o in self.origenes.items()},
+        }
+
+    @classmethod
+    def desde_dict(cls, datos: dict):
+        if datos.get('version') != VERSION_CAPA:
+            return None
+        return cls(
+            {int(n): palabras for n, palabras in datos['paginas'].items()},
+            {int(n): o for n, o in datos.get('origenes', {}).items()},
+        )
+
+
+def ruta_capa(ruta_documento: str) -> str:
+    """Archivo de la capa de texto de un documento, en CAPAS_TEXTO_DIR y con nombre según su contenido."""
+    nombre = hashlib.sha1(clave_archivo(ruta_documento).encode('utf-8')).hexdigest()
+    return os.path.join(settings.CAPAS_TEXTO_DIR, nombre[:2], f"{nombre}.json.gz")
+
+
+def cargar_capa(ruta_documento: str) -> CapaTexto | None:
+    try:
+        with gzip.open(ruta_capa(ruta_documento), 'rt', encoding='utf-8') as f:
+            return CapaTexto.desde_dict(json.load(f))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Capa de texto ilegible para '{ruta_documento}', se reconstruye: {e}")
+        return None
+
+
+def guardar_capa(ruta_documento: str, capa: CapaTexto):
+    destino = ruta_capa(ruta_documento)
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    temporal = f"{destino}.{os.getpid()}.parcial"
+    with gzip.open(temporal, 'wt', encoding='utf-8') as f:
+        json.dump(capa.a_dict(), f, separators=(',', ':'))
+    os.replace(temporal, destino)
+
+
+class _SenalesCapa(QObject):
+    capa_lista = pyqtSignal(object)  # CapaTexto
+
+
+class _CapaRunnable(QRunnable):
+    def __init__(self, cargador, ruta: str):
+        super().__init__()
+        self.cargador = cargador
+        self.ruta = ruta
+        self.senales = cargador._senales
+
+    def run(self):
+        try:
+            self._construir()
+        except Exception as e:
+            logger.warning(f"No se pudo construir la capa de texto de '{self.ruta}': {e}", exc_info=True)
+
+    def _construir(self):
+        capa = cargar_capa(self.ruta)
+        if capa is None:
+            capa = CapaTexto()
+            with fitz.open(self.ruta) as doc:
+                for numero, page in enumerate(doc):
+                    if self.cargador.cancelado:
+                        return
+                    capa.poner_pagina(numero, page.get_text("words"), 'pdf')
+            guardar_capa(self.ruta, capa)
+        self.senales.capa_lista.emit(capa)
+
+        # Segunda pasada: OCR de las páginas escaneadas, que hasta ahora no tienen palabras.
+        # Se trabaja sobre una copia: la capa ya entregada la está leyendo el hilo de la interfaz.
+        pendientes = capa.paginas_sin_texto()
+        if not pendientes or not ocr_disponible():
+            return
+        capa = CapaTexto(capa.paginas, capa.origenes)
+        reconocidas = ocr_paginas(self.ruta, pendientes, palabras=True, cancelado=lambda: self.cargador.cancelado)
+        for numero, palabras in reconocidas.items():
+            capa.poner_pagina(numero, palabras, 'ocr')
+        guardar_capa(self.ruta, capa)  # Lo reconocido se conserva aunque el visor se cierre a mitad
+        if not self.cargador.cancelado:
+            self.senales.capa_lista.emit(capa)
+
+
+class CargadorCapaTexto(QObject):
+    """
+    Carga (o construye y guarda) la capa de texto de un PDF en segundo plano.
+    capa_lista se emite con las páginas de texto y otra vez cuando termina el OCR de las escaneadas.
+    """
+    capa_lista = pyqtSignal(object)
+
+    def __init__(self, ruta: str, parent=None):
+        super().__init__(parent)
+        self.ruta = ruta
+        self.cancelado = False
+        self._senales = _SenalesCapa()
+        self._senales.capa_lista.connect(self.capa_lista)
+
+    def iniciar(self):
+        QThreadPool.globalInstance().start(_CapaRunnable(self, self.ruta))
+
+    def cancelar(self):
+        self.cancelado = True
@@ -0,0 +1,133 @@
+# SELECTA_SCAM/modulos/documentos/documentos_almacen.py
+
+import logging
+import os
+import threading
+
+from ...utils.archivos import (
+    calcular_sha256, copiar_por_bloques, reemplazar_atomico, ruta_temporal, eliminar_si_existe
+)
+from ...utils.cola_archivos import registrar_tipo_operacion
+
+logger = logging.getLogger(__name__)
+
+# Almacén direccionado por contenido: cada archivo se guarda una sola vez con el nombre de
+# su SHA-256, repartido en subcarpetas (ab/cd/abcd...pdf) para no llenar un único directorio.
+# Los documentos con el mismo contenido apuntan al mismo objeto (misma ubicacion_archivo).
+CARPETA_OBJETOS = 'objetos'
+CARPETA_TEMPORAL = 'tmp'  # Dentro de objetos/: mismo volumen, el renombrado final es atómico
+OPERACION_ALMACENAR = 'almacenar'
+OPERACION_ELIMINAR_ARCHIVO = 'eliminar_archivo'
+# ubicacion_archivo de un documento cuyo archivo la cola aún no ha guardado: no es una ruta
+# (no hay nada que abrir ni borrar) y, al ser vacía, todas las comprobaciones 'if ubicacion'
+# lo tratan como "sin archivo". asignar_archivo_almacenado la reemplaza por la definitiva.
+UBICACION_PENDIENTE = ''
+
+# Serializa "reutilizar o crear el objeto y asignarlo" frente a "comprobar que nadie lo usa y
+# borrarlo": sin él, un borrado encolado podría quitar el objeto que una subida acaba de reutilizar.
+_bloqueo_objetos = threading.Lock()
+
+
+def ruta_objeto(carpeta_base: str, sha256: str, extension: str) -> str:
+    """Ruta del objeto dentro de carpeta_base: objetos/ab/cd/<sha256><extension>."""
+    return os.path.join(carpeta_base, CARPETA_OBJETOS, sha256[:2], sha256[2:4], f"{sha256}{extension.lower()}")
+
+
+def es_ruta_objeto(ubicacion: str) -> bool:
+    """True si la ubicación apunta al almacén de objetos (y no a la carpeta de un cliente)."""
+    partes = os.path.normpath(ubicacion).split(os.sep)
+    return CARPETA_OBJETOS in partes[:-1]
+
+
+def ruta_archivo_documento(carpeta_base: str, cliente_id: int, ubicacion: str) -> str:
+    """
+    Ruta absoluta del archivo de un documento: en el almacén de objetos (documentos nuevos)
+    o dentro de la carpeta del cliente (documentos anteriores al almacén).
+    """
+    partes = os.path.normpath(ubicacion).split(os.sep)
+    if CARPETA_OBJETOS in partes[:-1]:
+        return os.path.join(carpeta_base, *partes[partes.index(CARPETA_OBJETOS):])
+    return os.path.join(carpeta_base, str(cliente_id), partes[-1])
+
+
+def almacenar_archivo(origen: str, carpeta_base: str, progreso=None, buscar_existente=None,
+                      asignar=None) -> tuple[str, str]:
+    """
+    Copia origen al almacén de carpeta_base leyendo el archivo una sola vez: el SHA-256 se
+    calcula durante la copia a un temporal, que después se renombra a objetos/ab/cd/<sha256>.ext
+    o se descarta si ese contenido ya estaba guardado.
+    buscar_existente(sha256) puede devolver la ruta de un objeto ya guardado con otra extensión.
+    asignar(sha256, ruta) se llama con el objeto ya en su sitio, bajo el mismo bloqueo que los
+    borrados: un objeto reutilizado no puede desaparecer antes de quedar asignado.
+    Retorna (sha256, ruta_del_objeto).
+    """
+    extension = os.path.splitext(origen)[1]
+    carpeta_temporal = os.path.join(carpeta_base, CARPETA_OBJETOS, CARPETA_TEMPORAL)
+    os.makedirs(carpeta_temporal, exist_ok=True)
+    temporal = ruta_temporal(os.path.join(carpeta_temporal, f"subida{extension.lower()}"))
+    try:
+        sha256 = copiar_por_bloques(origen, temporal, progreso)
+        with _bloqueo_objetos:
+            destino = ruta_objeto(carpeta_base, sha256, extension)
+            existente = buscar_existente(sha256) if buscar_existente else None
+            if existente and os.path.exists(existente):
+                destino = existente
+            if os.path.exists(destino):
+                eliminar_si_existe(temporal)  # Mismo contenido ya guardado: no se duplica
+            else:
+                os.makedirs(os.path.dirname(destino), exist_ok=True)
+                reemplazar_atomico(temporal, destino)
+            if asignar:
+                asignar(sha256, destino)
+    except BaseException:
+        eliminar_si_existe(temporal)
+        raise
+    return sha256, destino
+
+
+def _ejecutar_almacenar(origen, carpeta_base, documento_id, progreso=None) -> str:
+    """
+    Operación 'almacenar' de la cola de archivos: guarda el archivo subido en el almacén y
+    asigna al documento su ubicación y su sha256. Repetirla tras un cierre inesperado da el
+    mismo resultado (el objeto ya existe y se vuelve a asignar).
+    """
+    from .documentos_db import DocumentosDB
+    documentos_db = DocumentosDB()
+    carpeta_documentos = os.path.basename(os.path.normpath(carpeta_base))
+
+    def buscar_existente(sha256):
+        ubicacion = documentos_db.get_ubicacion_por_sha256(sha256)
+        if ubicacion and es_ruta_objeto(ubicacion):
+            return os.path.join(carpeta_base, os.path.relpath(ubicacion, carpeta_documentos))
+        return None
+
+    def asignar(sha256, ruta):
+        ubicacion = os.path.join(carpeta_documentos, os.path.relpath(ruta, carpeta_base))
+        if not documentos_db.asignar_archivo_almacenado(documento_id, ubicacion, sha256):
+            # El documento se eliminó mientras se copiaba: el objeto solo se conserva si otro lo usa
+            if not documentos_db.ubicacion_en_uso(ubicacion):
+                logger.info(f"Documento {documento_id} eliminado durante la copia; se descarta '{ruta}'.")
+                eliminar_si_existe(ruta)
+
+    _sha256, ruta = almacenar_archivo(origen, carpeta_base, progreso, buscar_existente, asignar)
+    return ruta
+
+
+def _ejecutar_eliminar_archivo(origen, ubicacion, documento_id=None, progreso=None) -> str:
+    """
+    Operación 'eliminar_archivo' de la cola: borra el archivo de un documento eliminado.
+    'ubicacion' es su ubicacion_archivo en la base de datos. Se vuelve a comprobar que ningún
+    documento la use, porque entre el registro del borrado y su ejecución una subida con el
+    mismo contenido pudo reutilizar el objeto.
+    """
+    from .documentos_db import DocumentosDB
+    with _bloqueo_objetos:
+        if ubicacion and DocumentosDB().ubicacion_en_uso(ubicacion):
+            logger.info(f"'{origen}' volvió a usarse desde que se pidió su borrado; se conserva.")
+            return origen
+        eliminar_si_existe(origen)
+    return origen
+
+
+registrar_tipo_operacion(OPERACION_ALMACENAR, _ejecutar_almacenar)
+registrar_tipo_operacion(OPERACION_ELIMINAR_ARCHIVO, _ejecutar_eliminar_archivo)
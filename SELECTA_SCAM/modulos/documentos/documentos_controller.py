@@ -1,7 +1,6 @@
 # SELECTA_SCAM/modulos/documentos/documentos_controller.py
 
 import os
-import shutil
 from datetime import datetime
 import logging
 from PyQt5.QtCore import QObject, pyqtSignal
@@ -9,7 +8,14 @@ from PyQt5.QtCore import QObject, pyqtSignal
 from .documentos_db import DocumentosDB
 from ..clientes.clientes_logic import ClientesLogic
 from .documentos_logic import DocumentosLogic
-from ...db.models import Documento   # ✅ necesario para mover/eliminar documentos en la papelera
+from .documentos_texto import indexar_documento, indexar_documentos_pendientes
+from .documentos_almacen import OPERACION_ALMACENAR, UBICACION_PENDIENTE, ruta_archivo_documento
+from .miniaturas import get_servicio_miniaturas
+from ...utils.consultas_async import EjecutorConsultas
+from ...utils.busqueda_incremental import BusquedaIncremental
+from ...utils.cola_archivos import get_cola_archivos, OPERACION_COPIAR
+from ...db.busqueda import coincide_fts, coincide_like
+from ...config import settings
 
 
 DOCUMENTOS_FOLDER = 'Documentos_Guardados'
@@ -20,6 +26,7 @@ class DocumentosController(QObject):
     documentos_cargados = pyqtSignal(list)
     clientes_cargados = pyqtSignal(list)
     error_occurred = pyqtSignal(str)
+    archivo_guardado = pyqtSignal(int, str)  # doc_id, ubicacion_archivo definitiva
 
     def __init__(self, documentos_db_instance: DocumentosDB, clientes_logic_instance: ClientesLogic, user_data=None):
         super().__init__()
@@ -28,6 +35,11 @@ class DocumentosController(QObject):
         self.clientes_logic = clientes_logic_instance
         self.documentos_logic = DocumentosLogic(documentos_db_instance)
         self.user_data = user_data
+        self.consultas = EjecutorConsultas(self)
+        self.busqueda_incremental = BusquedaIncremental(self._filtrar_por_nombre)
+        # Estado de paginación de la última búsqueda entregada a la tabla
+        self.total_documentos = 0
+        self._filtros_paginacion = {}
 
         try:
             project_root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
@@ -38,6 +50,13 @@ class DocumentosController(QObject):
         self.logger.info(f"Ruta base para documentos: {self.documentos_base_path}")
         self._verificar_y_crear_carpeta_base()
 
+        # Copias y borrados de archivos en segundo plano (retoma lo pendiente al crearse)
+        self.cola_archivos = get_cola_archivos()
+        self.cola_archivos.operacion_terminada.connect(self._on_operacion_archivo_terminada)
+        self.cola_archivos.operacion_fallida.connect(self._on_operacion_archivo_fallida)
+        # Vistas previas de la primera página (memoria + caché en disco)
+        self.miniaturas = get_servicio_miniaturas()
+
     # ============================================================
     # --- Utilidades internas
     # ============================================================
@@ -47,14 +66,27 @@ class DocumentosController(QObject):
         if not os.path.exists(self.documentos_base_path):
             os.makedirs(self.documentos_base_path)
 
+    def _ruta_archivo(self, cliente_id: int, ubicacion_archivo: str) -> str:
+        """Ruta absoluta del archivo de un documento (ver documentos_almacen.ruta_archivo_documento)."""
+        return ruta_archivo_documento(self.documentos_base_path, cliente_id, ubicacion_archivo)
+
+    def get_miniatura_documento(self, cliente_id: int, ubicacion_archivo: str):
+        """
+        Vista previa del documento de una fila de la tabla, sin consultar la base de datos.
+        Retorna (ruta, QPixmap); el pixmap es None mientras se genera y
+        miniaturas.miniatura_lista(ruta) avisa cuando está lista.
+        """
+        if not ubicacion_archivo:
+            return None, None
+        ruta = self._ruta_archivo(cliente_id, ubicacion_archivo)
+        return ruta, self.miniaturas.obtener(ruta)
+
     def get_full_document_path(self, doc_id: int) -> str | None:
         """Obtiene la ruta absoluta de un documento a partir de su ID."""
         try:
             documento = self.documentos_logic.get_documento_por_id(doc_id)
             if documento and documento.get('ubicacion_archivo'):
-                ruta_relativa = documento['ubicacion_archivo']
-                cliente_id = documento.get('cliente_id')
-                ruta_correcta = os.path.join(self.documentos_base_path, str(cliente_id), os.path.basename(ruta_relativa))
+                ruta_correcta = self._ruta_archivo(documento.get('cliente_id'), documento['ubicacion_archivo'])
 
                 if os.path.exists(ruta_correcta):
                     return os.path.normpath(ruta_correcta)
@@ -71,77 +103,209 @@ class DocumentosController(QObject):
     # ============================================================
 
     def cargar_datos_iniciales(self):
-        """Carga los clientes y los documentos activos al iniciar el módulo."""
+        """Carga los clientes y la primera página de documentos activos al iniciar el módulo."""
         try:
             clientes = self.clientes_logic.get_all_clientes_for_combobox()
             self.clientes_cargados.emit(clientes)
-            documentos = self.documentos_logic.get_documentos_para_tabla(eliminado=False)
-            self.documentos_cargados.emit(documentos)
         except Exception as e:
             self.error_occurred.emit("Error al cargar datos iniciales.")
             self.logger.exception("Error en cargar_datos_iniciales: %s", e)
+        self.buscar_documentos()
+
+    def _consultar_documentos(self, **filters) -> tuple[list, int, dict]:
+        """
+        Resuelve los filtros de la vista y consulta la primera página de documentos
+        (sin emitir señales). Retorna (primera_pagina, total, filtros_resueltos).
+        """
+        cliente_id_exacto = filters.pop('cliente_id_exacto', None)
+        cliente_nombre = filters.pop('cliente_nombre_filtro_texto', None)
+        documento_id_filtro = filters.pop('documento_id_filtro', None)
+        documento_nombre_filtro = filters.pop('documento_nombre_filtro', None)
+
+        if cliente_id_exacto:
+            filters['cliente_ids'] = [cliente_id_exacto]
+        elif cliente_nombre:
+            clientes_encontrados = self.clientes_logic.get_clientes_data(query=cliente_nombre)
+            ids_de_clientes = [c[0] for c in clientes_encontrados]
+            if not ids_de_clientes:
+                return [], 0, filters
+            filters['cliente_ids'] = ids_de_clientes
+
+        if documento_id_filtro:
+            filters['documento_id'] = documento_id_filtro
+        elif documento_nombre_filtro:
+            filters['documento_nombre'] = documento_nombre_filtro
+
+        tamano_pagina = settings.DOCUMENTOS_TAMANO_PAGINA
+        documentos = self.documentos_logic.get_pagina_documentos(tamano_pagina, **filters) or []
+        if len(documentos) < tamano_pagina:
+            total = len(documentos)  # Cupo en una página: el COUNT no hace falta
+        else:
+            total = self.documentos_logic.contar_documentos(**filters)
+        self.logger.info(f"Buscar documentos: {len(documentos)} de {total} resultados con filtros: {filters}")
+        return documentos, total, filters
+
+    def _entregar_documentos(self, filters: dict, resultado: tuple[list, int, dict]):
+        """Guarda el estado de paginación de la búsqueda entregada y emite documentos_cargados."""
+        documentos, total, filtros_resueltos = resultado
+        # Una página pedida para la búsqueda anterior ya no corresponde a la tabla nueva
+        self.consultas.cancelar('pagina_documentos')
+        self.total_documentos = total
+        self._filtros_paginacion = filtros_resueltos
+        # Solo un resultado completo sirve de base para refinar en memoria
+        if len(documentos) >= total:
+            self._recordar_busqueda(filters, documentos)
+        else:
+            self.busqueda_incremental.invalidar()
+        self.documentos_cargados.emit(documentos)
+
+    def cargar_siguiente_pagina(self, despues_de: tuple, al_terminar, al_fallar=None):
+        """
+        Pide en el pool de consultas la siguiente página de la última búsqueda entregada,
+        a partir de la clave (fecha_subida, id) de la última fila cargada. La usa el modelo
+        en fetchMore: al_terminar(filas) se llama en el hilo de la interfaz.
+        """
+        def _al_fallar(error):
+            self.error_occurred.emit("Error al cargar más documentos.")
+            if al_fallar:
+                al_fallar(error)
+
+        self.consultas.ejecutar(
+            'pagina_documentos', self.documentos_logic.get_pagina_documentos,
+            settings.DOCUMENTOS_TAMANO_PAGINA, despues_de,
+            al_terminar=lambda filas: al_terminar(filas or []),
+            al_fallar=_al_fallar, **dict(self._filtros_paginacion)
+        )
+
+    def _filtros_incrementales(self, filters: dict) -> tuple[dict, str | None] | None:
+        """
+        Separa el término que se refina en memoria (nombre del documento) del resto de filtros.
+        Retorna None si la búsqueda no se puede refinar en memoria (búsqueda en contenido
+        o por ID, que ignora el nombre).
+        """
+        if filters.get('buscar_en_contenido') or filters.get('documento_id_filtro'):
+            return None
+        termino = filters.get('documento_nombre_filtro')
+        otros = {k: v for k, v in filters.items() if k != 'documento_nombre_filtro'}
+        # El criterio (FTS o LIKE) forma parte de los filtros: un resultado obtenido con
+        # uno no se refina con el otro, porque no sería un subconjunto.
+        if termino:
+            otros['_criterio_nombre'] = 'fts' if self.documentos_db.nombre_se_busca_con_fts(termino) else 'like'
+        return otros, termino
+
+    def _filtrar_por_nombre(self, filas: list, termino: str) -> list:
+        # Misma condición que documentos_db aplica al nombre (columna 3) para este término
+        if self.documentos_db.nombre_se_busca_con_fts(termino):
+            return [fila for fila in filas if coincide_fts(fila[3], termino)]
+        return [fila for fila in filas if coincide_like(fila[3], termino)]
+
+    def _recordar_busqueda(self, filters: dict, documentos: list):
+        partes = self._filtros_incrementales(filters)
+        if partes is not None:
+            self.busqueda_incremental.recordar(partes[0], partes[1], documentos)
 
     def buscar_documentos(self, **filters):
         """Filtra documentos según cliente, ID o nombre."""
+        # Una búsqueda síncrona deja obsoleta cualquier búsqueda en segundo plano en curso.
+        self.consultas.cancelar('buscar_documentos')
         try:
-            cliente_id_exacto = filters.pop('cliente_id_exacto', None)
-            cliente_nombre = filters.pop('cliente_nombre_filtro_texto', None)
-            documento_id_filtro = filters.pop('documento_id_filtro', None)
-            documento_nombre_filtro = filters.pop('documento_nombre_filtro', None)
-
-            if cliente_id_exacto:
-                filters['cliente_ids'] = [cliente_id_exacto]
-            elif cliente_nombre:
-                clientes_encontrados = self.clientes_logic.get_clientes_data(query=cliente_nombre)
-                ids_de_clientes = [c[0] for c in clientes_encontrados]
-                if not ids_de_clientes:
-                    self.documentos_cargados.emit([])
-                    return []
-                filters['cliente_ids'] = ids_de_clientes
-
-            if documento_id_filtro:
-                filters['documento_id'] = documento_id_filtro
-            elif documento_nombre_filtro:
-                filters['documento_nombre'] = documento_nombre_filtro
-
-            documentos = self.documentos_logic.get_documentos_para_tabla(**filters) or []
-            self.documentos_cargados.emit(documentos)
-
-            self.logger.info(f"Buscar documentos devolvió {len(documentos)} resultados con filtros: {filters}")
-            return documentos
+            resultado = self._consultar_documentos(**dict(filters))
+            self._entregar_documentos(filters, resultado)
+            return resultado[0]
         except Exception as e:
             self.error_occurred.emit("Error de Búsqueda")
             self.logger.exception("Error en buscar_documentos: %s", e)
             return []
 
+    def buscar_documentos_async(self, **filters):
+        """
+        Igual que buscar_documentos, pero la consulta corre en el pool de consultas.
+        El resultado llega por documentos_cargados; si entretanto se lanza otra búsqueda,
+        el resultado de esta se descarta.
+        Si el nombre buscado solo se alargó respecto a la búsqueda anterior, el resultado
+        se obtiene filtrando en memoria el anterior, sin ir a la base de datos.
+        """
+        partes = self._filtros_incrementales(filters)
+        if partes is not None:
+            refinados = self.busqueda_incremental.refinar(*partes)
+            if refinados is not None:
+                self.consultas.cancelar('buscar_documentos')
+                self.consultas.cancelar('pagina_documentos')
+                self.total_documentos = len(refinados)
+                self.documentos_cargados.emit(refinados)
+                return
+
+        def al_fallar(error):
+            self.error_occurred.emit("Error de Búsqueda")
+
+        self.consultas.ejecutar(
+            'buscar_documentos', self._consultar_documentos,
+            al_terminar=lambda resultado: self._entregar_documentos(filters, resultado),
+            al_fallar=al_fallar, **dict(filters)
+        )
+
     # ============================================================
     # --- Agregar / Editar
     # ============================================================
 
     def agregar_documento(self, **data) -> bool:
-        """Gestiona la lógica de agregar un nuevo documento."""
+        """
+        Registra el documento y encola su almacenamiento: la cola copia el archivo por bloques
+        calculando el SHA-256 en la misma lectura, lo deja en el almacén por contenido (o reutiliza
+        el objeto si ese contenido ya estaba guardado) y asigna la ubicación definitiva al documento.
+        Nada de esto lee el archivo en el hilo de la interfaz; el contenido se indexa cuando
+        la operación termina (_on_operacion_archivo_terminada).
+        """
+        self.busqueda_incremental.invalidar()
         try:
             ruta_origen = data.pop('ruta_archivo_origen')
-            cliente_id = data.get('cliente_id')
+            if not os.path.isfile(ruta_origen):
+                raise FileNotFoundError(f"No existe el archivo de origen: {ruta_origen}")
             nombre_archivo = os.path.basename(ruta_origen)
 
-            directorio_cliente = os.path.join(self.documentos_base_path, str(cliente_id))
-            os.makedirs(directorio_cliente, exist_ok=True)
-            ruta_destino = os.path.join(directorio_cliente, nombre_archivo)
-
-            shutil.copy2(ruta_origen, ruta_destino)
-
             data['archivo'] = nombre_archivo
-            data['ubicacion_archivo'] = os.path.join(DOCUMENTOS_FOLDER, str(cliente_id), nombre_archivo)
-
-            self.documentos_logic.agregar_documento(**data)
+            # Sin ubicación hasta conocer el hash: la operación 'almacenar' asigna la definitiva
+            data['ubicacion_archivo'] = UBICACION_PENDIENTE
+            _doc_id, op_id = self.documentos_logic.agregar_documento_con_copia(
+                ruta_origen, self.documentos_base_path, tipo_operacion=OPERACION_ALMACENAR, **data
+            )
+            self.cola_archivos.encolar([op_id])
             return True
         except Exception as e:
             self.logger.error(f"Error al agregar nuevo documento: {e}", exc_info=True)
             return False
 
+    def _on_operacion_archivo_terminada(self, op_id: int, tipo: str, doc_id, ruta):
+        if tipo in (OPERACION_COPIAR, OPERACION_ALMACENAR) and doc_id is not None:
+            self.busqueda_incremental.invalidar()
+            if tipo == OPERACION_ALMACENAR and ruta:
+                # El documento deja de estar pendiente: la tabla puede abrirlo sin recargarse
+                ubicacion = os.path.join(DOCUMENTOS_FOLDER, os.path.relpath(ruta, self.documentos_base_path))
+                self.archivo_guardado.emit(doc_id, ubicacion)
+            self._indexar_contenido(doc_id, ruta)
+
+    def _indexar_contenido(self, doc_id: int, ruta: str):
+        # Índice de contenido: solo capa de texto; los escaneados quedan para el OCR en segundo plano
+        self.consultas.ejecutar(
+            f'indexar_documento_{doc_id}', indexar_documento, self.documentos_db, doc_id, ruta, usar_ocr=False,
+            al_fallar=lambda e: self.logger.warning(f"No se pudo indexar el contenido del documento {doc_id}: {e}")
+        )
+
+    def _on_operacion_archivo_fallida(self, op_id: int, tipo: str, doc_id, mensaje: str):
+        if tipo in (OPERACION_COPIAR, OPERACION_ALMACENAR) and doc_id is not None:
+            # Sin archivo no hay documento: se quita el registro para que la base y el disco no diverjan
+            self.logger.error(f"La copia del archivo del documento {doc_id} falló; se elimina el registro. {mensaje}")
+            self.documentos_logic.eliminar_documento_definitivamente(
+                [doc_id], resolver_ruta=self._ruta_archivo, cola=self.cola_archivos
+            )
+            self.busqueda_incremental.invalidar()
+            self.error_occurred.emit(f"No se pudo guardar el archivo del documento {doc_id}: {mensaje}")
+        else:
+            self.error_occurred.emit(f"No se pudo completar una operación de archivo ({tipo}): {mensaje}")
+
     def editar_documento(self, doc_id, **data) -> bool:
         """Orquesta la edición de un documento."""
+        self.busqueda_incremental.invalidar()
         try:
             success = self.documentos_logic.editar_documento(doc_id, **data)
             if success:
@@ -159,46 +323,32 @@ class DocumentosController(QObject):
     # ============================================================
 
     def mover_a_papelera(self, doc_ids: list[int]) -> bool:
-        """Marca documentos como eliminados (mueve a la papelera)."""
-        try:
-            with self.documentos_db.get_session() as session:
-                for doc_id in doc_ids:
-                    documento = session.query(Documento).get(doc_id)
-                    if documento:
-                        documento.eliminado = True
-            self.logger.info(f"Documentos enviados a la papelera: {doc_ids}")
+        """Marca documentos como eliminados (mueve a la papelera) con un solo UPDATE."""
+        self.busqueda_incremental.invalidar()
+        if self.documentos_logic.mover_a_papelera(doc_ids):
+            self.logger.info(f"Documentos enviados a la papelera: {len(doc_ids)}")
             return True
-        except Exception as e:
-            self.logger.error(f"Error moviendo documentos a papelera: {e}", exc_info=True)
-            return False
+        self.logger.error(f"Error moviendo documentos a papelera: {doc_ids}")
+        return False
 
     def recuperar_de_papelera(self, doc_ids: list[int]) -> bool:
-        """Restaura documentos desde la papelera."""
-        try:
-            with self.documentos_db.get_session() as session:
-                for doc_id in doc_ids:
-                    documento = session.query(Documento).get(doc_id)
-                    if documento:
-                        documento.eliminado = False
-            self.logger.info(f"Documentos restaurados desde papelera: {doc_ids}")
+        """Restaura documentos desde la papelera con un solo UPDATE."""
+        self.busqueda_incremental.invalidar()
+        if self.documentos_logic.recuperar_de_papelera(doc_ids):
+            self.logger.info(f"Documentos restaurados desde papelera: {len(doc_ids)}")
             return True
-        except Exception as e:
-            self.logger.error(f"Error al recuperar documentos de la papelera: {e}", exc_info=True)
-            return False
+        self.logger.error(f"Error al recuperar documentos de la papelera: {doc_ids}")
+        return False
 
     def eliminar_documentos_definitivamente(self, doc_ids: list[int]) -> bool:
-        """Elimina documentos de forma permanente."""
-        try:
-            with self.documentos_db.get_session() as session:
-                for doc_id in doc_ids:
-                    documento = session.query(Documento).get(doc_id)
-                    if documento:
-                        session.delete(documento)
-            self.logger.info(f"Documentos eliminados definitivamente: {doc_ids}")
+        """Elimina documentos de forma permanente (un solo DELETE); los archivos se borran en la cola."""
+        self.busqueda_incremental.invalidar()
+        if self.documentos_logic.eliminar_documento_definitivamente(
+                doc_ids, resolver_ruta=self._ruta_archivo, cola=self.cola_archivos):
+            self.logger.info(f"Documentos eliminados definitivamente: {len(doc_ids)}")
             return True
-        except Exception as e:
-            self.logger.error(f"Error eliminando documentos definitivamente: {e}", exc_info=True)
-            return False
+        self.logger.error(f"Error eliminando documentos definitivamente: {doc_ids}")
+        return False
 
     # ============================================================
     # --- Getters auxiliares
@@ -226,10 +376,16 @@ class DocumentosController(QObject):
             return self.documentos_logic.get_documento_por_id(doc_id)
         except Exception as e:
             self.logger.error(f"Error al obtener documento por ID ({doc_id}): {e}")
-<<<<<<< HEAD
-            return None
-=======
             return None
-    
-    
->>>>>>> develop
+
+    # ============================================================
+    # --- Índice de contenido
+    # ============================================================
+
+    def indexar_contenido_pendiente(self, limite: int | None = None, progreso=None) -> int:
+        """Extrae (con OCR si hace falta) el texto de los documentos que aún no lo tienen."""
+        try:
+            return indexar_documentos_pendientes(self.documentos_db, self._ruta_archivo, limite, progreso)
+        except Exception as e:
+            self.logger.error(f"Error en la indexación de contenido pendiente: {e}", exc_info=True)
+            return 0
@@ -3,12 +3,19 @@
 import logging
 from contextlib import contextmanager
 from sqlalchemy.orm import joinedload
-from ...db.models import Documento, Cliente
+from sqlalchemy import or_, and_, func
+from ...db.models import Documento, Cliente, DocumentoTexto
+from ...db import busqueda
 from ...utils.db_manager import get_db_session
+from ...utils.cola_archivos import registrar_operacion, OPERACION_COPIAR
+from .documentos_almacen import OPERACION_ELIMINAR_ARCHIVO, UBICACION_PENDIENTE
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# IDs por sentencia en las operaciones masivas (SQLite antiguo admite 999 parámetros)
+TAMANO_LOTE_IDS = 500
+
 class DocumentosDB:
     def __init__(self):
         """El constructor ya no necesita argumentos."""
@@ -32,54 +39,117 @@ class DocumentosDB:
 
     # SELECTA_SCAM/modulos/documentos/documentos_db.py
 
-    def get_documentos_filtered_as_tuples(self, **filters) -> list:
+    def _query_documentos(self, session, **filters):
         """
-        Obtiene los documentos como tuplas, con las columnas en el orden exacto que la tabla necesita.
+        Construye la consulta filtrada (sin ORDER BY) con las columnas en el orden exacto que la tabla necesita.
         Filtros soportados:
         - eliminado: bool
         - cliente_ids: list[int]
         - tipo_documento: str | None
         - documento_id: int | None
         - documento_nombre: str | None
+        - buscar_en_contenido: bool (documento_nombre también busca en el texto del archivo)
+        """
+        query = session.query(
+            Documento.cliente_id,        # 0: ID Cliente
+            Documento.id,                # 1: ID Documento
+            Cliente.nombre.label("cliente_nombre"),   # 2: Cliente
+            Documento.nombre,            # 3: Nombre Documento
+            Documento.ubicacion_archivo, # 4: (tú lo usas para "Tipo Archivo" por extensión)
+            Documento.tipo_documento,    # 5: Tipo Documento
+            Documento.fecha_subida,      # 6: Fecha Carga
+            Documento.ubicacion_archivo.label("ruta_completa"), # 7: Ruta
+            Documento.eliminado          # 8: Eliminado
+        ).join(Cliente, Documento.cliente_id == Cliente.id)
+
+        # Papelera / activos
+        eliminado = filters.get("eliminado", False)
+        query = query.filter(Documento.eliminado == eliminado)
+
+        # Cliente(s)
+        cliente_ids = filters.get("cliente_ids")
+        if cliente_ids:
+            query = query.filter(Documento.cliente_id.in_(cliente_ids))
+
+        # Tipo de documento
+        tipo_documento = filters.get("tipo_documento")
+        if tipo_documento:
+            query = query.filter(Documento.tipo_documento == tipo_documento)
+
+        # Documento: por ID exacto
+        documento_id = filters.get("documento_id")
+        if documento_id is not None:
+            query = query.filter(Documento.id == int(documento_id))
+
+        # Documento: por nombre (índice FTS5; LIKE si el índice no está instalado)
+        documento_nombre = filters.get("documento_nombre")
+        if documento_nombre:
+            hits = hits_contenido = None
+            if busqueda.fts_disponible(session, 'documentos'):
+                hits = busqueda.subconsulta_ranking('documentos', documento_nombre)
+            if filters.get("buscar_en_contenido") and busqueda.fts_disponible(session, 'contenido'):
+                hits_contenido = busqueda.subconsulta_ranking('contenido', documento_nombre)
+
+            if hits is not None and hits_contenido is not None:
+                # Coincidencia en el nombre O en el texto extraído del archivo
+                query = query.outerjoin(hits, hits.c.id == Documento.id).outerjoin(
+                    hits_contenido, hits_contenido.c.id == Documento.id
+                ).filter(or_(hits.c.id.isnot(None), hits_contenido.c.id.isnot(None)))
+            elif hits is not None:
+                query = query.join(hits, hits.c.id == Documento.id)
+            else:
+                query = query.filter(Documento.nombre.ilike(
+                    busqueda.patron_like(documento_nombre), escape=busqueda.ESCAPE_LIKE
+                ))
+
+        return query
+
+    def nombre_se_busca_con_fts(self, termino: str) -> bool:
+        """
+        Indica si _query_documentos buscará 'termino' en el nombre con FTS5 (prefijos por
+        palabra) o con LIKE (subcadena). Quien filtre en memoria debe usar el mismo criterio.
         """
+        if busqueda.construir_consulta_fts(termino) is None:
+            return False
         with self.get_session() as session:
-            query = session.query(
-                Documento.cliente_id,        # 0: ID Cliente
-                Documento.id,                # 1: ID Documento
-                Cliente.nombre.label("cliente_nombre"),   # 2: Cliente
-                Documento.nombre,            # 3: Nombre Documento
-                Documento.ubicacion_archivo, # 4: (tú lo usas para "Tipo Archivo" por extensión)
-                Documento.tipo_documento,    # 5: Tipo Documento
-                Documento.fecha_subida,      # 6: Fecha Carga
-                Documento.ubicacion_archivo.label("ruta_completa"), # 7: Ruta
-                Documento.eliminado          # 8: Eliminado
-            ).join(Cliente, Documento.cliente_id == Cliente.id)
-
-            # Papelera / activos
-            eliminado = filters.get("eliminado", False)
-            query = query.filter(Documento.eliminado == eliminado)
-
-            # Cliente(s)
-            cliente_ids = filters.get("cliente_ids")
-            if cliente_ids:
-                query = query.filter(Documento.cliente_id.in_(cliente_ids))
-
-            # Tipo de documento
-            tipo_documento = filters.get("tipo_documento")
-            if tipo_documento:
-                query = query.filter(Documento.tipo_documento == tipo_documento)
-
-            # Documento: por ID exacto
-            documento_id = filters.get("documento_id")
-            if documento_id is not None:
-                query = query.filter(Documento.id == int(documento_id))
-
-            # Documento: por nombre (LIKE, case-insensitive)
-            documento_nombre = filters.get("documento_nombre")
-            if documento_nombre:
-                query = query.filter(Documento.nombre.ilike(f"%{documento_nombre}%"))
-
-            return query.order_by(Documento.fecha_subida.desc()).all()
+            return busqueda.fts_disponible(session, 'documentos')
+
+    def get_documentos_filtered_as_tuples(self, **filters) -> list:
+        """
+        Obtiene TODOS los documentos que cumplen los filtros (ver _query_documentos), como tuplas.
+        Para la tabla de la interfaz usar get_documentos_pagina.
+        """
+        with self.get_session() as session:
+            query = self._query_documentos(session, **filters)
+            return query.order_by(Documento.fecha_subida.desc(), Documento.id.desc()).all()
+
+    def get_documentos_pagina(self, limite: int, despues_de: tuple | None = None, **filters) -> list:
+        """
+        Una página de documentos ordenados por (fecha_subida, id) descendente.
+        Paginación por clave (keyset): despues_de es el par (fecha_subida, id) de la última
+        fila ya cargada; la consulta sigue el índice desde ahí en lugar de saltar filas con OFFSET.
+        """
+        with self.get_session() as session:
+            query = self._query_documentos(session, **filters)
+            if despues_de is not None:
+                fecha, doc_id = despues_de
+                if fecha is None:
+                    # Las fechas nulas van al final (DESC): solo quedan nulas con id menor
+                    query = query.filter(Documento.fecha_subida.is_(None), Documento.id < doc_id)
+                else:
+                    query = query.filter(or_(
+                        Documento.fecha_subida < fecha,
+                        and_(Documento.fecha_subida == fecha, Documento.id < doc_id),
+                        Documento.fecha_subida.is_(None)
+                    ))
+            query = query.order_by(Documento.fecha_subida.desc(), Documento.id.desc())
+            return query.limit(int(limite)).all()
+
+    def contar_documentos(self, **filters) -> int:
+        """Número total de documentos que cumplen los filtros (COUNT, sin traer filas)."""
+        with self.get_session() as session:
+            query = self._query_documentos(session, **filters)
+            return query.with_entities(func.count(Documento.id)).scalar() or 0
 
     
     # En: SELECTA_SCAM/modulos/documentos/documentos_db.py
@@ -104,6 +174,47 @@ class DocumentosDB:
                 }
             return None
 
+    def add_documento(self, **data) -> int | None:
+        """Inserta un nuevo documento y devuelve su ID."""
+        with self.get_session() as session:
+            nuevo_documento = Documento(**data, fecha_subida=datetime.now(), eliminado=False)
+            session.add(nuevo_documento)
+            session.flush()
+            return nuevo_documento.id
+
+    def add_documento_con_copia(self, ruta_origen: str, ruta_destino: str,
+                                tipo_operacion: str = OPERACION_COPIAR, **data) -> tuple[int, int]:
+        """
+        Inserta un documento y registra la copia de su archivo en el diario de la cola,
+        en la misma transacción. Retorna (doc_id, op_id); la copia se ejecuta con ColaArchivos.encolar.
+        """
+        with self.get_session() as session:
+            nuevo_documento = Documento(**data, fecha_subida=datetime.now(), eliminado=False)
+            session.add(nuevo_documento)
+            session.flush()
+            operacion = registrar_operacion(session, tipo_operacion, ruta_origen, ruta_destino, nuevo_documento.id)
+            return nuevo_documento.id, operacion.id
+
+    def get_ubicacion_por_sha256(self, sha256: str) -> str | None:
+        """Ubicación del objeto ya guardado con ese contenido (búsqueda por índice), o None."""
+        with self.get_session() as session:
+            fila = session.query(Documento.ubicacion_archivo).filter(Documento.sha256 == sha256).first()
+            return fila[0] if fila else None
+
+    def asignar_archivo_almacenado(self, doc_id: int, ubicacion: str, sha256: str) -> bool:
+        """Apunta el documento al objeto ya copiado. False si el documento ya no existe."""
+        with self.get_session() as session:
+            afectados = session.query(Documento).filter(Documento.id == doc_id).update(
+                {Documento.ubicacion_archivo: ubicacion, Documento.sha256: sha256},
+                synchronize_session=False
+            )
+            return afectados > 0
+
+    def ubicacion_en_uso(self, ubicacion: str) -> bool:
+        """True si algún documento (incluidos los de la papelera) apunta a esa ubicación."""
+        with self.get_session() as session:
+            return session.query(Documento.id).filter(Documento.ubicacion_archivo == ubicacion).first() is not None
+
     def update_documento(self, doc_id: int, **kwargs) -> bool:
         """Actualiza un documento existente."""
         with self.get_session() as session:
@@ -122,37 +233,71 @@ class DocumentosDB:
                 return True
             return False
 
+    @staticmethod
+    def _lotes(doc_ids: list[int]):
+        """Parte la lista de IDs para no superar el límite de parámetros de SQLite en el IN (...)."""
+        ids = list(dict.fromkeys(doc_ids))
+        for inicio in range(0, len(ids), TAMANO_LOTE_IDS):
+            yield ids[inicio:inicio + TAMANO_LOTE_IDS]
+
+    def _marcar_eliminado(self, doc_ids: list[int], eliminado: bool) -> int:
+        """UPDATE por conjuntos de la marca de papelera, en una sola transacción. Retorna las filas afectadas."""
+        with self.get_session() as session:
+            afectados = 0
+            for lote in self._lotes(doc_ids):
+                afectados += session.query(Documento).filter(
+                    Documento.id.in_(lote)
+                ).update({Documento.eliminado: eliminado}, synchronize_session=False)
+            return afectados
+
     def mover_a_papelera(self, doc_ids: list[int]) -> bool:
         """Marca uno o varios documentos como eliminados (papelera)."""
-        with self.get_session() as session:
-            try:
-                session.query(Documento).filter(
-                    Documento.id.in_(doc_ids)
-                ).update({Documento.eliminado: True}, synchronize_session=False)
-                session.commit()
-                return True
-            except Exception as e:
-                logger.error(f"Error al mover documentos a la papelera: {e}", exc_info=True)
-                session.rollback()
-                return False
+        try:
+            self._marcar_eliminado(doc_ids, True)
+            return True
+        except Exception as e:
+            logger.error(f"Error al mover documentos a la papelera: {e}", exc_info=True)
+            return False
 
     def restaurar_desde_papelera(self, doc_ids: list[int]) -> bool:
         """Restaura documentos desde la papelera."""
-        with self.get_session() as session:
-            try:
-                result = (
-                    session.query(Documento)
-                    .filter(Documento.id.in_(doc_ids))
-                    .update({Documento.eliminado: False}, synchronize_session=False)
-                )
-                session.commit()
-                return result > 0
-            except Exception as e:
-                logger.error(f"Error al restaurar documentos de la papelera: {e}", exc_info=True)
-                session.rollback()
-                return False
+        try:
+            return self._marcar_eliminado(doc_ids, False) > 0
+        except Exception as e:
+            logger.error(f"Error al restaurar documentos de la papelera: {e}", exc_info=True)
+            return False
 
+    def eliminar_documentos_definitivo(self, doc_ids: list[int], resolver_ruta=None) -> list[int]:
+        """
+        Elimina varios documentos de forma permanente con DELETE por conjuntos, en una sola transacción
+        (el texto extraído se borra por el trigger documentos_texto_ad).
+        En la misma transacción registra en el diario de la cola el borrado de los archivos que ya
+        no usa ningún otro documento; resolver_ruta(cliente_id, ubicacion_archivo) da la ruta absoluta.
+        Retorna los IDs de esas operaciones, para ejecutarlas después del commit.
+        """
+        with self.get_session() as session:
+            borrados = []
+            for lote in self._lotes(doc_ids):
+                borrados.extend(tuple(fila) for fila in session.query(
+                    Documento.id, Documento.cliente_id, Documento.ubicacion_archivo
+                ).filter(Documento.id.in_(lote)))
+                session.query(Documento).filter(Documento.id.in_(lote)).delete(synchronize_session=False)
 
+            ubicaciones = list({fila[2] for fila in borrados if fila[2]})
+            en_uso = set()
+            for inicio in range(0, len(ubicaciones), TAMANO_LOTE_IDS):
+                en_uso.update(u for (u,) in session.query(Documento.ubicacion_archivo).filter(
+                    Documento.ubicacion_archivo.in_(ubicaciones[inicio:inicio + TAMANO_LOTE_IDS])
+                ).distinct())
+            op_ids = []
+            for doc_id, cliente_id, ubicacion in borrados:
+                if ubicacion and ubicacion not in en_uso:
+                    ruta = resolver_ruta(cliente_id, ubicacion) if resolver_ruta else ubicacion
+                    # La ubicación viaja como destino: el borrado vuelve a comprobarla antes de ejecutarse
+                    op_ids.append(registrar_operacion(
+                        session, OPERACION_ELIMINAR_ARCHIVO, ruta, ubicacion, documento_id=doc_id
+                    ).id)
+            return op_ids
 
     def get_documento_por_id(self, doc_id: int) -> Documento | None:
         """Obtiene un objeto de documento completo por su ID."""
@@ -169,4 +314,38 @@ class DocumentosDB:
             if documento:
                 session.delete(documento)
                 return True
-            return False
\ No newline at end of file
+            return False
+
+    # --- Texto extraído (índice de contenido) ---
+
+    def guardar_texto_documento(self, doc_id: int, texto: str, origen: str, paginas: int | None = None) -> bool:
+        """Guarda (o reemplaza) el texto extraído del archivo de un documento."""
+        with self.get_session() as session:
+            registro = session.query(DocumentoTexto).get(doc_id)
+            if registro is None:
+                registro = DocumentoTexto(documento_id=doc_id)
+                session.add(registro)
+            registro.texto = texto or ''
+            registro.origen = origen
+            registro.paginas = paginas
+            registro.fecha_extraccion = datetime.now()
+            return True
+
+    def get_documentos_sin_texto(self, limite: int | None = None) -> list[tuple]:
+        """
+        Devuelve (id, cliente_id, ubicacion_archivo) de los documentos cuyo texto
+        aún no se ha extraído, para el proceso de indexación en segundo plano.
+        Los que la cola de archivos aún no guardó no cuentan: se indexan al terminar la operación.
+        """
+        with self.get_session() as session:
+            query = session.query(
+                Documento.id, Documento.cliente_id, Documento.ubicacion_archivo
+            ).outerjoin(
+                DocumentoTexto, DocumentoTexto.documento_id == Documento.id
+            ).filter(
+                DocumentoTexto.documento_id.is_(None),
+                Documento.ubicacion_archivo != UBICACION_PENDIENTE
+            ).order_by(Documento.id)
+            if limite:
+                query = query.limit(limite)
+            return query.all()
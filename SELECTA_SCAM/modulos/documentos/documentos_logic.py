@@ -1,6 +1,6 @@
 import logging
-import os
 from .documentos_db import DocumentosDB
+from ...utils.cola_archivos import ejecutar_operaciones_ahora
 
 logger = logging.getLogger(__name__)
 
@@ -10,13 +10,14 @@ class DocumentosLogic:
         self.db = documentos_db_instance
         self.logger = logger
 
-    def get_documentos_para_tabla(self, **filters):
+    def _filtros_db(self, filters: dict) -> dict:
         """Normaliza los nombres de filtros que vienen del widget/controlador y los adapta a la DB."""
         eliminado = bool(filters.get('mostrando_papelera', False))
         tipo_documento = filters.get('tipo_documento_filtro') or filters.get('tipo_documento')
         documento_id = filters.get('documento_id_filtro') or filters.get('documento_id')
         documento_nombre = filters.get('documento_nombre_filtro') or filters.get('documento_nombre')
         cliente_ids = filters.get('cliente_ids')
+        buscar_en_contenido = bool(filters.get('buscar_en_contenido', False))
 
         db_filters = {
             'eliminado': eliminado,
@@ -24,15 +25,33 @@ class DocumentosLogic:
             'documento_id': documento_id,
             'documento_nombre': documento_nombre,
             'cliente_ids': cliente_ids,
+            'buscar_en_contenido': buscar_en_contenido or None,
         }
-        db_filters = {k: v for k, v in db_filters.items() if v not in (None, '', [])}
+        return {k: v for k, v in db_filters.items() if v not in (None, '', [])}
+
+    def get_documentos_para_tabla(self, **filters):
+        """Todos los documentos que cumplen los filtros (sin paginar)."""
+        return self.db.get_documentos_filtered_as_tuples(**self._filtros_db(filters))
+
+    def get_pagina_documentos(self, limite: int, despues_de: tuple | None = None, **filters) -> list:
+        """Una página de documentos a partir de la clave (fecha_subida, id) de la última fila cargada."""
+        return self.db.get_documentos_pagina(limite, despues_de, **self._filtros_db(filters))
 
-        return self.db.get_documentos_filtered_as_tuples(**db_filters)
+    def contar_documentos(self, **filters) -> int:
+        return self.db.contar_documentos(**self._filtros_db(filters))
 
     def agregar_documento(self, **data) -> int | None:
         """Agrega un nuevo documento."""
         return self.db.add_documento(**data)
 
+    def agregar_documento_con_copia(self, ruta_origen: str, ruta_destino: str, **data) -> tuple[int, int]:
+        """Agrega un documento y registra la copia (o el almacenamiento) de su archivo. Retorna (doc_id, op_id)."""
+        return self.db.add_documento_con_copia(ruta_origen, ruta_destino, **data)
+
+    def get_ubicacion_por_sha256(self, sha256: str) -> str | None:
+        """Si ya hay un documento con el mismo contenido, la ubicación de su archivo."""
+        return self.db.get_ubicacion_por_sha256(sha256)
+
     def editar_documento(self, doc_id: int, **data) -> bool:
         """Actualiza los detalles de un documento."""
         return self.db.update_documento(doc_id, **data)
@@ -49,34 +68,28 @@ class DocumentosLogic:
             return None
 
     def mover_a_papelera(self, doc_ids: list) -> bool:
-        """Marca documentos como eliminados (papelera)."""
-        try:
-            for doc_id in doc_ids:
-                self.db.update_documento(doc_id, eliminado=True)
-            return True
-        except Exception as e:
-            self.logger.error("Error al mover documentos a la papelera: %s", e)
-            return False
+        """Marca documentos como eliminados (papelera) en una sola transacción."""
+        return self.db.mover_a_papelera(doc_ids)
 
     def recuperar_de_papelera(self, doc_ids: list) -> bool:
-        """Restaura documentos desde la papelera."""
-        try:
-            for doc_id in doc_ids:
-                self.db.update_documento(doc_id, eliminado=False)
-            return True
-        except Exception as e:
-            self.logger.error("Error al recuperar documentos de la papelera: %s", e)
-            return False
+        """Restaura documentos desde la papelera en una sola transacción."""
+        return self.db.restaurar_desde_papelera(doc_ids)
 
-    def eliminar_documento_definitivamente(self, doc_ids: list) -> bool:
-        """Elimina documentos de forma permanente."""
+    def eliminar_documento_definitivamente(self, doc_ids: list, resolver_ruta=None, cola=None) -> bool:
+        """
+        Elimina documentos de forma permanente: los registros en una transacción (junto con el
+        diario de los archivos a borrar) y después los archivos que ya no usa ningún documento.
+        resolver_ruta(cliente_id, ubicacion_archivo) devuelve la ruta absoluta; por defecto se usa ubicacion_archivo.
+        Con cola (ColaArchivos) los archivos se borran en segundo plano; sin ella, aquí mismo.
+        """
         try:
-            for doc_id in doc_ids:
-                documento = self.db.get_documento_por_id(doc_id)
-                if documento and documento.ubicacion_archivo and os.path.exists(documento.ubicacion_archivo):
-                    os.remove(documento.ubicacion_archivo)
-                self.db.eliminar_documento_por_id(doc_id)
-            return True
+            op_ids = self.db.eliminar_documentos_definitivo(doc_ids, resolver_ruta)
         except Exception as e:
             self.logger.error("Error al eliminar documentos permanentemente: %s", e)
             return False
+        # El registro ya no existe: un archivo que no se pudo borrar queda en el diario para reintentarlo
+        if cola is not None:
+            cola.encolar(op_ids)
+        else:
+            ejecutar_operaciones_ahora(op_ids)
+        return True
@@ -0,0 +1,103 @@
+# SELECTA_SCAM/modulos/documentos/documentos_texto.py
+
+import os
+import logging
+
+try:
+    import fitz
+except ImportError:
+    fitz = None
+
+from ...utils.ocr import ocr_texto, ocr_disponible
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONES_PDF = {'.pdf'}
+EXTENSIONES_IMAGEN = {'.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp'}
+EXTENSIONES_TEXTO = {'.txt'}
+
+
+def _extraer_pdf(ruta: str, usar_ocr: bool) -> tuple[str, str, int]:
+    partes = []
+    with fitz.open(ruta) as doc:
+        paginas = doc.page_count
+        for page in doc:
+            partes.append(page.get_text("text"))
+        texto = "\n".join(partes)
+    if texto.strip() or not usar_ocr or not ocr_disponible():
+        return texto, 'pdf', paginas
+
+    # PDF escaneado: OCR de las páginas en paralelo (utils/ocr.py)
+    return ocr_texto(ruta), 'ocr', paginas
+
+
+def extraer_texto(ruta: str, usar_ocr: bool = True) -> tuple[str, str, int | None]:
+    """
+    Extrae el texto de un archivo para el índice de contenido.
+    Retorna (texto, origen, paginas). origen es 'pdf', 'ocr', 'texto' o 'sin_texto'.
+    Con usar_ocr=False los archivos escaneados devuelven texto vacío (se dejan para el OCR en segundo plano).
+    """
+    ext = os.path.splitext(ruta)[1].lower()
+    try:
+        if ext in EXTENSIONES_PDF and fitz is not None:
+            return _extraer_pdf(ruta, usar_ocr)
+        if ext in EXTENSIONES_TEXTO:
+            with open(ruta, 'r', encoding='utf-8', errors='ignore') as f:
+                return f.read(), 'texto', None
+        if ext in EXTENSIONES_IMAGEN and usar_ocr and ocr_disponible():
+            return ocr_texto(ruta), 'ocr', 1
+    except Exception as e:
+        logger.error(f"No se pudo extraer el texto de '{ruta}': {e}", exc_info=True)
+    return '', 'sin_texto', None
+
+
+def indexar_documento(documentos_db, doc_id: int, ruta: str, usar_ocr: bool = True) -> bool:
+    """
+    Extrae el texto de un archivo y lo guarda en documento_texto.
+    Si no hubo texto y el OCR no se intentó, no guarda nada para que el
+    proceso en segundo plano lo vuelva a intentar con OCR.
+    """
+    if not ruta or not os.path.exists(ruta):
+        logger.warning(f"Indexación de contenido: no existe el archivo del documento {doc_id}: {ruta}")
+        return False
+    texto, origen, paginas = extraer_texto(ruta, usar_ocr=usar_ocr)
+    if not texto.strip() and not usar_ocr:
+        return False
+    return documentos_db.guardar_texto_documento(doc_id, texto, origen, paginas)
+
+
+def indexar_documentos_pendientes(documentos_db, resolver_ruta, limite: int | None = None, progreso=None) -> int:
+    """
+    Proceso de relleno (backfill): extrae con OCR el texto de todos los documentos
+    que aún no tienen registro en documento_texto.
+    resolver_ruta(cliente_id, ubicacion_archivo) devuelve la ruta absoluta del archivo;
+    progreso(hechos, total) es opcional. Retorna el número de documentos indexados.
+    Un archivo que no está en disco (aún sin sincronizar) no se registra: se reintenta
+    en la próxima ejecución.
+    """
+    pendientes = documentos_db.get_documentos_sin_texto(limite)
+    total = len(pendientes)
+    indexados = 0
+    for i, (doc_id, cliente_id, ubicacion) in enumerate(pendientes, start=1):
+        if indexar_documento(documentos_db, doc_id, resolver_ruta(cliente_id, ubicacion), usar_ocr=True):
+            indexados += 1
+        if progreso:
+            progreso(i, total)
+    logger.info(f"Indexación de contenido: {indexados} de {total} documentos pendientes indexados.")
+    return indexados
+
+
+if __name__ == "__main__":
+    # Uso: python -m SELECTA_SCAM.modulos.documentos.documentos_texto
+    # Sin DocumentosController: no hace falta la cola de archivos ni el bucle de eventos de Qt
+    from SELECTA_SCAM.modulos.documentos.documentos_db import DocumentosDB
+    from SELECTA_SCAM.modulos.documentos.documentos_almacen import ruta_archivo_documento
+    from SELECTA_SCAM.modulos.documentos.documentos_controller import DOCUMENTOS_FOLDER
+
+    carpeta_base = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                                DOCUMENTOS_FOLDER)
+    indexar_documentos_pendientes(
+        DocumentosDB(),
+        lambda cliente_id, ubicacion: ruta_archivo_documento(carpeta_base, cliente_id, ubicacion),
+        progreso=lambda hechos, total: print(f"[{hechos}/{total}]")
+    )
@@ -2,13 +2,14 @@
 
 import os
 import sys
-import shutil
 import subprocess
-import sqlite3
 from PyQt5.QtGui import QColor
 from PyQt5.QtWidgets import QMessageBox
-# Modifica esta línea para importar RUTA_CLARO_DRIVE y DATABASE_PATH
-from SELECTA_SCAM.config.settings import RUTA_CLARO_DRIVE, DATABASE_PATH
+# RUTA_CLARO_DRIVE viene de settings; la base de datos se abre siempre a través de db_manager
+from SELECTA_SCAM.config.settings import RUTA_CLARO_DRIVE
+from SELECTA_SCAM.utils.db_manager import raw_connection
+from SELECTA_SCAM.utils.cola_archivos import get_cola_archivos
+from SELECTA_SCAM.modulos.documentos.documentos_almacen import calcular_sha256, ruta_objeto
 
 # ELIMINA la siguiente línea, ya no es necesaria aquí:
 # DATABASE_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "data", "base_datos.db")
@@ -61,18 +62,18 @@ def cargar_datos_iniciales():
             clientes: list of (id, nombre)
             procesos:  list of (id, radicado, tipo, cliente_id)
     """
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
+    # Conexión del pool del engine único (ver utils/db_manager.py)
+    with raw_connection() as conn:
+        cursor = conn.cursor()
 
-    # Cargar clientes activos
-    cursor.execute("SELECT id, nombre FROM clientes")
-    clientes = cursor.fetchall()
+        # Cargar clientes activos
+        cursor.execute("SELECT id, nombre FROM clientes")
+        clientes = cursor.fetchall()
 
-    # Cargar todos los procesos (sin filtro 'eliminado')
-    cursor.execute("SELECT id, radicado, tipo, cliente_id FROM procesos")
-    procesos = cursor.fetchall()
+        # Cargar todos los procesos (sin filtro 'eliminado')
+        cursor.execute("SELECT id, radicado, tipo, cliente_id FROM procesos")
+        procesos = cursor.fetchall()
 
-    conn.close()
     return clientes, procesos
 
 
@@ -93,26 +94,21 @@ def filtrar_procesos_por_cliente(procesos, cliente_id):
 
 def copiar_archivo_a_destino(ruta_origen, nombre_destino):
     """
-    Copia el archivo desde la ruta de origen a la carpeta fija,
-    evitando duplicar la extensión si ya la incluye.
+    Guarda el archivo en el almacén por contenido de la carpeta fija (objetos/ab/cd/<sha256>.ext).
+    Un archivo con el mismo contenido ya guardado no se vuelve a copiar ni a sincronizar, y dos
+    archivos distintos con el mismo nombre no chocan: nombre_destino es solo el nombre visible,
+    que se guarda en la base de datos (Documento.archivo).
+    La copia se encola en la cola de archivos (la carpeta es sincronizada y puede ser lenta
+    o estar bloqueada): retorna la ruta de destino sin esperar a que termine.
     """
     carpeta_destino = r"C:/Users/oscar/Claro drive2/LEX360"
     # Obtener extensión real del origen (incluye el punto), p.ej. ".docx"
     ext = os.path.splitext(ruta_origen)[1].lower()
+    ruta_destino = ruta_objeto(carpeta_destino, calcular_sha256(ruta_origen), ext)
 
-    # Si el nombre_destino ya termina con esa extensión, no la volvemos a agregar
-    if nombre_destino.lower().endswith(ext):
-        archivo_final = nombre_destino
-    else:
-        archivo_final = f"{nombre_destino}{ext}"
-
-    ruta_destino = os.path.join(carpeta_destino, archivo_final)
-
-    # Verificar si ya existe
     if os.path.exists(ruta_destino):
-        raise FileExistsError(f"El archivo {ruta_destino} ya existe.")
+        return ruta_destino  # Mismo contenido ya guardado
 
-    # Copiar
-    shutil.copy2(ruta_origen, ruta_destino)
+    # Copiar en segundo plano (con reintentos si el cliente de sincronización bloquea el archivo)
+    get_cola_archivos().copiar(ruta_origen, ruta_destino)
     return ruta_destino
-
@@ -30,6 +30,7 @@ from SELECTA_SCAM.modulos.documentos.documentos_controller import DocumentosCont
 from SELECTA_SCAM.modulos.clientes.clientes_logic import ClientesLogic
 from SELECTA_SCAM.modulos.documentos.documentos_utils import color_por_extension
 from SELECTA_SCAM.modulos.documentos.documentos_logic import DocumentosLogic
+from SELECTA_SCAM.config import settings
 logger = logging.getLogger(__name__)
 
 
@@ -50,71 +51,141 @@ FILE_TYPE_COLORS = {
     'JPEG': '#007BFF',
 }
 
+# Un único QColor por tipo de archivo, compartido por todas las celdas
+_COLORES_TIPO_ARCHIVO = {}
+_ROL_TEXTO = Qt.DisplayRole
+_ROL_COLOR = Qt.ForegroundRole
+
+
+def _extension_archivo(ubicacion: str) -> str:
+    return os.path.splitext(ubicacion)[1].upper().replace('.', '')
+
+
+def _color_tipo_archivo(extension: str) -> QColor:
+    color = _COLORES_TIPO_ARCHIVO.get(extension)
+    if color is None:
+        color = QColor(FILE_TYPE_COLORS.get(extension, "#000000"))
+        _COLORES_TIPO_ARCHIVO[extension] = color
+    return color
+
 
 class DocumentosTableModel(QAbstractTableModel):
     HEADERS = ["ID Cliente", 'ID', 'Cliente', 'Nombre Documento', 'Tipo Archivo', 'Tipo Documento', 'Fecha Carga', 'Ubicación Archivo', 'Eliminado']
+    COL_TIPO_ARCHIVO = HEADERS.index('Tipo Archivo')
 
     error_occurred = pyqtSignal(str)
 
     def __init__(self, documentos_logic_instance, parent=None):
         super().__init__(parent)
         self.documentos_logic = documentos_logic_instance
-        self._data = [] # _data ahora será una lista de tuplas
-
-    def rowCount(self, parent=None):
+        self._data = [] # _data ahora será una lista de tuplas (solo las páginas ya cargadas)
+        # Caché de presentación, paralela a _data: textos por columna y color de 'Tipo Archivo'
+        self._textos = []
+        self._colores = []
+        self._total = 0
+        self._cargar_mas = None
+        # Clave de la página pedida y aún no recibida (evita pedirla dos veces)
+        self._pagina_pendiente = None
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
         return len(self._data)
 
     def columnCount(self, parent=None):
         return len(self.HEADERS)
 
+    # --- Carga por páginas: la vista llama a fetchMore al llegar al final del scroll ---
 
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._cargar_mas is None or self._pagina_pendiente is not None:
+            return False
+        return len(self._data) < self._total
 
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent) or not self._data:
+            return
+        ultima = self._data[-1]
+        # Clave de la paginación: (fecha_subida, id) de la última fila cargada.
+        # La página se consulta en el pool de consultas; las filas llegan a _agregar_pagina.
+        despues_de = (ultima[6], ultima[1])
+        self._pagina_pendiente = despues_de
+        self._cargar_mas(
+            despues_de,
+            lambda filas: self._agregar_pagina(despues_de, filas),
+            lambda error: self._pagina_fallida(despues_de),
+        )
 
+    def _agregar_pagina(self, despues_de: tuple, filas: list):
+        if despues_de != self._pagina_pendiente:
+            return  # La tabla se recargó mientras tanto: la página es de otra búsqueda
+        self._pagina_pendiente = None
+        if not filas:
+            # Se borraron documentos desde que se contó el total: no hay más páginas
+            self._total = len(self._data)
+            return
+        inicio = len(self._data)
+        self.beginInsertRows(QModelIndex(), inicio, inicio + len(filas) - 1)
+        self._data.extend(filas)
+        self._preparar_filas(filas)
+        self.endInsertRows()
+
+    def _pagina_fallida(self, despues_de: tuple):
+        if despues_de == self._pagina_pendiente:
+            self._pagina_pendiente = None  # Al volver a llegar al final se reintenta
+
+    def total_filas(self) -> int:
+        """Total de documentos de la búsqueda (incluye los que aún no se han cargado)."""
+        return self._total
+
+    @staticmethod
+    def _preparar_fila(doc_tuple) -> tuple:
+        """
+        Convierte una tupla de la DB en los textos de cada columna, una sola vez por fila.
+        El orden de la tupla es:
+        0:cliente_id, 1:id, 2:cliente_nombre, 3:nombre_doc, 4:ubicacion, 5:tipo_doc, 6:fecha,
+        7:ruta_completa, 8:eliminado
+        """
+        ubicacion = doc_tuple[4]
+        fecha = doc_tuple[6]
+        return (
+            str(doc_tuple[0]),
+            str(doc_tuple[1]),
+            str(doc_tuple[2]),
+            str(doc_tuple[3]),
+            # Sin ubicación: la cola de archivos aún no terminó de guardarlo
+            _extension_archivo(ubicacion) if ubicacion else "Pendiente",
+            str(doc_tuple[5]),
+            # Formato completo con hora y segundos ("%Y-%m-%d %H:%M:%S"); isoformat es más rápido que strftime
+            fecha.isoformat(" ", "seconds") if isinstance(fecha, datetime) else str(fecha or ""),
+            str(doc_tuple[7]),
+            "Sí" if doc_tuple[8] else "No",
+        )
 
-    def data(self, index, role=Qt.DisplayRole):
-        if not index.isValid() or not (0 <= index.row() < len(self._data)):
-            return None
-
-        doc_tuple = self._data[index.row()]
-        col_name = self.HEADERS[index.column()]
+    @staticmethod
+    def _color_fila(doc_tuple):
+        ubicacion = doc_tuple[4]
+        if ubicacion and isinstance(ubicacion, str):
+            return _color_tipo_archivo(_extension_archivo(ubicacion))
+        return None
 
-        # Lógica para mostrar el TEXTO de cada celda
-        if role == Qt.DisplayRole:
-            try:
-                # El orden de la tupla ahora es:
-                # 0:cliente_id, 1:id, 2:cliente_nombre, 3:nombre_doc, 4:ubicacion, 5:tipo_doc, 6:fecha, 7:ruta_completa, 8:eliminado
-
-                if col_name == 'ID Cliente': return str(doc_tuple[0])
-                elif col_name == 'ID': return str(doc_tuple[1])
-                elif col_name == 'Cliente': return str(doc_tuple[2])
-                elif col_name == 'Nombre Documento': return str(doc_tuple[3])
-                elif col_name == 'Tipo Archivo':
-                    ubicacion = doc_tuple[4]
-                    return os.path.splitext(ubicacion)[1].upper().replace('.', '') if ubicacion else "N/A"
-                elif col_name == 'Tipo Documento': return str(doc_tuple[5])
-                elif col_name == 'Fecha Carga':
-                    value = doc_tuple[6]
-                    # Usamos el formato completo con hora y segundos
-                    return value.strftime("%Y-%m-%d %H:%M:%S") if isinstance(value, datetime) else str(value or "")
-                elif col_name == 'Ubicación Archivo': return str(doc_tuple[7])
-                elif col_name == 'Eliminado': return "Sí" if doc_tuple[8] else "No"
-
-            except IndexError:
-                return ""
-
-        # Lógica para pintar el COLOR del texto
-        elif role == Qt.ForegroundRole:
-            if col_name == 'Tipo Archivo':
-                try:
-                    ubicacion = doc_tuple[4] # La ubicación está en el índice 4
-                    if ubicacion and isinstance(ubicacion, str):
-                        extension = os.path.splitext(ubicacion)[1].upper().replace('.', '')
-                        color_hex = FILE_TYPE_COLORS.get(extension, "#000000")
-                        return QColor(color_hex)
-                except IndexError:
-                    pass
+    def _preparar_filas(self, filas):
+        self._textos.extend(self._preparar_fila(fila) for fila in filas)
+        self._colores.extend(self._color_fila(fila) for fila in filas)
 
+    def data(self, index, role=Qt.DisplayRole):
+        # Se llama en cada repintado de cada celda visible y para cada rol: primero se
+        # descartan los roles que no usamos y luego solo se lee lo precalculado.
+        if role == _ROL_TEXTO:
+            row = index.row()
+            if index.isValid() and 0 <= row < len(self._textos):
+                return self._textos[row][index.column()]
+        elif role == _ROL_COLOR and index.column() == self.COL_TIPO_ARCHIVO:
+            row = index.row()
+            if index.isValid() and 0 <= row < len(self._colores):
+                return self._colores[row]
         return None
+
     def headerData(self, section, orientation, role=Qt.DisplayRole):
         if role == Qt.DisplayRole and orientation == Qt.Horizontal:
             return self.HEADERS[section]
@@ -126,17 +197,26 @@ class DocumentosTableModel(QAbstractTableModel):
             return self._data[row][0] # El ID siempre está en la primera posición
         return None
         
-    def set_data(self, data):
-        """Método clave para recibir los datos y refrescar la tabla."""
+    def set_data(self, data, total: int | None = None, cargar_mas=None):
+        """
+        Método clave para recibir los datos y refrescar la tabla.
+        data es la primera página; total es el número de filas de la búsqueda completa y
+        cargar_mas(despues_de, al_terminar, al_fallar) pide la página siguiente en segundo plano
+        (ver DocumentosController.cargar_siguiente_pagina).
+        """
         self.beginResetModel()
-        self._data = data
+        self._data = list(data)
+        self._textos = []
+        self._colores = []
+        self._preparar_filas(self._data)
+        self._total = len(self._data) if total is None else max(total, len(self._data))
+        self._cargar_mas = cargar_mas
+        self._pagina_pendiente = None
         self.endResetModel()
 
     def load_data(self, **filters):
         """Refresca la tabla pidiendo los datos a la capa de lógica."""
-        self.beginResetModel()
-        self._data = self.documentos_logic.get_documentos_para_tabla(**filters)
-        self.endResetModel()
+        self.set_data(self.documentos_logic.get_documentos_para_tabla(**filters))
 
     # En la clase DocumentosTableModel
 
@@ -153,6 +233,28 @@ class DocumentosTableModel(QAbstractTableModel):
             # La ubicación del archivo está en el índice 6 de la tupla
             return self._data[row][6]
         return None
+
+    def fila(self, row: int) -> tuple | None:
+        """Tupla de datos de la fila (ver _preparar_fila para el orden), o None si no existe."""
+        if 0 <= row < len(self._data):
+            return self._data[row]
+        return None
+
+    def asignar_ubicacion(self, doc_id: int, ubicacion: str):
+        """Actualiza la fila de un documento cuyo archivo terminó de guardarse (si está cargada)."""
+        for row, fila in enumerate(self._data):
+            if fila[1] == doc_id:
+                fila = tuple(fila[:4]) + (ubicacion,) + tuple(fila[5:7]) + (ubicacion,) + tuple(fila[8:])
+                self._data[row] = fila
+                self._textos[row] = self._preparar_fila(fila)
+                self._colores[row] = self._color_fila(fila)
+                self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+                return
+
+    def archivo_pendiente(self, row: int) -> bool:
+        """True si el archivo del documento aún se está guardando (no hay ruta que abrir)."""
+        return 0 <= row < len(self._data) and not self._data[row][4]
+
     def get_document_id(self, row: int) -> int | None:
         """
         Devuelve el ID del documento en la fila dada.
@@ -199,7 +301,7 @@ class DocumentosModule(QWidget):
         self.tabla_documentos.setAlternatingRowColors(False)
 
         # Señales del controlador/modelo
-        self.controller.documentos_cargados.connect(self.update_document_table)
+        self.controller.documentos_cargados.connect(self.on_documentos_cargados)
         self.controller.clientes_cargados.connect(lambda lista: self.cargar_clientes_en_combo(lista, include_search_option=True))
         self.documentos_model.error_occurred.connect(self.mostrar_error)
         self.controller.operation_successful.connect(self.mostrar_informacion)
@@ -216,6 +318,15 @@ class DocumentosModule(QWidget):
         self.empty_table_label.setStyleSheet("color: #888;")
         self.empty_table_label.setVisible(False)
 
+        # Progreso de la cola de archivos (copias y borrados en segundo plano)
+        self.archivos_label = QLabel()
+        self.archivos_label.setStyleSheet("color: #5D566F; font-size: 13px; font-weight: normal;")
+        self.archivos_label.setVisible(False)
+        self.controller.cola_archivos.progreso.connect(self.on_progreso_archivos)
+        self.controller.cola_archivos.avance.connect(self.on_avance_archivo)
+        self.controller.archivo_guardado.connect(self.documentos_model.asignar_ubicacion)
+        self._archivos_pendientes = (0, 0)
+
         # Estilos
         self.setStyleSheet("""
             QWidget {
@@ -368,17 +479,29 @@ class DocumentosModule(QWidget):
         self.hide_tooltip_timer.setSingleShot(True)
         self.hide_tooltip_timer.timeout.connect(self.custom_tooltip_label.hide)
         self._last_hovered_index = QModelIndex()
+        # Vista previa de la primera página al pasar por 'Tipo Archivo' (miniaturas en caché)
+        self.preview_tooltip_label = QLabel(self)
+        self.preview_tooltip_label.setWindowFlags(Qt.ToolTip | Qt.FramelessWindowHint)
+        self.preview_tooltip_label.setStyleSheet("background-color: white; border: 1px solid #5D566F; padding: 4px;")
+        self.preview_tooltip_label.hide()
+        self.hide_tooltip_timer.timeout.connect(self.preview_tooltip_label.hide)
+        self._preview_pendiente = None  # (ruta, fila, posición global) de la miniatura que se espera
+        self.controller.miniaturas.miniatura_lista.connect(self.on_miniatura_lista)
+
+        # Búsqueda mientras se escribe: se espera a que el usuario deje de teclear
+        self.busqueda_timer = QTimer(self)
+        self.busqueda_timer.setSingleShot(True)
+        self.busqueda_timer.setInterval(settings.BUSQUEDA_DEBOUNCE_MS)
+        self.busqueda_timer.timeout.connect(self.ejecutar_busqueda)
 
         # Construcción de UI (crea los widgets como search_* y cliente_combo)
         self.setup_ui()
 
         # 🔗 Conexiones SOLO de BÚSQUEDA (no tocar Cargar Docus)
+        # (textChanged y los combos ya están conectados en connect_signals, con debounce)
         self.search_cliente_input.returnPressed.connect(self.ejecutar_busqueda)
-        self.search_cliente_input.textChanged.connect(self.ejecutar_busqueda)
-        self.search_cliente_combo.currentIndexChanged.connect(self.ejecutar_busqueda)
         self.search_doc_input.returnPressed.connect(self.ejecutar_busqueda)
-        self.search_doc_input.textChanged.connect(self.ejecutar_busqueda)
-        self.search_tipo_doc_combo.currentIndexChanged.connect(self.ejecutar_busqueda)
+        self.search_contenido_checkbox.stateChanged.connect(self.ejecutar_busqueda)
 
         # 🔗 Conexión de “Cargar Docus” (combo independiente del filtro)
         self.cliente_combo.currentIndexChanged.connect(self._on_cliente_combo_changed)
@@ -519,6 +642,9 @@ class DocumentosModule(QWidget):
         self.search_doc_input.setPlaceholderText("Buscar por nombre de documento")
         self.search_doc_input.setSizePolicy(QSizePolicy.MinimumExpanding, QSizePolicy.Preferred)
         search_layout.addWidget(self.search_doc_input)
+        self.search_contenido_checkbox = QCheckBox("En contenido")
+        self.search_contenido_checkbox.setToolTip("Buscar también dentro del texto de los archivos (PDF/OCR).")
+        search_layout.addWidget(self.search_contenido_checkbox)
         search_layout.addWidget(QLabel("Tipo:"))
         self.search_tipo_doc_combo = QComboBox()
         self.search_tipo_doc_combo.addItem("Todos", "Todos")
@@ -539,6 +665,7 @@ class DocumentosModule(QWidget):
         search_layout.addWidget(self.btn_limpiar_busqueda)
         filters_and_table_container_layout.addLayout(search_layout)
         filters_and_table_container_layout.addWidget(self.empty_table_label, 1)
+        filters_and_table_container_layout.addWidget(self.archivos_label)
         filters_and_table_container_layout.addWidget(self.tabla_documentos, 1)
         main_layout.addLayout(filters_and_table_container_layout, 1)
         table_actions_layout = QHBoxLayout()
@@ -770,6 +897,8 @@ class DocumentosModule(QWidget):
 
         
     def show_custom_tooltip(self, index, mouse_pos):
+        if index.column() == DocumentosTableModel.COL_TIPO_ARCHIVO and self.show_preview_tooltip(index, mouse_pos):
+            return
         tooltip_text_from_model = self.documentos_model.data(index, Qt.ToolTipRole)
         cell_display_data = self.documentos_model.data(index, Qt.DisplayRole)
         cell_display_text = str(cell_display_data) if cell_display_data is not None else ""
@@ -813,7 +942,43 @@ class DocumentosModule(QWidget):
 
 
 
+    def show_preview_tooltip(self, index, mouse_pos) -> bool:
+        """
+        Muestra la miniatura del documento de la fila. Si aún no existe, se pide en segundo
+        plano y se muestra al llegar (on_miniatura_lista) si el ratón sigue en la misma fila.
+        Retorna False si el tipo de archivo no tiene vista previa.
+        """
+        fila = self.documentos_model.fila(index.row())
+        if fila is None:
+            return False
+        ruta, pixmap = self.controller.get_miniatura_documento(fila[0], fila[4])
+        if not ruta or not self.controller.miniaturas.soporta(ruta):
+            return False
+        global_pos = self.tabla_documentos.viewport().mapToGlobal(mouse_pos)
+        self.custom_tooltip_label.hide()
+        if pixmap is None:
+            self._preview_pendiente = (ruta, index.row(), global_pos)
+            self.preview_tooltip_label.hide()
+            return True
+        self._preview_pendiente = None
+        self.preview_tooltip_label.setPixmap(pixmap)
+        self.preview_tooltip_label.adjustSize()
+        self.preview_tooltip_label.move(global_pos.x() + 10, global_pos.y() + 10)
+        self.preview_tooltip_label.show()
+        self.hide_tooltip_timer.start(4000)
+        return True
+
+    def on_miniatura_lista(self, ruta):
+        if self._preview_pendiente is None or self._preview_pendiente[0] != ruta:
+            return
+        _, fila, global_pos = self._preview_pendiente
+        if self._last_hovered_index.isValid() and self._last_hovered_index.row() == fila:
+            index = self.documentos_model.index(fila, DocumentosTableModel.COL_TIPO_ARCHIVO)
+            self.show_preview_tooltip(index, self.tabla_documentos.viewport().mapFromGlobal(global_pos))
+
     def hide_custom_tooltip(self):
+        self._preview_pendiente = None
+        self.preview_tooltip_label.hide()
         self.custom_tooltip_label.hide()
         if self.hide_tooltip_timer.isActive():
             self.hide_tooltip_timer.stop()
@@ -826,11 +991,8 @@ class DocumentosModule(QWidget):
             self.mostrar_advertencia("Sin clientes", "No se encontraron clientes activos en la base de datos.")
             self.cargar_clientes_en_combo([])
 
-        documentos = self.controller.get_documentos_activos()
-        if documentos:
-            self.update_document_table(documentos)
-        else:
-            self.mostrar_mensaje("Sin documentos", "No hay documentos activos en la base de datos.")
+        # Primera página de documentos activos; llega a la tabla por documentos_cargados
+        documentos = self.controller.buscar_documentos()
         if not documentos:
             self.mostrar_mensaje("Sin documentos", "No hay documentos activos en la base de datos.")
     
@@ -927,7 +1089,7 @@ class DocumentosModule(QWidget):
 
         # Obtenemos los datos de la forma nueva y segura
         documento_id = self.documentos_model.get_documento_id(row)
-        documento_nombre = self.documentos_model._data[row][3] # El nombre está en el índice 3
+        documento_nombre = self.documentos_model.fila(row)[3] # El nombre está en el índice 3
 
         if documento_id is None:
             self.mostrar_error("Error", "No se pudo obtener el ID del documento seleccionado.")
@@ -941,6 +1103,10 @@ class DocumentosModule(QWidget):
                 # Abrimos el visor, que ya sabe qué hacer con la ruta
                 visor_dialog = VisorDocumentoDialog(document_path, documento_nombre, parent=self)
                 visor_dialog.exec_()
+            elif self.documentos_model.archivo_pendiente(row):
+                QMessageBox.information(self, "Archivo en Proceso",
+                                        "El archivo de este documento aún se está guardando. "
+                                        "Inténtelo de nuevo en unos momentos.")
             else:
                 QMessageBox.warning(self, "Archivo no Encontrado", 
                                     "No se pudo encontrar el archivo físico del documento. "
@@ -1261,7 +1427,11 @@ class DocumentosModule(QWidget):
         """
         try:
             documentos_a_mostrar = documentos_a_mostrar or []  # ← pequeño guard
-            self.documentos_model.set_data(documentos_a_mostrar)
+            self.documentos_model.set_data(
+                documentos_a_mostrar,
+                total=self.controller.total_documentos,
+                cargar_mas=self.controller.cargar_siguiente_pagina
+            )
             self.logger.info(f"Tabla de documentos actualizada con {len(documentos_a_mostrar)} documentos.")
 
 
@@ -1587,7 +1757,7 @@ class DocumentosModule(QWidget):
 
             if success:
                 QMessageBox.information(self, "Éxito", f"Se restauraron {len(doc_ids)} documento(s).")
-                self.ejecutar_busqueda()
+                self.ejecutar_busqueda_sincrona()
                 # Forzar selección del primer documento y actualizar botones
                 if self.documentos_model.rowCount() > 0:
                     index = self.documentos_model.index(0, 0)
@@ -1658,32 +1828,14 @@ class DocumentosModule(QWidget):
                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         
         if resp == QMessageBox.Yes:
-            all_success = True
-            failed_docs_list = []
-
-            for doc_info in documentos_a_eliminar_info:
-                doc_id = doc_info['id']
-                doc_nombre = doc_info['nombre']
-                try:
-                    success, message = self.controller.eliminar_documento_definitivamente(doc_id)
-                    if success:
-                        logger.info(f"Documento '{doc_nombre}' (ID: {doc_id}) eliminado permanentemente. Mensaje: {message}")
-                    else:
-                        all_success = False
-                        failed_docs_list.append(f"'{doc_nombre}' (ID: {doc_id}) - Falló: {message}")
-                except Exception as e:
-                    all_success = False
-                    failed_docs_list.append(f"'{doc_nombre}' (ID: {doc_id}) - Error inesperado: {e}")
-                    logger.error(f"Error inesperado al eliminar definitivamente documento ID {doc_id}: {e}", exc_info=True)
-
-            if all_success:
+            # Un solo DELETE para toda la selección; los archivos se borran después en lote
+            doc_ids = [doc_info['id'] for doc_info in documentos_a_eliminar_info]
+            if self.controller.eliminar_documentos_definitivamente(doc_ids):
+                logger.info(f"{len(doc_ids)} documento(s) eliminado(s) permanentemente: {doc_ids}")
                 QMessageBox.information(self, "Éxito", "Documento(s) eliminado(s) permanentemente.")
             else:
-                if len(failed_docs_list) == len(documentos_a_eliminar_info):
-                    self.mostrar_error("Error Grave", "No se pudo eliminar ninguno de los documentos seleccionados permanentemente.")
-                else:
-                    self.mostrar_advertencia("Eliminación Parcial", 
-                                            f"Se eliminaron algunos documentos, pero hubo problemas con:\n- " + "\n- ".join(failed_docs_list))
+                self.mostrar_error("Error Grave",
+                                   "No se pudo eliminar ninguno de los documentos seleccionados permanentemente.")
 
             # 🔥 Ajuste clave:
             # En lugar de volver a llamar búsqueda y provocar que el mensaje aparezca sin selección
@@ -1691,11 +1843,42 @@ class DocumentosModule(QWidget):
             self.ejecutar_busqueda()                 # Refresca la tabla sin provocar advertencias
 
 
+    def on_progreso_archivos(self, hechas: int, total: int):
+        """Muestra el avance de las copias/borrados pendientes; se oculta al vaciarse la cola."""
+        self._archivos_pendientes = (hechas, total)
+        if total and hechas < total:
+            self.archivos_label.setText(f"Guardando archivos: {hechas} de {total}...")
+            self.archivos_label.setVisible(True)
+        else:
+            self.archivos_label.setVisible(False)
+
+    def on_avance_archivo(self, op_id: int, copiados, total):
+        """Porcentaje de la copia en curso (archivos grandes), junto al contador de la cola."""
+        hechas, pendientes = self._archivos_pendientes
+        if not total or not pendientes or hechas >= pendientes:
+            return
+        porcentaje = int(copiados * 100 / total)
+        self.archivos_label.setText(f"Guardando archivos: {hechas} de {pendientes} ({porcentaje}%)...")
+        self.archivos_label.setVisible(True)
+
     def ejecutar_busqueda(self):
         """
         Ejecuta la búsqueda de documentos basándose en los filtros actuales de la UI
-        y la vista seleccionada (activos o papelera), y gestiona la visibilidad de la UI.
+        y la vista seleccionada (activos o papelera). La consulta corre en segundo plano
+        y el resultado llega por documentos_cargados (ver on_documentos_cargados).
+        """
+        self._buscar_documentos(sincrona=False)
+
+    def ejecutar_busqueda_sincrona(self):
         """
+        Como ejecutar_busqueda, pero la tabla queda actualizada al retornar.
+        Para quien necesita leer el modelo justo después (p. ej. tras restaurar).
+        """
+        self._buscar_documentos(sincrona=True)
+
+    def _buscar_documentos(self, sincrona: bool):
+        # Cualquier búsqueda explícita reemplaza a la que estaba esperando el debounce
+        self.busqueda_timer.stop()
         if hasattr(self, 'custom_tooltip_label') and self.custom_tooltip_label is not None:
             self.custom_tooltip_label.hide()
         if hasattr(self, 'hide_tooltip_timer') and self.hide_tooltip_timer.isActive():
@@ -1752,43 +1935,86 @@ class DocumentosModule(QWidget):
             f"mostrando_papelera={mostrando_papelera_actual}"
         )
 
+        filtros = dict(
+            cliente_id_exacto=final_cliente_id_filter,
+            cliente_nombre_filtro_texto=final_cliente_nombre_filter,
+            documento_nombre_filtro=final_nombre_doc_filter,
+            documento_id_filtro=final_documento_id_filter,
+            tipo_documento_filtro=tipo_documento_filtro,
+            mostrando_papelera=mostrando_papelera_actual,
+            buscar_en_contenido=self.search_contenido_checkbox.isChecked()
+        )
+
         try:
-            documentos_obtenidos = self.controller.buscar_documentos(
-                cliente_id_exacto=final_cliente_id_filter,
-                cliente_nombre_filtro_texto=final_cliente_nombre_filter,
-                documento_nombre_filtro=final_nombre_doc_filter,
-                documento_id_filtro=final_documento_id_filter,
-                tipo_documento_filtro=tipo_documento_filtro,
-                mostrando_papelera=mostrando_papelera_actual
-            ) or []   # ⚠️ siempre aseguramos que sea lista
-
-            logger.info(f"Controlador devolvió {len(documentos_obtenidos)} documentos.")
-            print(f"DEBUG: Controlador devolvió {len(documentos_obtenidos)} documentos.")
-
-            self.update_document_table(documentos_obtenidos)
-
-            if not documentos_obtenidos:
-                # ⚠️ Nuevo comportamiento
+            if sincrona:
+                self.controller.buscar_documentos(**filtros)
+            else:
+                self.controller.buscar_documentos_async(**filtros)
+        except Exception as e:
+            logger.error(f"Error al ejecutar búsqueda en el controlador: {e}")
+            self.mostrar_error("Error de Búsqueda", f"No se pudieron cargar los documentos: {e}")
+
+    def on_documentos_cargados(self, documentos):
+        """
+        Recibe el resultado de una búsqueda (síncrona o en segundo plano), actualiza la tabla
+        y gestiona la visibilidad de la UI según la vista actual (activos o papelera).
+        """
+        documentos = documentos or []
+        logger.info(f"Controlador devolvió {len(documentos)} documentos.")
+        self.update_document_table(documentos)
+
+        if not documentos:
+            # ⚠️ Nuevo comportamiento
+            self.tabla_documentos.setVisible(False)
+            self.empty_table_label.setText("No se encontraron documentos para ese cliente.")
+            self.empty_table_label.setVisible(True)
+        else:
+            self.tabla_documentos.setVisible(True)
+            self.empty_table_label.setVisible(False)
+
+        if self.mostrando_papelera:
+            self.btn_restaurar.setVisible(True)
+            self.btn_eliminar_definitivo.setVisible(True)
+            self.btn_papelera.setText("Ver Documentos Activos")
+            self.btn_papelera.setToolTip("Haz clic para ver los documentos activos.")
+            self.btn_seleccionar_archivo.setVisible(False)
+            self.btn_agregar.setVisible(False)
+            self.main_load_docs_label.setVisible(False)
+            self.cliente_combo.setVisible(False)
+            self.nom_doc_label.setVisible(False)
+            self.nombre_doc_input.setVisible(False)
+            self.tipo_doc_label.setVisible(False)
+            self.tipo_documento_combo.setVisible(False)
+            self.label_ruta_archivo.setVisible(False)
+            self.archivo_path_display.setVisible(False)
+            self.btn_editar.setVisible(False)
+            self.btn_cancelar_edicion.setVisible(False)
+            self.doc_id_label.setVisible(False)
+            self.doc_id_display.setVisible(False)
+
+            if not documentos:
                 self.tabla_documentos.setVisible(False)
-                self.empty_table_label.setText("No se encontraron documentos para ese cliente.")
+                self.empty_table_label.setText("La papelera está vacía.")
                 self.empty_table_label.setVisible(True)
             else:
                 self.tabla_documentos.setVisible(True)
                 self.empty_table_label.setVisible(False)
 
-            if mostrando_papelera_actual:
-                self.btn_restaurar.setVisible(True)
-                self.btn_eliminar_definitivo.setVisible(True)
-                self.btn_papelera.setText("Ver Documentos Activos")
-                self.btn_papelera.setToolTip("Haz clic para ver los documentos activos.")
-                self.btn_seleccionar_archivo.setVisible(False)
-                self.btn_agregar.setVisible(False)
-                self.main_load_docs_label.setVisible(False)
-                self.cliente_combo.setVisible(False)
-                self.nom_doc_label.setVisible(False)
-                self.nombre_doc_input.setVisible(False)
-                self.tipo_doc_label.setVisible(False)
-                self.tipo_documento_combo.setVisible(False)
+        else:  # Documentos activos
+            self.btn_restaurar.setVisible(False)
+            self.btn_eliminar_definitivo.setVisible(False)
+            self.btn_papelera.setText("Ver Papelera")
+            self.btn_papelera.setToolTip("Haz clic para ver los documentos enviados a la papelera.")
+            self.btn_seleccionar_archivo.setVisible(True)
+            self.btn_agregar.setVisible(True)
+            self.main_load_docs_label.setVisible(True)
+            self.cliente_combo.setVisible(True)
+            self.nom_doc_label.setVisible(True)
+            self.nombre_doc_input.setVisible(True)
+            self.tipo_doc_label.setVisible(True)
+            self.tipo_documento_combo.setVisible(True)
+
+            if not self.is_editing:
                 self.label_ruta_archivo.setVisible(False)
                 self.archivo_path_display.setVisible(False)
                 self.btn_editar.setVisible(False)
@@ -1796,49 +2022,15 @@ class DocumentosModule(QWidget):
                 self.doc_id_label.setVisible(False)
                 self.doc_id_display.setVisible(False)
 
-                if not documentos_obtenidos:
-                    self.tabla_documentos.setVisible(False)
-                    self.empty_table_label.setText("La papelera está vacía.")
-                    self.empty_table_label.setVisible(True)
-                else:
-                    self.tabla_documentos.setVisible(True)
-                    self.empty_table_label.setVisible(False)
-
-            else:  # Documentos activos
-                self.btn_restaurar.setVisible(False)
-                self.btn_eliminar_definitivo.setVisible(False)
-                self.btn_papelera.setText("Ver Papelera")
-                self.btn_papelera.setToolTip("Haz clic para ver los documentos enviados a la papelera.")
-                self.btn_seleccionar_archivo.setVisible(True)
-                self.btn_agregar.setVisible(True)
-                self.main_load_docs_label.setVisible(True)
-                self.cliente_combo.setVisible(True)
-                self.nom_doc_label.setVisible(True)
-                self.nombre_doc_input.setVisible(True)
-                self.tipo_doc_label.setVisible(True)
-                self.tipo_documento_combo.setVisible(True)
-
-                if not self.is_editing:
-                    self.label_ruta_archivo.setVisible(False)
-                    self.archivo_path_display.setVisible(False)
-                    self.btn_editar.setVisible(False)
-                    self.btn_cancelar_edicion.setVisible(False)
-                    self.doc_id_label.setVisible(False)
-                    self.doc_id_display.setVisible(False)
-
-                if not documentos_obtenidos:
-                    self.tabla_documentos.setVisible(False)
-                    self.empty_table_label.setText("No hay documentos disponibles. ¡Agrega uno nuevo!")
-                    self.empty_table_label.setVisible(True)
-                else:
-                    self.tabla_documentos.setVisible(True)
-                    self.empty_table_label.setVisible(False)
-
-            self.update_action_buttons_state()
+            if not documentos:
+                self.tabla_documentos.setVisible(False)
+                self.empty_table_label.setText("No hay documentos disponibles. ¡Agrega uno nuevo!")
+                self.empty_table_label.setVisible(True)
+            else:
+                self.tabla_documentos.setVisible(True)
+                self.empty_table_label.setVisible(False)
 
-        except Exception as e:
-            logger.error(f"Error al ejecutar búsqueda en el controlador: {e}")
-            self.mostrar_error("Error de Búsqueda", f"No se pudieron cargar los documentos: {e}")
+        self.update_action_buttons_state()
 
     
     def limpiar_filtros_busqueda(self):
@@ -1927,7 +2119,8 @@ class DocumentosModule(QWidget):
         self.ejecutar_busqueda()
 
     def on_search_input_changed(self):
-        self.ejecutar_busqueda()
+        # Se reinicia en cada tecla: la búsqueda sale cuando el usuario deja de escribir
+        self.busqueda_timer.start()
 
     def mostrar_error(self, titulo: str, mensaje: str):
         QMessageBox.critical(self, titulo, mensaje)
@@ -1960,7 +2153,7 @@ class DocumentosModule(QWidget):
             if self.controller.recuperar_de_papelera(doc_ids):
                 self.mostrar_informacion("Éxito", f"Se restauraron {len(doc_ids)} documento(s).")
 
-                self.ejecutar_busqueda()
+                self.ejecutar_busqueda_sincrona()
 
                 # ⚡ Después de restaurar, si la papelera está vacía → volver a activos
                 if self.mostrando_papelera and self.documentos_model.rowCount() == 0:
@@ -2010,10 +2203,7 @@ class DocumentosModule(QWidget):
         except Exception as e:
             self.mostrar_error("Error en vista", f"Ocurrió un error al eliminar: {e}")
             logger.error(f"Error al eliminar definitivamente: {e}", exc_info=True)
-<<<<<<< HEAD
-# prueba de commit automático
-=======
-        
+
     def on_restaurar_clicked(self):
         """
         Acción al restaurar un documento desde la papelera:
@@ -2035,5 +2225,3 @@ class DocumentosModule(QWidget):
 
         except Exception as e:
             print(f"Error al restaurar documento: {e}")
-
->>>>>>> develop
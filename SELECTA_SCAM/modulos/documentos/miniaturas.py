@@ -0,0 +1,160 @@
+# SELECTA_SCAM/modulos/documentos/miniaturas.py
+
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtGui import QPixmap
+from PyQt5.QtWidgets import QApplication
+
+from .visor_paginas import clave_archivo
+from ...config import settings
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONES_MINIATURA = {'.pdf', '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tif', '.tiff'}
+
+
+def generar_miniatura(ruta: str, destino: str, lado: int) -> bool:
+    """
+    Rasteriza la primera página (o la imagen) de ruta con su lado mayor a 'lado' píxeles y
+    la guarda como PNG en destino. Se ejecuta en un proceso aparte: no usa Qt.
+    """
+    with fitz.open(ruta) as doc:
+        if doc.page_count == 0:
+            return False
+        page = doc.load_page(0)
+        escala = lado / max(page.rect.width, page.rect.height, 1)
+        pix = page.get_pixmap(matrix=fitz.Matrix(escala, escala), alpha=False)
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    temporal = f"{destino}.{os.getpid()}.parcial"
+    pix.save(temporal, output="png")
+    os.replace(temporal, destino)
+    return True
+
+
+class _SenalesMiniaturas(QObject):
+    # Se crea en el hilo de la interfaz; los futures avisan desde el hilo del executor.
+    terminada = pyqtSignal(str, str, bool)  # ruta, clave, generada
+
+
+class ServicioMiniaturas(QObject):
+    """
+    Vistas previas de la primera página de PDFs e imágenes.
+
+    Se generan en un pool de procesos (MINIATURAS_PROCESOS) y se guardan en disco
+    (MINIATURAS_DIR) con el nombre derivado de clave_archivo: un archivo modificado tiene
+    otra clave y otra miniatura. Las ya leídas quedan en memoria (LRU de MINIATURAS_EN_MEMORIA),
+    de modo que pasar el ratón por la tabla no abre ningún documento.
+    """
+    miniatura_lista = pyqtSignal(str)  # ruta del documento
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.logger = logger
+        self.carpeta = settings.MINIATURAS_DIR
+        self.lado = settings.MINIATURAS_LADO
+        self.max_memoria = settings.MINIATURAS_EN_MEMORIA
+        self._memoria = OrderedDict()  # clave -> QPixmap
+        self._pendientes = set()       # claves en generación
+        self._executor = None
+        self._senales = _SenalesMiniaturas()
+        self._senales.terminada.connect(self._on_terminada)
+
+    @staticmethod
+    def soporta(ruta: str) -> bool:
+        return os.path.splitext(ruta)[1].lower() in EXTENSIONES_MINIATURA
+
+    def _archivo_cache(self, clave: str) -> str:
+        nombre = hashlib.sha1(clave.encode('utf-8')).hexdigest()
+        return os.path.join(self.carpeta, nombre[:2], f"{nombre}.png")
+
+    def _clave(self, ruta: str) -> str | None:
+        try:
+            return clave_archivo(ruta)
+        except OSError:
+            return None  # El archivo no existe (o aún se está copiando)
+
+    def _recordar(self, clave: str, pixmap: QPixmap):
+        self._memoria[clave] = pixmap
+        self._memoria.move_to_end(clave)
+        while len(self._memoria) > self.max_memoria:
+            self._memoria.popitem(last=False)
+
+    def en_memoria(self, ruta: str) -> QPixmap | None:
+        """Miniatura si ya está en memoria; no lee el disco ni encola nada."""
+        clave = self._clave(ruta)
+        pixmap = self._memoria.get(clave) if clave else None
+        if pixmap is not None:
+            self._memoria.move_to_end(clave)
+        return pixmap
+
+    def obtener(self, ruta: str) -> QPixmap | None:
+        """
+        Miniatura desde memoria o, si no, desde el caché en disco. Si aún no existe se encola
+        su generación y se retorna None: miniatura_lista(ruta) avisa cuando está lista.
+        """
+        if not self.soporta(ruta):
+            return None
+        clave = self._clave(ruta)
+        if clave is None:
+            return None
+        pixmap = self._memoria.get(clave)
+        if pixmap is not None:
+            self._memoria.move_to_end(clave)
+            return pixmap
+        archivo = self._archivo_cache(clave)
+        if os.path.exists(archivo):
+            pixmap = QPixmap(archivo)
+            if not pixmap.isNull():
+                self._recordar(clave, pixmap)
+                return pixmap
+        self._encolar(ruta, clave, archivo)
+        return None
+
+    def _encolar(self, ruta: str, clave: str, archivo: str):
+        if clave in self._pendientes:
+            return
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=settings.MINIATURAS_PROCESOS)
+        self._pendientes.add(clave)
+        future = self._executor.submit(generar_miniatura, ruta, archivo, self.lado)
+        future.add_done_callback(lambda f: self._senales.terminada.emit(
+            ruta, clave, not f.cancelled() and f.exception() is None and bool(f.result())
+        ))
+
+    def _on_terminada(self, ruta: str, clave: str, generada: bool):
+        self._pendientes.discard(clave)
+        if not generada:
+            self.logger.debug(f"No se pudo generar la miniatura de '{ruta}'.")
+            return
+        pixmap = QPixmap(self._archivo_cache(clave))
+        if pixmap.isNull():
+            return
+        self._recordar(clave, pixmap)
+        self.miniatura_lista.emit(ruta)
+
+    def cerrar(self):
+        """Descarta lo pendiente y libera los procesos."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._pendientes.clear()
+
+
+# Servicio único: la tabla de documentos y el visor comparten memoria y procesos.
+_servicio_miniaturas = None
+
+
+def get_servicio_miniaturas() -> ServicioMiniaturas:
+    global _servicio_miniaturas
+    if _servicio_miniaturas is None:
+        _servicio_miniaturas = ServicioMiniaturas()
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(_servicio_miniaturas.cerrar)
+    return _servicio_miniaturas
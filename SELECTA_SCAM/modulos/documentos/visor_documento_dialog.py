@@ -8,6 +8,10 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtGui import QPixmap, QImage, QCursor, QGuiApplication, QPainter, QPen, QDesktopServices
 from PyQt5.QtCore import Qt, QTimer, QRect, QPoint, QSize, QEvent, QUrl
 import shutil
+from .visor_paginas import RenderizadorPaginas, get_cache_paginas, cuantizar_escala, clave_archivo
+from .miniaturas import get_servicio_miniaturas
+from .capa_texto import CargadorCapaTexto
+from ...config import settings
 try:
     import pytesseract
     from PIL import Image
@@ -30,6 +34,18 @@ class VisorDocumentoDialog(QDialog):
         self.documento_nombre = documento_nombre
         self.doc = None
         self.current_page_labels = []
+        # PDF: tamaño de cada página en puntos (page.rect) y escala a la que debe verse.
+        # Solo las páginas visibles (más VISOR_PAGINAS_PRECARGA) tienen pixmap; el resto es un marcador.
+        self.page_sizes = []
+        self.page_scales = []
+        self.rendered_scales = {}
+        self.renderizador = None
+        self.cache_paginas = get_cache_paginas()
+        self.file_key = None
+        self.original_pixmap = None  # Imágenes: se lee una vez y cada zoom escala desde aquí
+        # PDF: palabras con su caja por página (capa_texto.py), para resolver selecciones en memoria
+        self.capa_texto = None
+        self.cargador_capa = None
         self.zoom_factor = 1.0
         self.scroll_percentage_v = 0.0
         self.main_layout = QVBoxLayout(self)
@@ -60,6 +76,11 @@ class VisorDocumentoDialog(QDialog):
         self.pdf_image_scroll_area.setWidget(self.pdf_image_container)
         self.pdf_image_scroll_area.setWidgetResizable(True)
         self.stacked_viewer_layout.addWidget(self.pdf_image_scroll_area)
+        self.visible_pages_timer = QTimer(self)
+        self.visible_pages_timer.setSingleShot(True)
+        self.visible_pages_timer.setInterval(30)
+        self.visible_pages_timer.timeout.connect(self._render_visible_pages)
+        self.pdf_image_scroll_area.verticalScrollBar().valueChanged.connect(self._schedule_visible_render)
         self.text_viewer = QTextEdit(self)
         self.text_viewer.setReadOnly(True)
         self.text_viewer.setFontPointSize(10)
@@ -152,7 +173,18 @@ class VisorDocumentoDialog(QDialog):
         if self.doc is None or len(self.doc) == 0:
             self._show_error_message("El documento está vacío o no tiene páginas.")
             return
-        QTimer.singleShot(50, self._render_all_pages_pdf_or_image)
+        # Solo se leen las dimensiones: rasterizar es trabajo del renderizador, página a página.
+        self.page_sizes = []
+        for page in self.doc:
+            self.page_sizes.append((page.rect.width, page.rect.height))
+        self.file_key = clave_archivo(self.ruta_documento)
+        self.renderizador = RenderizadorPaginas(self.ruta_documento, self)
+        self.renderizador.pagina_renderizada.connect(self._on_page_rendered)
+        self.renderizador.pagina_fallida.connect(self._on_page_failed)
+        self.cargador_capa = CargadorCapaTexto(self.ruta_documento, self)
+        self.cargador_capa.capa_lista.connect(self._on_text_layer_ready)
+        self.cargador_capa.iniciar()
+        QTimer.singleShot(50, self._layout_pages_pdf_or_image)
         self.stacked_viewer_layout.setCurrentIndex(0)
     def _load_image(self):
         self.clear_pdf_image_viewer()
@@ -161,6 +193,7 @@ class VisorDocumentoDialog(QDialog):
         if pixmap.isNull():
             self._show_error_message(f"Error: No se pudo cargar la imagen:\n{self.ruta_documento}")
             return
+        self.original_pixmap = pixmap
         available_viewport_width = self.pdf_image_scroll_area.viewport().width() - 20
         if available_viewport_width <= 0:
             available_viewport_width = 800
@@ -204,7 +237,8 @@ class VisorDocumentoDialog(QDialog):
             if widget:
                 widget.deleteLater()
         self.current_page_labels = []
-    def _render_all_pages_pdf_or_image(self):
+        self.rendered_scales = {}
+    def _layout_pages_pdf_or_image(self):
         if self.stacked_viewer_layout.currentIndex() == 0:
             if self.pdf_image_scroll_area.verticalScrollBar().maximum() > 0:
                 current_scroll_value = self.pdf_image_scroll_area.verticalScrollBar().value()
@@ -214,8 +248,8 @@ class VisorDocumentoDialog(QDialog):
                 self.scroll_percentage_v = 0.0
         if not self.doc:
             if self.current_page_labels and len(self.current_page_labels) == 1:
-                original_pixmap = QPixmap(self.ruta_documento)
-                if not original_pixmap.isNull():
+                original_pixmap = self.original_pixmap
+                if original_pixmap is not None:
                     available_viewport_width = self.pdf_image_scroll_area.viewport().width() - 20
                     if available_viewport_width <= 0: available_viewport_width = 800
                     base_scale = available_viewport_width / original_pixmap.width()
@@ -230,37 +264,117 @@ class VisorDocumentoDialog(QDialog):
                     self.current_page_labels[0].setFixedSize(scaled_pixmap.size())
                 QTimer.singleShot(50, self._adjust_scroll_after_render)
             return
-        self.clear_pdf_image_viewer()
+        if self.renderizador:
+            self.renderizador.cancelar()
         available_viewport_width = self.pdf_image_scroll_area.viewport().width() - 20
         if available_viewport_width <= 0:
             available_viewport_width = 800
-        for page_num in range(len(self.doc)):
-            try:
-                page = self.doc.load_page(page_num)
-                original_page_width = int(page.rect.width)
-                if original_page_width > 0:
-                    base_scale_to_fit_width = available_viewport_width / original_page_width
-                else:
-                    base_scale_to_fit_width = 1.0
-                final_scale = base_scale_to_fit_width * self.zoom_factor
-                final_scale = max(0.01, final_scale)
-                mat = fitz.Matrix(final_scale, final_scale)
-                pix = page.get_pixmap(matrix=mat)
-                image = QImage(pix.samples, pix.width, pix.height, pix.stride,
-                               QImage.Format_RGBA8888 if pix.alpha else QImage.Format_RGB888)
-                label = QLabel()
-                q_pixmap = QPixmap.fromImage(image)
-                label.setPixmap(q_pixmap)
+        self.page_scales = []
+        for page_width, page_height in self.page_sizes:
+            base_scale_to_fit_width = available_viewport_width / page_width if page_width > 0 else 1.0
+            self.page_scales.append(cuantizar_escala(base_scale_to_fit_width * self.zoom_factor))
+        # Al cambiar el zoom se reutilizan los marcadores: solo cambian de tamaño.
+        if len(self.current_page_labels) != len(self.page_sizes):
+            self.clear_pdf_image_viewer()
+            for page_num in range(len(self.page_sizes)):
+                label = QLabel(f"Página {page_num + 1}")
                 label.setAlignment(Qt.AlignCenter)
-                label.setFixedSize(q_pixmap.size())
+                label.setStyleSheet("background-color: white; color: #999999;")
                 self.pdf_image_vbox.addWidget(label)
                 self.current_page_labels.append(label)
-            except Exception as render_err:
-                print(f"[ERROR] Fallo al renderizar página {page_num + 1}: {render_err}")
-                error_label = QLabel(f"[ERROR] Página {page_num + 1} no pudo cargarse.")
-                error_label.setAlignment(Qt.AlignCenter)
-                self.pdf_image_vbox.addWidget(error_label)
+        for page_num, label in enumerate(self.current_page_labels):
+            page_width, page_height = self.page_sizes[page_num]
+            scale = self.page_scales[page_num]
+            label.setFixedSize(max(1, int(page_width * scale)), max(1, int(page_height * scale)))
+            # Las páginas que se estaban viendo pasan enseguida a la versión en caché más cercana
+            # (reescalada); la resolución exacta llega después del renderizador.
+            if page_num in self.rendered_scales:
+                self._release_page(page_num)
+                self._show_cached_page(page_num)
         QTimer.singleShot(50, self._adjust_scroll_after_render)
+    def _schedule_visible_render(self, *args):
+        if self.doc and self.current_page_labels:
+            self.visible_pages_timer.start()
+    def _visible_page_range(self, margin=0):
+        """Primera y última página que tocan la parte visible, ampliadas con margin páginas a cada lado."""
+        self.pdf_image_vbox.activate()
+        top = self.pdf_image_scroll_area.verticalScrollBar().value()
+        bottom = top + self.pdf_image_scroll_area.viewport().height()
+        first = last = None
+        for page_num, label in enumerate(self.current_page_labels):
+            geometry = label.geometry()
+            if geometry.bottom() < top:
+                continue
+            if geometry.top() > bottom:
+                break
+            if first is None:
+                first = page_num
+            last = page_num
+        if first is None:
+            return None
+        return max(0, first - margin), min(len(self.current_page_labels) - 1, last + margin)
+    def _render_visible_pages(self):
+        """Pide al renderizador las páginas visibles que faltan y libera los pixmaps que quedaron lejos."""
+        if not self.doc or not self.renderizador or not self.current_page_labels:
+            return
+        visible = self._visible_page_range()
+        if visible is None:
+            return
+        first, last = self._visible_page_range(settings.VISOR_PAGINAS_PRECARGA)
+        for page_num in list(self.rendered_scales):
+            if page_num < first or page_num > last:
+                self._release_page(page_num)
+        # Primero las páginas realmente visibles, después las del margen.
+        pending = [
+            (page_num, self.page_scales[page_num]) for page_num in range(first, last + 1)
+            if self.rendered_scales.get(page_num) != self.page_scales[page_num]
+            and not self._show_cached_page(page_num)
+        ]
+        pending.sort(key=lambda job: not visible[0] <= job[0] <= visible[1])
+        self.renderizador.solicitar(pending)
+    def _show_cached_page(self, page_num):
+        """
+        Pone en la página la mejor versión que haya en caché: la exacta o, mientras tanto,
+        la resolución más cercana reescalada. Retorna True solo si era la exacta.
+        """
+        scale = self.page_scales[page_num]
+        cached = self.cache_paginas.buscar(self.file_key, page_num, scale)
+        if cached is None:
+            # Primera apertura: la portada se muestra desde la miniatura de la tabla, si ya está en memoria
+            thumbnail = get_servicio_miniaturas().en_memoria(self.ruta_documento) if page_num == 0 else None
+            if thumbnail is not None:
+                label = self.current_page_labels[page_num]
+                label.setPixmap(thumbnail.scaled(label.size(), Qt.IgnoreAspectRatio, Qt.SmoothTransformation))
+                self.rendered_scales[page_num] = 0.0
+            return False
+        cached_scale, pixmap = cached
+        label = self.current_page_labels[page_num]
+        if cached_scale != scale:
+            pixmap = pixmap.scaled(label.size(), Qt.IgnoreAspectRatio, Qt.FastTransformation)
+        label.setPixmap(pixmap)
+        self.rendered_scales[page_num] = cached_scale
+        return cached_scale == scale
+    def _on_page_rendered(self, page_num, scale, image):
+        pixmap = QPixmap.fromImage(image)
+        self.cache_paginas.guardar(self.file_key, page_num, scale, pixmap)
+        if page_num >= len(self.current_page_labels) or scale != self.page_scales[page_num]:
+            return  # Llegó tarde: el zoom cambió mientras se renderizaba
+        visible = self._visible_page_range(settings.VISOR_PAGINAS_PRECARGA)
+        if visible is None or not visible[0] <= page_num <= visible[1]:
+            return
+        label = self.current_page_labels[page_num]
+        label.setPixmap(pixmap)
+        self.rendered_scales[page_num] = scale
+    def _on_text_layer_ready(self, capa):
+        self.capa_texto = capa
+    def _on_page_failed(self, page_num, message):
+        if page_num < len(self.current_page_labels):
+            self.current_page_labels[page_num].setText(f"[ERROR] Página {page_num + 1} no pudo cargarse.")
+    def _release_page(self, page_num):
+        label = self.current_page_labels[page_num]
+        label.clear()
+        label.setText(f"Página {page_num + 1}")
+        self.rendered_scales.pop(page_num, None)
     def _adjust_scroll_after_render(self):
         if self.stacked_viewer_layout.currentIndex() == 0:
             v_scroll_bar = self.pdf_image_scroll_area.verticalScrollBar()
@@ -271,29 +385,30 @@ class VisorDocumentoDialog(QDialog):
                 v_scroll_bar.setValue(target_value)
             else:
                 v_scroll_bar.setValue(0)
+            self._schedule_visible_render()
     def update_zoom_label(self):
         self.zoom_label.setText(f"Zoom: {self.zoom_factor * 100:.0f}%")
     def zoom_in(self):
         if self.stacked_viewer_layout.currentIndex() == 0:
             if self.zoom_factor < self.MAX_ZOOM_FACTOR:
-                self.zoom_factor += self.ZOOM_STEP
+                self.zoom_factor = round(self.zoom_factor + self.ZOOM_STEP, 2)
                 if self.zoom_factor > self.MAX_ZOOM_FACTOR:
                     self.zoom_factor = self.MAX_ZOOM_FACTOR
                 self.update_zoom_label()
-                self._render_all_pages_pdf_or_image()
+                self._layout_pages_pdf_or_image()
     def zoom_out(self):
         if self.stacked_viewer_layout.currentIndex() == 0:
             if self.zoom_factor > self.MIN_ZOOM_FACTOR:
-                self.zoom_factor -= self.ZOOM_STEP
+                self.zoom_factor = round(self.zoom_factor - self.ZOOM_STEP, 2)
                 if self.zoom_factor < self.MIN_ZOOM_FACTOR:
                     self.zoom_factor = self.MIN_ZOOM_FACTOR
                 self.update_zoom_label()
-                self._render_all_pages_pdf_or_image()
+                self._layout_pages_pdf_or_image()
     def reset_zoom(self):
         if self.stacked_viewer_layout.currentIndex() == 0:
             self.zoom_factor = 1.0
             self.update_zoom_label()
-            self._render_all_pages_pdf_or_image()
+            self._layout_pages_pdf_or_image()
     def keyPressEvent(self, event):
         if self.stacked_viewer_layout.currentIndex() == 0 and event.modifiers() == Qt.ControlModifier:
             if event.key() == Qt.Key_Plus:
@@ -389,7 +504,7 @@ class VisorDocumentoDialog(QDialog):
         if not self.doc:
             if self.current_page_labels and len(self.current_page_labels)==1 and pytesseract:
                 image_label=self.current_page_labels[0]
-                pixmap_original_size=QPixmap(self.ruta_documento)
+                pixmap_original_size=self.original_pixmap
                 current_display_width=image_label.pixmap().width()
                 original_image_width=pixmap_original_size.width()
                 scale_factor=original_image_width/current_display_width if current_display_width>0 else 1.0
@@ -443,45 +558,22 @@ class VisorDocumentoDialog(QDialog):
                 width_in_page_pix=intersection_rect.width()
                 height_in_page_pix=intersection_rect.height()
                 pix_rect_in_page=QRect(x_in_page_pix,y_in_page_pix,width_in_page_pix,height_in_page_pix)
-                page=self.doc.load_page(i)
-                current_page_render_scale_x=label.pixmap().width()/page.rect.width if page.rect.width>0 else 1.0
-                current_page_render_scale_y=label.pixmap().height()/page.rect.height if page.rect.height>0 else 1.0
+                # Escala de la página (en puntos) al tamaño con que se ve; page_sizes ya tiene page.rect
+                page_width,page_height=self.page_sizes[i]
+                current_page_render_scale_x=label.width()/page_width if page_width>0 else 1.0
+                current_page_render_scale_y=label.height()/page_height if page_height>0 else 1.0
                 pdf_x0=pix_rect_in_page.x()/current_page_render_scale_x
                 pdf_y0=pix_rect_in_page.y()/current_page_render_scale_y
                 pdf_x1=(pix_rect_in_page.x()+pix_rect_in_page.width())/current_page_render_scale_x
                 pdf_y1=(pix_rect_in_page.y()+pix_rect_in_page.height())/current_page_render_scale_y
-                pdf_rect=fitz.Rect(pdf_x0,pdf_y0,pdf_x1,pdf_y1)
-                text_content=page.get_text("text",clip=pdf_rect)
+                if self.capa_texto is not None and self.capa_texto.tiene_pagina(i):
+                    # Búsqueda en memoria; las páginas escaneadas tienen aquí el OCR de la pasada previa
+                    text_content=self.capa_texto.texto_en(i,pdf_x0,pdf_y0,pdf_x1,pdf_y1)
+                else:
+                    # La capa aún se está cargando: solo el texto del PDF, sin OCR en el hilo de la interfaz
+                    text_content=self.doc.load_page(i).get_text("text",clip=fitz.Rect(pdf_x0,pdf_y0,pdf_x1,pdf_y1))
                 if text_content.strip():
                     extracted_text_parts.append(text_content.strip())
-                elif pytesseract:
-                    try:
-                        ocr_zoom_factor=3
-                        ocr_mat=fitz.Matrix(ocr_zoom_factor,ocr_zoom_factor)
-                        ocr_pix=page.get_pixmap(matrix=ocr_mat,clip=pdf_rect)
-                        image_data=ocr_pix.samples
-                        qimage_for_ocr=QImage(image_data,ocr_pix.width,ocr_pix.height,ocr_pix.stride,
-                                            QImage.Format_RGBA8888 if ocr_pix.alpha else QImage.Format_RGB888)
-                        byte_str=qimage_for_ocr.constBits().asstring(qimage_for_ocr.byteCount())
-                        if qimage_for_ocr.format()==QImage.Format_RGBA8888:
-                            mode='RGBA'
-                        elif qimage_for_ocr.format()==QImage.Format_RGB888:
-                            mode='RGB'
-                        elif qimage_for_ocr.format()==QImage.Format_ARGB32:
-                            mode='RGBA'
-                        else:
-                            print(f"Formato de QImage no soportado directamente por PIL para OCR: {qimage_for_ocr.format()}")
-                            continue
-                        pil_image_for_ocr=Image.frombytes(
-                            mode,
-                            (qimage_for_ocr.width(),qimage_for_ocr.height()),
-                            byte_str
-                        )
-                        ocr_result=pytesseract.image_to_string(pil_image_for_ocr,lang='spa')
-                        if ocr_result.strip():
-                            extracted_text_parts.append(f"{ocr_result.strip()}")
-                    except Exception as ocr_err:
-                        print(f"Error durante OCR en página {i+1}, región {pdf_rect}: {ocr_err}")
         return "\n".join(extracted_text_parts)
 
     def copy_selected_text_to_clipboard(self):
@@ -522,8 +614,10 @@ class VisorDocumentoDialog(QDialog):
         else: # Es PDF
             full_document_text=[]
             for i in range(len(self.doc)):
-                page=self.doc.load_page(i)
-                text_content=page.get_text("text")
+                if self.capa_texto is not None and self.capa_texto.tiene_pagina(i):
+                    text_content=self.capa_texto.texto_pagina(i)
+                else:
+                    text_content=self.doc.load_page(i).get_text("text")
                 if text_content.strip():
                     full_document_text.append(text_content.strip())
             combined_text="\n".join(full_document_text)
@@ -558,6 +652,11 @@ class VisorDocumentoDialog(QDialog):
                 QMessageBox.critical(self,"Error al Guardar",f"No se pudo guardar el documento:\n{e}")
     def closeEvent(self,event):
         """Se llama cuando el diálogo se está cerrando para limpiar recursos."""
+        self.visible_pages_timer.stop()
+        if self.cargador_capa:
+            self.cargador_capa.cancelar()
+        if self.renderizador:
+            self.renderizador.cerrar()
         if self.doc:
             try:
                 self.doc.close()
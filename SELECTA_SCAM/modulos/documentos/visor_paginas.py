@@ -0,0 +1,188 @@
+# SELECTA_SCAM/modulos/documentos/visor_paginas.py
+
+import logging
+import math
+import os
+import re
+from collections import OrderedDict
+
+import fitz
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QImage
+
+from ...config import settings
+
+logger = logging.getLogger(__name__)
+
+# Las escalas se redondean a este paso: los niveles de zoom ya visitados se sirven del caché.
+PASO_ESCALA = 0.05
+_RE_SHA256 = re.compile(r'[0-9a-f]{64}')
+
+
+def cuantizar_escala(escala: float) -> float:
+    """Escala redondeada al PASO_ESCALA más cercano (la página cambia de tamaño menos de un 3%)."""
+    return max(PASO_ESCALA, round(round(escala / PASO_ESCALA) * PASO_ESCALA, 4))
+
+
+def clave_archivo(ruta: str) -> str:
+    """
+    Identifica el contenido de un archivo sin leerlo: los objetos del almacén ya se llaman
+    por su SHA-256; para cualquier otro archivo se usa ruta + fecha de modificación + tamaño.
+    """
+    nombre = os.path.splitext(os.path.basename(ruta))[0]
+    if _RE_SHA256.fullmatch(nombre):
+        return nombre
+    estado = os.stat(ruta)
+    return f"{os.path.abspath(ruta)}|{estado.st_mtime_ns}|{estado.st_size}"
+
+
+class CachePaginas:
+    """
+    Páginas ya rasterizadas (QPixmap) por (archivo, página, escala), con LRU y un presupuesto
+    en bytes (VISOR_CACHE_PAGINAS_MB). Una página puede estar guardada a varias escalas:
+    buscar() devuelve la exacta o, si no está, la más cercana para mostrarla reescalada
+    mientras se renderiza la exacta. Solo se usa desde el hilo de la interfaz.
+    """
+
+    def __init__(self, presupuesto_bytes: int = None):
+        self.logger = logger
+        self.presupuesto_bytes = presupuesto_bytes or settings.VISOR_CACHE_PAGINAS_MB * 1024 * 1024
+        self._pixmaps = OrderedDict()  # (archivo, pagina, escala) -> QPixmap
+        self._escalas = {}             # (archivo, pagina) -> {escala, ...}
+        self.bytes_usados = 0
+
+    @staticmethod
+    def _bytes(pixmap) -> int:
+        return pixmap.width() * pixmap.height() * max(1, pixmap.depth() // 8)
+
+    def guardar(self, archivo: str, pagina: int, escala: float, pixmap):
+        clave = (archivo, pagina, escala)
+        anterior = self._pixmaps.pop(clave, None)
+        if anterior is not None:
+            self.bytes_usados -= self._bytes(anterior)
+        tamano = self._bytes(pixmap)
+        if tamano > self.presupuesto_bytes:
+            return  # Una página que no cabe ni sola no desplaza a todas las demás
+        self._pixmaps[clave] = pixmap
+        self._escalas.setdefault((archivo, pagina), set()).add(escala)
+        self.bytes_usados += tamano
+        while self.bytes_usados > self.presupuesto_bytes:
+            self._expulsar(*self._pixmaps.popitem(last=False))
+
+    def _expulsar(self, clave, pixmap):
+        archivo, pagina, escala = clave
+        self.bytes_usados -= self._bytes(pixmap)
+        escalas = self._escalas.get((archivo, pagina))
+        if escalas is not None:
+            escalas.discard(escala)
+            if not escalas:
+                del self._escalas[(archivo, pagina)]
+
+    def buscar(self, archivo: str, pagina: int, escala: float):
+        """(escala_guardada, QPixmap) exacta o la resolución más cercana; None si la página no está."""
+        escalas = self._escalas.get((archivo, pagina))
+        if not escalas:
+            return None
+        # La más cercana en proporción; a igual distancia, la de más resolución (se ve más nítida al reducir)
+        elegida = min(escalas, key=lambda e: (abs(math.log(e / escala)), e < escala))
+        clave = (archivo, pagina, elegida)
+        self._pixmaps.move_to_end(clave)
+        return elegida, self._pixmaps[clave]
+
+
+# Caché compartido por todos los visores: reabrir un documento reutiliza sus páginas.
+_cache_paginas = None
+
+
+def get_cache_paginas() -> CachePaginas:
+    global _cache_paginas
+    if _cache_paginas is None:
+        _cache_paginas = CachePaginas()
+    return _cache_paginas
+
+
+def renderizar_pagina(doc, numero: int, escala: float) -> QImage:
+    """Rasteriza una página a la escala indicada. La QImage es una copia: no depende del pixmap de fitz."""
+    page = doc.load_page(numero)
+    pix = page.get_pixmap(matrix=fitz.Matrix(escala, escala))
+    formato = QImage.Format_RGBA8888 if pix.alpha else QImage.Format_RGB888
+    return QImage(pix.samples, pix.width, pix.height, pix.stride, formato).copy()
+
+
+class _SenalesRender(QObject):
+    # Se crea en el hilo de la interfaz: las emisiones desde el worker llegan encoladas.
+    pagina_lista = pyqtSignal(int, float, object)    # pagina, escala, QImage
+    pagina_fallida = pyqtSignal(int, str)            # pagina, mensaje
+
+
+class _RenderRunnable(QRunnable):
+    def __init__(self, renderizador, generacion: int, trabajos: list[tuple[int, float]]):
+        super().__init__()
+        self.renderizador = renderizador
+        self.generacion = generacion
+        self.trabajos = trabajos
+
+    def run(self):
+        senales = self.renderizador._senales
+        for pagina, escala in self.trabajos:
+            # Si el usuario ya se movió a otra zona, lo que queda de esta petición sobra.
+            if self.generacion != self.renderizador._generacion:
+                return
+            try:
+                imagen = renderizar_pagina(self.renderizador._documento(), pagina, escala)
+            except Exception as e:
+                logger.warning(f"No se pudo renderizar la página {pagina + 1} de '{self.renderizador.ruta}': {e}")
+                senales.pagina_fallida.emit(pagina, str(e))
+            else:
+                senales.pagina_lista.emit(pagina, escala, imagen)
+
+
+class RenderizadorPaginas(QObject):
+    """
+    Rasteriza páginas de un PDF en un hilo propio. El visor pide solo las páginas visibles
+    (más un margen); cada petición reemplaza a la anterior, de modo que al desplazarse rápido
+    no se renderizan páginas por las que ya se pasó.
+
+    El hilo abre su propia copia del documento: el fitz.Document del visor no se comparte.
+    """
+    pagina_renderizada = pyqtSignal(int, float, object)  # pagina, escala, QImage
+    pagina_fallida = pyqtSignal(int, str)
+
+    def __init__(self, ruta: str, parent=None):
+        super().__init__(parent)
+        self.logger = logger
+        self.ruta = ruta
+        self._doc = None
+        self._generacion = 0
+        # Un solo hilo: las páginas salen en el orden pedido y el documento no se usa en paralelo.
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._senales = _SenalesRender()
+        self._senales.pagina_lista.connect(self.pagina_renderizada)
+        self._senales.pagina_fallida.connect(self.pagina_fallida)
+
+    def _documento(self):
+        # Solo se llama desde el hilo del pool.
+        if self._doc is None:
+            self._doc = fitz.open(self.ruta)
+        return self._doc
+
+    def solicitar(self, trabajos: list[tuple[int, float]]):
+        """Renderiza [(pagina, escala), ...] en ese orden, descartando lo pendiente de peticiones anteriores."""
+        self._generacion += 1
+        if trabajos:
+            self.pool.start(_RenderRunnable(self, self._generacion, list(trabajos)))
+
+    def cancelar(self):
+        self._generacion += 1
+
+    def cerrar(self):
+        """Cancela lo pendiente, espera a la página en curso y cierra la copia del documento."""
+        self.cancelar()
+        self.pool.waitForDone()
+        if self._doc is not None:
+            try:
+                self._doc.close()
+            except Exception as e:
+                self.logger.warning(f"Error al cerrar el documento del renderizador: {e}")
+            self._doc = None
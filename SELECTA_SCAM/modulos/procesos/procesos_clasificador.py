@@ -0,0 +1,188 @@
+# SELECTA_SCAM/modulos/procesos/procesos_clasificador.py
+
+import logging
+import re
+import threading
+import time
+import unicodedata
+
+from sqlalchemy import func
+
+from ...config import settings
+from ...db.models import Proceso, Cliente
+from ...utils.db_manager import get_db_session
+
+logger = logging.getLogger(__name__)
+
+_SEP = r'[-\s.]?'
+_NOMBRE = r'[A-ZÁÉÍÓÚÑ][a-záéíóúñ]+ [A-ZÁÉÍÓÚÑ][a-záéíóúñ]+'
+
+# Un solo patrón con todas las referencias: el texto se recorre una vez.
+# El radicado de 23 dígitos (ciudad 5, entidad 2, especialidad 2, despacho 3, año 4,
+# consecutivo 5, recurso 2) suele venir con guiones, puntos o espacios entre las partes.
+_RADICADO_23 = rf'\d{{5}}{_SEP}\d{{2}}{_SEP}\d{{2}}{_SEP}\d{{3}}{_SEP}\d{{4}}{_SEP}\d{{5}}{_SEP}\d{{2}}'
+_PATRON_REFERENCIAS = re.compile(
+    rf'(?<![\d-])(?P<radicado23>{_RADICADO_23})(?![\d-])'
+    r'|\b(?P<radicado20>\d{20})\b'
+    rf'|(?:Nombre|Parte): (?P<nombre>{_NOMBRE})'
+)
+_NO_DIGITOS = re.compile(r'\D')
+_ESPACIOS = re.compile(r'\s+')
+
+
+def normalizar_radicado(radicado: str) -> str:
+    """Solo los dígitos: '11001-31-03-001-2020-00123-00' y '11001310300120200012300' son el mismo."""
+    return _NO_DIGITOS.sub('', radicado or '')
+
+
+def normalizar_nombre(nombre: str) -> str:
+    """Minúsculas, sin tildes y con un solo espacio entre palabras."""
+    descompuesto = unicodedata.normalize('NFKD', (nombre or '').casefold())
+    sin_tildes = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return _ESPACIOS.sub(' ', sin_tildes).strip()
+
+
+def buscar_referencias(*textos: str) -> tuple[list[str], list[str]]:
+    """
+    Radicados (normalizados) y nombres de parte que aparecen en los textos, en orden de
+    aparición y sin repetir. Cada texto se recorre una sola vez.
+    """
+    radicados = {}
+    nombres = {}
+    for texto in textos:
+        for coincidencia in _PATRON_REFERENCIAS.finditer(texto or ''):
+            if coincidencia.group('nombre'):
+                nombres.setdefault(coincidencia.group('nombre'), None)
+            else:
+                radicado = coincidencia.group('radicado23') or coincidencia.group('radicado20')
+                radicados.setdefault(normalizar_radicado(radicado), None)
+    return list(radicados), list(nombres)
+
+
+class IndiceProcesos:
+    """
+    Radicado -> proceso y nombre de cliente -> proceso, en memoria.
+
+    refrescar() consulta la base de datos como mucho cada WATCHER_INDICE_REFRESCO_S segundos
+    y solo para comparar COUNT y MAX(id) de procesos y clientes: si ambos crecieron lo mismo
+    solo hay filas nuevas y se cargan esas; si no (algo se borró), se recarga todo. Las
+    ediciones (un radicado corregido) entran con la recarga completa, cada
+    WATCHER_INDICE_RECARGA_S segundos. Las consultas no tocan la base de datos.
+    """
+
+    def __init__(self):
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._radicados = {}          # radicado normalizado -> proceso_id
+        self._clientes = {}           # nombre normalizado -> cliente_id
+        self._proceso_cliente = {}    # cliente_id -> proceso_id (el más antiguo)
+        self._firma = None            # (procesos: count, max_id), (clientes: count, max_id)
+        self._ultima_revision = None
+        self._ultima_recarga = None
+
+    # --- Carga desde la base de datos ---
+
+    @staticmethod
+    def _firma_actual(session):
+        procesos = session.query(func.count(Proceso.id), func.max(Proceso.id)).one()
+        clientes = session.query(func.count(Cliente.id), func.max(Cliente.id)).one()
+        return (tuple(procesos), tuple(clientes))
+
+    @staticmethod
+    def _cargar(session, radicados: dict, clientes_por_nombre: dict, proceso_cliente: dict,
+                desde_proceso: int = 0, desde_cliente: int = 0):
+        """Agrega a los diccionarios los procesos y clientes con id mayor que los indicados."""
+        procesos = session.query(Proceso.id, Proceso.radicado, Proceso.cliente_id).filter(
+            Proceso.id > desde_proceso, Proceso.eliminado.isnot(True)
+        ).order_by(Proceso.id)
+        for proceso_id, radicado, cliente_id in procesos:
+            radicados.setdefault(normalizar_radicado(radicado), proceso_id)
+            proceso_cliente.setdefault(cliente_id, proceso_id)
+        clientes = session.query(Cliente.id, Cliente.nombre).filter(
+            Cliente.id > desde_cliente, Cliente.eliminado.isnot(True)
+        )
+        for cliente_id, nombre in clientes:
+            clientes_por_nombre.setdefault(normalizar_nombre(nombre), cliente_id)
+
+    def refrescar(self, forzar: bool = False):
+        ahora = time.monotonic()
+        with self._lock:
+            if (not forzar and self._ultima_revision is not None
+                    and ahora - self._ultima_revision < settings.WATCHER_INDICE_REFRESCO_S):
+                return
+            self._ultima_revision = ahora
+            session = get_db_session()
+            try:
+                firma = self._firma_actual(session)
+                vigente = (self._ultima_recarga is not None
+                           and ahora - self._ultima_recarga < settings.WATCHER_INDICE_RECARGA_S)
+                if firma == self._firma and vigente and not forzar:
+                    return
+                anterior = self._firma
+                solo_nuevas = (
+                    vigente and not forzar
+                    and all(
+                        (actual[1] or 0) - (previa[1] or 0) == actual[0] - previa[0] >= 0
+                        for actual, previa in zip(firma, anterior)
+                    )
+                )
+                # Se llenan copias y luego se reemplazan: los trabajadores nunca ven un índice a medias
+                if solo_nuevas:
+                    radicados, clientes, proceso_cliente = (
+                        dict(self._radicados), dict(self._clientes), dict(self._proceso_cliente)
+                    )
+                    self._cargar(session, radicados, clientes, proceso_cliente,
+                                 anterior[0][1] or 0, anterior[1][1] or 0)
+                else:
+                    radicados, clientes, proceso_cliente = {}, {}, {}
+                    self._cargar(session, radicados, clientes, proceso_cliente)
+                    self._ultima_recarga = ahora
+                self._radicados, self._clientes, self._proceso_cliente = radicados, clientes, proceso_cliente
+                if solo_nuevas:
+                    self.logger.debug(f"Índice de procesos: filas nuevas cargadas ({firma}).")
+                else:
+                    self.logger.info(f"Índice de procesos cargado: {len(self._radicados)} radicados, "
+                                     f"{len(self._clientes)} clientes.")
+                self._firma = firma
+            finally:
+                session.close()
+
+    # --- Consultas (sin base de datos) ---
+
+    def proceso_por_radicado(self, radicado: str) -> int | None:
+        return self._radicados.get(normalizar_radicado(radicado))
+
+    def proceso_por_nombre(self, nombre: str) -> int | None:
+        """Como el LIKE '%nombre%' de antes: nombre exacto o, si no, contenido en el del cliente."""
+        clave = normalizar_nombre(nombre)
+        if not clave:
+            return None
+        cliente_id = self._clientes.get(clave)
+        if cliente_id is None:
+            cliente_id = next((c for n, c in self._clientes.items() if clave in n), None)
+        return self._proceso_cliente.get(cliente_id) if cliente_id is not None else None
+
+    def resolver(self, radicados: list[str], nombres: list[str]) -> int | None:
+        """Primer radicado conocido o, si ninguno lo es, primer nombre de cliente conocido."""
+        for radicado in radicados:
+            proceso_id = self.proceso_por_radicado(radicado)
+            if proceso_id is not None:
+                return proceso_id
+        for nombre in nombres:
+            proceso_id = self.proceso_por_nombre(nombre)
+            if proceso_id is not None:
+                return proceso_id
+        return None
+
+
+# Índice único del proceso: lo comparten todos los trabajadores del vigilante.
+_indice_procesos = None
+_indice_lock = threading.Lock()
+
+
+def get_indice_procesos() -> IndiceProcesos:
+    global _indice_procesos
+    with _indice_lock:
+        if _indice_procesos is None:
+            _indice_procesos = IndiceProcesos()
+        return _indice_procesos
@@ -10,6 +10,7 @@ from sqlalchemy import or_
 # --- INICIO DE CORRECCIONES ---
 # Importaciones del nuevo sistema unificado
 from ...db.models import Proceso, Cliente
+from ...db import busqueda
 from ...utils.db_manager import get_db_session
 # --- FIN DE CORRECCIONES ---
 
@@ -41,6 +42,31 @@ class ProcesosDB:
         with self.get_session() as session:
             return session.query(Proceso).filter(Proceso.eliminado == False).order_by(Proceso.fecha_inicio.desc()).all()
 
+    def get_procesos_filtrados(self, estado: str | None = None, cliente_id: int | None = None,
+                               radicado: str | None = None, incluir_eliminados: bool = False) -> list[tuple]:
+        """
+        Listado de procesos con todos los filtros resueltos en una sola consulta
+        (usa ix_procesos_eliminado_estado_cliente).
+        Retorna tuplas (id, radicado, tipo, nombre_cliente, fecha_inicio, fecha_fin,
+        estado, juzgado, observaciones, cliente_id).
+        """
+        with self.get_session() as session:
+            consulta = session.query(
+                Proceso.id, Proceso.radicado, Proceso.tipo, Cliente.nombre,
+                Proceso.fecha_inicio, Proceso.fecha_fin, Proceso.estado,
+                Proceso.juzgado, Proceso.observaciones, Proceso.cliente_id
+            ).outerjoin(Cliente, Cliente.id == Proceso.cliente_id)
+            if not incluir_eliminados:
+                consulta = consulta.filter(Proceso.eliminado == False)
+            if estado:
+                consulta = consulta.filter(Proceso.estado == estado)
+            if cliente_id is not None:
+                consulta = consulta.filter(Proceso.cliente_id == cliente_id)
+            if radicado:
+                # autoescape: '%' y '_' escritos por el usuario se buscan literalmente
+                consulta = consulta.filter(Proceso.radicado.icontains(radicado, autoescape=True))
+            return [tuple(fila) for fila in consulta.order_by(Proceso.fecha_inicio.desc(), Proceso.id.desc())]
+
     def get_proceso_by_id(self, proceso_id: int) -> Proceso | None:
         """Obtiene un proceso por su ID."""
         with self.get_session() as session:
@@ -103,19 +129,38 @@ class ProcesosDB:
                 return True
             return False
 
-    def buscar_procesos(self, query: str) -> list[Proceso]:
-        """Busca procesos por diferentes criterios."""
+    def buscar_procesos(self, query: str, include_deleted: bool = False) -> list[Proceso]:
+        """
+        Busca procesos por radicado, tipo, estado, juzgado, nombre del cliente o ID.
+        Usa el índice FTS5 (ordenado por relevancia) y recurre a LIKE si no está instalado.
+        """
         if not query:
             return self.get_all_procesos()
 
         with self.get_session() as session:
-            search_pattern = f"%{query}%"
             try:
                 query_id = int(query)
             except ValueError:
                 query_id = -1
 
-            return session.query(Proceso).join(Cliente).filter(
+            hits = None
+            if busqueda.fts_disponible(session, 'procesos'):
+                hits = busqueda.subconsulta_ranking('procesos', query)
+            if hits is not None:
+                condicion = or_(hits.c.id.isnot(None), Proceso.id == query_id)
+                if busqueda.es_termino_numerico(query):
+                    # FTS5 solo busca prefijos: el LIKE recupera radicados que contienen el número
+                    condicion = or_(condicion, Proceso.radicado.ilike(f"%{query.strip()}%"))
+                consulta = session.query(Proceso).outerjoin(hits, hits.c.id == Proceso.id).filter(condicion)
+                if not include_deleted:
+                    consulta = consulta.filter(Proceso.eliminado == False)
+                return consulta.order_by(hits.c.rank.is_(None), hits.c.rank, Proceso.id).all()
+
+            search_pattern = f"%{query}%"
+            consulta = session.query(Proceso).join(Cliente)
+            if not include_deleted:
+                consulta = consulta.filter(Proceso.eliminado == False)
+            return consulta.filter(
                 or_(
                     Proceso.radicado.ilike(search_pattern),
                     Proceso.tipo.ilike(search_pattern),
@@ -272,6 +272,10 @@ class ProcesosModel(QAbstractTableModel):
         """Obtiene un proceso por su ID a través de ProcesosDB."""
         return self.procesos_db.get_proceso_by_id(proceso_id)
 
+    def get_procesos_filtrados(self, estado: str = None, cliente_id: int = None, radicado: str = None) -> list[tuple]:
+        """Listado filtrado en la base de datos a través de ProcesosDB (tuplas livianas, ver get_procesos_filtrados)."""
+        return self.procesos_db.get_procesos_filtrados(estado=estado, cliente_id=cliente_id, radicado=radicado)
+
     # --- Métodos de apoyo para acceder a datos relacionados (Documentos, Contabilidad, etc.) ---
 
     # Diccionario de tipos de actuación (como atributo de clase)
@@ -409,6 +413,13 @@ class ProcesosModel(QAbstractTableModel):
             })
         return movimientos_formateados
 
+    def obtener_saldo_proceso(self, proceso_id: int) -> dict:
+        """
+        Totales de ingresos, gastos y saldo del proceso, leídos de la tabla saldos
+        (no recorre los movimientos).
+        """
+        return self.contabilidad_db.get_resumen(proceso_id=proceso_id)
+
     def insertar_movimiento_contable(self, cliente_id: int, proceso_id: int = None, tipo: str = None, descripcion: str = None, valor: float = None, fecha: str = None) -> int | None:
         """
         Inserta un nuevo movimiento contable asociado a un proceso.
@@ -618,25 +618,19 @@ class ProcesosView(QWidget):
     def load_contabilidad_for_proceso(self, proceso_id: int):
         self.cont_list_widget.clear()
         movimientos = self.model.obtener_movimientos_contables_por_proceso(proceso_id)
-        total_ingresos = 0
-        total_egresos = 0
 
         for mov in movimientos:
             item_text = f"{mov['fecha']} - {mov['tipo']}: {mov['descripcion']} - ${mov['valor']:,.2f}"
             item = QListWidgetItem(item_text)
             item.setData(Qt.UserRole, mov['id']) # Guardar ID del movimiento
-
-            if mov['tipo'] == "Ingreso":
-                total_ingresos += mov['valor']
-            elif mov['tipo'] == "Egreso":
-                total_egresos += mov['valor']
             self.cont_list_widget.addItem(item)
 
-        # Mostrar resumen de totales
+        # Mostrar resumen de totales (tabla saldos: no se suman los movimientos aquí)
+        resumen = self.model.obtener_saldo_proceso(proceso_id)
         self.cont_list_widget.addItem(f"\n--- Resumen Contable ---")
-        self.cont_list_widget.addItem(f"Total Ingresos: ${total_ingresos:,.2f}")
-        self.cont_list_widget.addItem(f"Total Egresos: ${total_egresos:,.2f}")
-        self.cont_list_widget.addItem(f"Balance Neto: ${total_ingresos - total_egresos:,.2f}")
+        self.cont_list_widget.addItem(f"Total Ingresos: ${resumen['total_ingresos']:,.2f}")
+        self.cont_list_widget.addItem(f"Total Egresos: ${resumen['total_gastos']:,.2f}")
+        self.cont_list_widget.addItem(f"Balance Neto: ${resumen['saldo']:,.2f}")
 
 
     def clear_contabilidad_form(self):
@@ -1,128 +1,532 @@
 # procesos_watcher.py
+#
+# Vigilante de la carpeta de Descargas: cada PDF nuevo se clasifica (radicado o nombre del
+# cliente) y se mueve a la carpeta de su proceso. Se ejecuta sin interfaz:
+#
+#     python -m SELECTA_SCAM.modulos.procesos.procesos_watcher [--carpeta RUTA] [--hilos N] [--una-vez]
 
+import argparse
+import logging
 import os
-import re
-import time
+import queue
 import shutil
-import pytesseract
-import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from sqlalchemy.exc import IntegrityError
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
-from pdf2image import convert_from_path
 from PyPDF2 import PdfReader
+from SELECTA_SCAM.config import settings
+from SELECTA_SCAM.db.models import TrabajoDescarga
+from SELECTA_SCAM.modulos.procesos.procesos_clasificador import buscar_referencias, get_indice_procesos
+from SELECTA_SCAM.utils.db_manager import get_db_session
+from SELECTA_SCAM.utils.ocr import ocr_texto, ocr_paginas, ocr_disponible, cerrar_pool_ocr
+
+logger = logging.getLogger(__name__)
 
 # Configuración
 CARPETA_DESCARGAS = os.path.expanduser("~/Downloads")
-RUTA_DB = os.path.join(os.path.dirname(__file__), "data", "base_datos.db")
 DESTINO_DOCUMENTOS = "documentos"  # Carpeta base para mover archivos
-pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+
+ESTADO_PENDIENTE = 'pendiente'
+ESTADO_MOVIENDO = 'moviendo'
+ESTADO_MOVIDO = 'movido'
+ESTADO_SIN_PROCESO = 'sin_proceso'
+ESTADO_FALLIDO = 'fallido'
+ESTADOS_TERMINADOS = {ESTADO_MOVIDO, ESTADO_SIN_PROCESO, ESTADO_FALLIDO}
 
 
-def extraer_texto_pdf_ocr(ruta_pdf):
-    texto_total = ""
+def extraer_texto_pdf_ocr(ruta_pdf, paginas=None):
+    """Texto por OCR de las páginas indicadas (todas si es None), en el pool de utils/ocr.py."""
     try:
-        imagenes = convert_from_path(ruta_pdf)
-        for img in imagenes:
-            texto = pytesseract.image_to_string(img, lang='spa')
-            texto_total += texto + "\n"
+        if paginas is None:
+            return ocr_texto(ruta_pdf)
+        resultados = ocr_paginas(ruta_pdf, paginas)
+        return "\n".join(resultados[n] for n in sorted(resultados))
     except Exception as e:
-        print(f"[ERROR] OCR: {e}")
-    return texto_total
+        logger.error(f"OCR: {e}")
+        return ""
 
 
-def extraer_texto_pdf(ruta_pdf):
+def textos_paginas_pdf(ruta_pdf, max_paginas=None):
+    """Texto de la capa de texto página por página; se detiene tras max_paginas (None = todas)."""
     try:
         reader = PdfReader(ruta_pdf)
-        texto = ""
-        for page in reader.pages:
-            texto += page.extract_text() or ""
-        return texto
+        total = len(reader.pages)
+        for numero in range(total if max_paginas is None else min(max_paginas, total)):
+            yield reader.pages[numero].extract_text() or ""
     except Exception as e:
-        print(f"[ERROR] Extracción directa: {e}")
-        return ""
+        logger.error(f"Extracción directa: {e}")
 
 
-def extraer_info(archivo, texto):
-    patrones_radicado = [r'\b\d{20}\b', r'\b\d{23}\b']
-    patrones_nombre = [r'Nombre: ([A-ZÁÉÍÓÚÑ][a-záéíóúñ]+ [A-ZÁÉÍÓÚÑ][a-záéíóúñ]+)',
-                       r'Parte: ([A-ZÁÉÍÓÚÑ][a-záéíóúñ]+ [A-ZÁÉÍÓÚÑ][a-záéíóúñ]+)']
+def extraer_texto_pdf(ruta_pdf, max_paginas=None):
+    return "\n".join(textos_paginas_pdf(ruta_pdf, max_paginas))
 
-    radicado = next((re.search(p, texto) or re.search(p, archivo)) for p in patrones_radicado if re.search(p, texto) or re.search(p, archivo))
-    nombre = next((re.search(p, texto) for p in patrones_nombre if re.search(p, texto)), None)
 
+def extraer_info(archivo, texto):
+    """Primer radicado y primer nombre de parte del texto (o, el radicado, del nombre del archivo)."""
+    radicados, nombres = buscar_referencias(texto, os.path.basename(archivo))
     return (
-        radicado.group(0) if radicado else None,
-        nombre.group(1) if nombre else None
+        radicados[0] if radicados else None,
+        nombres[0] if nombres else None
     )
 
 
+def _textos_por_etapas(archivo):
+    """
+    Textos a revisar, de lo más barato a lo más caro: la capa de texto de las primeras
+    WATCHER_PAGINAS_CLASIFICACION páginas, una por una, y después el OCR de las que no
+    tenían texto (primero la página 1, que casi siempre trae el radicado, y luego las demás).
+    """
+    paginas_sin_texto = []
+    for numero, texto in enumerate(textos_paginas_pdf(archivo, settings.WATCHER_PAGINAS_CLASIFICACION)):
+        if texto.strip():
+            yield texto
+        else:
+            paginas_sin_texto.append(numero)
+    if not paginas_sin_texto or not ocr_disponible():
+        return
+    logger.info(f"Páginas escaneadas, se intenta OCR de {len(paginas_sin_texto)}: {archivo}")
+    yield extraer_texto_pdf_ocr(archivo, paginas_sin_texto[:1])
+    if len(paginas_sin_texto) > 1:
+        yield extraer_texto_pdf_ocr(archivo, paginas_sin_texto[1:])
+
+
+def clasificar_archivo(archivo, indice=None):
+    """
+    Busca el proceso del archivo por radicado o por nombre del cliente en el índice en memoria.
+    Se leen solo las primeras páginas y se para en cuanto un radicado identifica el proceso;
+    el texto completo queda para la indexación en segundo plano.
+    Retorna (carpeta_destino o None, radicado, nombre).
+    """
+    indice = indice or get_indice_procesos()
+    indice.refrescar()  # Como mucho una consulta liviana cada WATCHER_INDICE_REFRESCO_S
+
+    radicados, nombres = buscar_referencias(os.path.basename(archivo))
+    proceso_id = indice.resolver(radicados, [])
+    if proceso_id is None:
+        for texto in _textos_por_etapas(archivo):
+            nuevos_radicados, nuevos_nombres = buscar_referencias(texto)
+            radicados += [r for r in nuevos_radicados if r not in radicados]
+            nombres += [n for n in nuevos_nombres if n not in nombres]
+            proceso_id = indice.resolver(nuevos_radicados, [])
+            if proceso_id is not None:
+                break
+        else:
+            proceso_id = indice.resolver([], nombres)
+    logger.info(f"Extraído: radicados={radicados}, clientes={nombres}")
+
+    # El radicado que se anota en el trabajo es el que identificó el proceso, si alguno lo hizo
+    radicado = next((r for r in radicados if indice.proceso_por_radicado(r) is not None),
+                    radicados[0] if radicados else None)
+    nombre = nombres[0] if nombres else None
+    if proceso_id is None:
+        return None, radicado, nombre
+    return os.path.join(DESTINO_DOCUMENTOS, f"proceso_{proceso_id}"), radicado, nombre
+
+
+def indexar_documento_completo(ruta_pdf):
+    """
+    Trabajo de baja prioridad tras mover un archivo: solo calienta el caché de OCR. Los archivos
+    del vigilante no tienen fila en la base de datos, así que aquí no se indexa nada; si el PDF
+    es escaneado se hace el OCR completo y el resultado queda en el caché de utils/ocr.py (por
+    contenido), de modo que indexarlo después en la aplicación no lo repite. Un PDF con capa
+    de texto no necesita nada: basta con encontrar la primera página con texto.
+    """
+    if not ocr_disponible() or any(texto.strip() for texto in textos_paginas_pdf(ruta_pdf)):
+        return
+    extraer_texto_pdf_ocr(ruta_pdf)
+
+
 def buscar_carpeta_proceso(archivo):
-    texto = extraer_texto_pdf(archivo)
-    if not texto.strip():
-        print("[INFO] PDF vacío o escaneado. Intentando OCR...")
-        texto = extraer_texto_pdf_ocr(archivo)
+    return clasificar_archivo(archivo)[0]
 
-    radicado, nombre = extraer_info(archivo, texto)
-    print(f"[INFO] Extraído: radicado={radicado}, cliente={nombre}")
 
-    try:
-        conn = sqlite3.connect(RUTA_DB)
-        cursor = conn.cursor()
-
-        if radicado:
-            cursor.execute("SELECT id FROM procesos WHERE radicado = ?", (radicado,))
-            result = cursor.fetchone()
-            if result:
-                return os.path.join(DESTINO_DOCUMENTOS, f"proceso_{result[0]}")
-
-        if nombre:
-            cursor.execute("""SELECT p.id FROM procesos p
-                              JOIN clientes c ON p.cliente_id = c.id
-                              WHERE c.nombre LIKE ?""", (f"%{nombre}%",))
-            result = cursor.fetchone()
-            if result:
-                return os.path.join(DESTINO_DOCUMENTOS, f"proceso_{result[0]}")
+class TrabajosDescargasDB:
+    """Acceso al diario trabajos_descargas."""
 
-    except Exception as e:
-        print(f"[ERROR] Consulta en DB: {e}")
-    finally:
-        conn.close()
+    def __init__(self):
+        self.logger = logger
 
-    return None
+    @contextmanager
+    def get_session(self):
+        """Usa la sesión global del db_manager para garantizar una única conexión."""
+        session = get_db_session()
+        try:
+            yield session
+            session.commit()
+        except Exception as e:
+            self.logger.error("Error en transacción de TrabajosDescargasDB, haciendo rollback: %s", e, exc_info=True)
+            session.rollback()
+            raise
+        finally:
+            session.close()
 
+    def registrar(self, ruta: str, tamano: int, mtime_ns: int) -> tuple[int, str, str | None]:
+        """Trabajo del archivo (lo crea si es nuevo). Retorna (id, estado, destino)."""
+        for _ in range(2):
+            try:
+                with self.get_session() as session:
+                    trabajo = session.query(TrabajoDescarga).filter(
+                        TrabajoDescarga.ruta_origen == ruta,
+                        TrabajoDescarga.tamano == tamano,
+                        TrabajoDescarga.mtime_ns == mtime_ns,
+                    ).first()
+                    if trabajo is None:
+                        trabajo = TrabajoDescarga(ruta_origen=ruta, tamano=tamano, mtime_ns=mtime_ns,
+                                                  estado=ESTADO_PENDIENTE)
+                        session.add(trabajo)
+                        session.flush()
+                    return trabajo.id, trabajo.estado, trabajo.destino
+            except IntegrityError:
+                continue  # Otro hilo lo registró a la vez: la segunda vuelta lo encuentra
+        raise RuntimeError(f"No se pudo registrar el trabajo de '{ruta}'")
 
-class DescargasWatcher(FileSystemEventHandler):
-    def on_created(self, event):
-        if event.is_directory or not event.src_path.lower().endswith(".pdf"):
+    def marcar(self, trabajo_id: int, estado: str, destino: str | None = None,
+               radicado: str | None = None, error: str | None = None):
+        valores = {TrabajoDescarga.estado: estado, TrabajoDescarga.ultimo_error: error}
+        if destino is not None:
+            valores[TrabajoDescarga.destino] = destino
+        if radicado is not None:
+            valores[TrabajoDescarga.radicado] = radicado
+        with self.get_session() as session:
+            session.query(TrabajoDescarga).filter(TrabajoDescarga.id == trabajo_id).update(
+                valores, synchronize_session=False
+            )
+
+    def sumar_intento(self, trabajo_id: int, error: str) -> int:
+        """Registra un intento fallido y retorna el número de intentos acumulados."""
+        with self.get_session() as session:
+            trabajo = session.query(TrabajoDescarga).get(trabajo_id)
+            if trabajo is None:
+                return 0
+            trabajo.intentos = (trabajo.intentos or 0) + 1
+            trabajo.ultimo_error = error
+            return trabajo.intentos
+
+    def get_interrumpidos(self) -> list[tuple[int, str, str]]:
+        """(id, ruta_origen, destino) de los movimientos que quedaron a medias."""
+        with self.get_session() as session:
+            return [tuple(fila) for fila in session.query(
+                TrabajoDescarga.id, TrabajoDescarga.ruta_origen, TrabajoDescarga.destino
+            ).filter(TrabajoDescarga.estado == ESTADO_MOVIENDO)]
+
+
+def destino_libre(carpeta: str, nombre: str) -> str:
+    """Ruta dentro de carpeta que no pisa un archivo existente: 'x.pdf', 'x (1).pdf', ..."""
+    base, extension = os.path.splitext(nombre)
+    destino = os.path.join(carpeta, nombre)
+    n = 1
+    while os.path.exists(destino):
+        destino = os.path.join(carpeta, f"{base} ({n}){extension}")
+        n += 1
+    return destino
+
+
+def mover_idempotente(origen: str, destino: str) -> bool:
+    """
+    Mueve origen a destino; repetirlo después de un corte no falla ni duplica el archivo.
+    Retorna False si el origen ya no existe y tampoco está en el destino.
+    """
+    if not os.path.exists(origen):
+        return os.path.exists(destino)  # Ya se había movido
+    os.makedirs(os.path.dirname(destino) or '.', exist_ok=True)
+    shutil.move(origen, destino)
+    return True
+
+
+def es_pdf(ruta: str) -> bool:
+    return ruta.lower().endswith(".pdf")
+
+
+class VigilanteDescargas:
+    """
+    Servicio del vigilante. Los eventos del sistema de archivos solo anotan la ruta; un hilo
+    comprueba que el tamaño y la fecha de modificación dejen de cambiar (la descarga terminó)
+    y la pasa a una cola acotada (WATCHER_COLA_MAX) que atienden WATCHER_HILOS trabajadores.
+    El OCR completo de los escaneados movidos (solo calienta el caché de OCR) va a otra cola,
+    que un solo hilo atiende cuando no hay nada por clasificar.
+    Cada archivo queda registrado en trabajos_descargas: el mismo archivo no se procesa dos
+    veces y un movimiento interrumpido se completa al reiniciar (reanudar).
+    Si clasificar o mover falla, el archivo vuelve a la espera con un retardo que se duplica
+    en cada intento, hasta WATCHER_REINTENTOS intentos.
+    """
+
+    def __init__(self, carpeta: str | None = None, hilos: int | None = None, trabajos_db=None):
+        self.logger = logger
+        self.carpeta = carpeta or CARPETA_DESCARGAS
+        self.hilos = hilos or settings.WATCHER_HILOS
+        self.trabajos_db = trabajos_db or TrabajosDescargasDB()
+        self.cola = queue.Queue(maxsize=settings.WATCHER_COLA_MAX)
+        self.cola_indexacion = queue.Queue(maxsize=settings.WATCHER_COLA_MAX)
+        self._candidatos = {}  # ruta -> (tamano, mtime_ns, instante del último cambio o del reintento)
+        self._lock = threading.Lock()
+        self._detener = threading.Event()
+        self._hilos = []
+        self._observer = None
+
+    # --- Detección y espera a que la descarga termine ---
+
+    def detectado(self, ruta: str):
+        """Anota (o vuelve a anotar) un archivo; se encola cuando deje de cambiar."""
+        if not es_pdf(ruta):
             return
+        with self._lock:
+            self._candidatos[ruta] = (None, None, time.monotonic())
 
-        archivo = event.src_path
-        print(f"[INFO] Archivo detectado: {archivo}")
-        time.sleep(2)  # Espera a que termine de descargarse
+    def _reintentar(self, ruta: str, intentos: int):
+        """Vuelve a anotar un archivo que falló; se revisa tras una espera que crece con los intentos."""
+        espera = settings.WATCHER_REINTENTO_ESPERA_S * 2 ** max(intentos - 1, 0)
+        self.logger.info(f"'{ruta}' se reintentará en {espera:.0f} s.")
+        with self._lock:
+            self._candidatos[ruta] = (None, None, time.monotonic() + espera)
 
-        destino = buscar_carpeta_proceso(archivo)
-        if destino:
-            os.makedirs(destino, exist_ok=True)
-            shutil.move(archivo, os.path.join(destino, os.path.basename(archivo)))
-            print(f"[✅] Archivo movido a: {destino}")
-        else:
-            print("[⚠️] No se identificó proceso para este archivo.")
+    def _revisar_candidatos(self) -> list[str]:
+        """Retorna los candidatos estables y los quita de la lista de espera."""
+        ahora = time.monotonic()
+        listos = []
+        with self._lock:
+            for ruta, (tamano, mtime_ns, desde) in list(self._candidatos.items()):
+                if desde > ahora:
+                    continue  # Reintento programado: aún no toca
+                try:
+                    estado = os.stat(ruta)
+                except FileNotFoundError:
+                    del self._candidatos[ruta]  # Temporal del navegador que ya se renombró o se borró
+                    continue
+                if (estado.st_size, estado.st_mtime_ns) != (tamano, mtime_ns):
+                    self._candidatos[ruta] = (estado.st_size, estado.st_mtime_ns, ahora)
+                elif ahora - desde >= settings.WATCHER_ESTABILIDAD_S:
+                    del self._candidatos[ruta]
+                    if estado.st_size == 0:
+                        # Descarga fallida o que no empezó: si después se escribe, watchdog lo vuelve a anotar
+                        self.logger.warning(f"'{ruta}' sigue vacío, se ignora.")
+                        continue
+                    listos.append(ruta)
+        return listos
+
+    def _vigilar_estabilidad(self):
+        while not self._detener.wait(settings.WATCHER_SONDEO_S):
+            for ruta in self._revisar_candidatos():
+                # Con la cola llena se espera aquí: la detección se frena, los eventos no se pierden
+                while not self._detener.is_set():
+                    try:
+                        self.cola.put(ruta, timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+
+    # --- Procesamiento ---
+
+    def _trabajador(self):
+        while not self._detener.is_set():
+            try:
+                ruta = self.cola.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                self.procesar(ruta)
+            except Exception as e:
+                self.logger.error(f"Error inesperado procesando '{ruta}': {e}", exc_info=True)
+            finally:
+                self.cola.task_done()
+
+    def _indexador(self):
+        while not self._detener.is_set():
+            try:
+                ruta = self.cola_indexacion.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                # Baja prioridad: cede mientras haya archivos por clasificar
+                while self._hay_por_clasificar() and not self._detener.is_set():
+                    time.sleep(settings.WATCHER_SONDEO_S)
+                if not self._detener.is_set() and os.path.exists(ruta):
+                    indexar_documento_completo(ruta)
+            except Exception as e:
+                self.logger.warning(f"No se pudo indexar '{ruta}' en segundo plano: {e}")
+            finally:
+                self.cola_indexacion.task_done()
+
+    def _hay_por_clasificar(self) -> bool:
+        with self._lock:
+            return bool(self._candidatos) or self.cola.unfinished_tasks > 0
+
+    def _encolar_indexacion(self, ruta: str):
+        if not settings.WATCHER_INDEXAR_COMPLETO:
+            return
+        try:
+            self.cola_indexacion.put_nowait(ruta)
+        except queue.Full:
+            self.logger.debug(f"Cola de indexación llena, '{ruta}' se indexará al agregarlo a la aplicación.")
+
+    def procesar(self, ruta: str) -> str | None:
+        """Clasifica y mueve un archivo ya completo. Retorna el estado final del trabajo."""
+        try:
+            estado_archivo = os.stat(ruta)
+        except FileNotFoundError:
+            return None
+        trabajo_id, estado, destino = self.trabajos_db.registrar(
+            ruta, estado_archivo.st_size, estado_archivo.st_mtime_ns
+        )
+        if estado in ESTADOS_TERMINADOS:
+            self.logger.debug(f"'{ruta}' ya se había procesado ({estado}).")
+            return estado
+        if estado == ESTADO_MOVIENDO:
+            return self._completar_movimiento(trabajo_id, ruta, destino)
+
+        try:
+            carpeta, radicado, _nombre = clasificar_archivo(ruta)
+        except Exception as e:
+            intentos = self.trabajos_db.sumar_intento(trabajo_id, str(e))
+            self.logger.warning(f"No se pudo clasificar '{ruta}' (intento {intentos}): {e}")
+            if intentos >= settings.WATCHER_REINTENTOS:
+                self.trabajos_db.marcar(trabajo_id, ESTADO_FALLIDO, error=str(e))
+                return ESTADO_FALLIDO
+            self._reintentar(ruta, intentos)
+            return ESTADO_PENDIENTE
+
+        if not carpeta:
+            self.trabajos_db.marcar(trabajo_id, ESTADO_SIN_PROCESO, radicado=radicado)
+            self.logger.warning(f"No se identificó proceso para '{ruta}'.")
+            return ESTADO_SIN_PROCESO
+
+        # El destino se fija en el diario antes de mover: si el movimiento se corta, se retoma igual
+        destino = destino_libre(carpeta, os.path.basename(ruta))
+        self.trabajos_db.marcar(trabajo_id, ESTADO_MOVIENDO, destino=destino, radicado=radicado)
+        return self._completar_movimiento(trabajo_id, ruta, destino)
+
+    def _completar_movimiento(self, trabajo_id: int, ruta: str, destino: str) -> str:
+        try:
+            movido = mover_idempotente(ruta, destino)
+        except OSError as e:
+            intentos = self.trabajos_db.sumar_intento(trabajo_id, str(e))
+            self.logger.warning(f"No se pudo mover '{ruta}' a '{destino}' (intento {intentos}): {e}")
+            if intentos >= settings.WATCHER_REINTENTOS:
+                self.trabajos_db.marcar(trabajo_id, ESTADO_FALLIDO, error=str(e))
+                return ESTADO_FALLIDO
+            # El trabajo sigue 'moviendo' con su destino: al reintentar, procesar lo completa
+            self._reintentar(ruta, intentos)
+            return ESTADO_MOVIENDO
+        if not movido:
+            self.trabajos_db.marcar(trabajo_id, ESTADO_FALLIDO, error="El archivo desapareció antes de moverse")
+            return ESTADO_FALLIDO
+        self.trabajos_db.marcar(trabajo_id, ESTADO_MOVIDO)
+        self.logger.info(f"Archivo movido a: {destino}")
+        self._encolar_indexacion(destino)
+        return ESTADO_MOVIDO
+
+    # --- Ciclo de vida ---
 
+    def reanudar(self):
+        """Completa los movimientos interrumpidos y anota los PDF que ya estaban en la carpeta."""
+        for trabajo_id, ruta, destino in self.trabajos_db.get_interrumpidos():
+            self._completar_movimiento(trabajo_id, ruta, destino)
+        try:
+            nombres = os.listdir(self.carpeta)
+        except FileNotFoundError:
+            self.logger.error(f"No existe la carpeta a vigilar: {self.carpeta}")
+            return
+        for nombre in nombres:
+            ruta = os.path.join(self.carpeta, nombre)
+            if os.path.isfile(ruta):
+                self.detectado(ruta)
+
+    def iniciar(self, observar: bool = True):
+        self._detener.clear()
+        self.reanudar()
+        self._hilos = [threading.Thread(target=self._vigilar_estabilidad, name="watcher-estabilidad", daemon=True)]
+        self._hilos += [
+            threading.Thread(target=self._trabajador, name=f"watcher-trabajador-{i}", daemon=True)
+            for i in range(self.hilos)
+        ]
+        self._hilos.append(threading.Thread(target=self._indexador, name="watcher-indexador", daemon=True))
+        for hilo in self._hilos:
+            hilo.start()
+        if observar:
+            self._observer = Observer()
+            self._observer.schedule(DescargasWatcher(self), path=self.carpeta, recursive=False)
+            self._observer.start()
+            self.logger.info(f"Observando: {self.carpeta}")
+
+    def esperar_vacia(self, indexacion: bool = True):
+        """Bloquea hasta que no queden archivos en espera ni en las colas."""
+        while True:
+            with self._lock:
+                hay_candidatos = bool(self._candidatos)
+            if not hay_candidatos:
+                self.cola.join()
+                if indexacion:
+                    self.cola_indexacion.join()
+                with self._lock:
+                    if not self._candidatos and self.cola.unfinished_tasks == 0:
+                        return
+            time.sleep(settings.WATCHER_SONDEO_S)
+
+    def detener(self):
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        self._detener.set()
+        for hilo in self._hilos:
+            hilo.join()
+        self._hilos = []
+        cerrar_pool_ocr()
 
-def iniciar_watcher():
-    observer = Observer()
-    event_handler = DescargasWatcher()
-    observer.schedule(event_handler, path=CARPETA_DESCARGAS, recursive=False)
-    observer.start()
-    print(f"[👁️] Observando: {CARPETA_DESCARGAS}")
 
+class DescargasWatcher(FileSystemEventHandler):
+    """Traduce los eventos de watchdog en avisos al vigilante; no hace trabajo en este hilo."""
+
+    def __init__(self, vigilante: VigilanteDescargas):
+        super().__init__()
+        self.vigilante = vigilante
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.vigilante.detectado(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.vigilante.detectado(event.src_path)
+
+    def on_moved(self, event):
+        # Los navegadores descargan a un temporal (.crdownload, .part) y al final lo renombran
+        if not event.is_directory:
+            self.vigilante.detectado(event.dest_path)
+
+
+def iniciar_watcher(carpeta: str | None = None, hilos: int | None = None):
+    vigilante = VigilanteDescargas(carpeta, hilos)
+    vigilante.iniciar()
     try:
         while True:
             time.sleep(1)
     except KeyboardInterrupt:
-        observer.stop()
-    observer.join()
+        pass
+    finally:
+        vigilante.detener()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Clasifica y mueve los PDF que llegan a la carpeta de Descargas.")
+    parser.add_argument("--carpeta", default=CARPETA_DESCARGAS, help="Carpeta a vigilar")
+    parser.add_argument("--hilos", type=int, default=settings.WATCHER_HILOS, help="Trabajadores de clasificación")
+    parser.add_argument("--una-vez", action="store_true",
+                        help="Procesa los PDF que ya están en la carpeta y termina")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(threadName)s - %(levelname)s - %(message)s')
+
+    if args.una_vez:
+        vigilante = VigilanteDescargas(args.carpeta, args.hilos)
+        vigilante.iniciar(observar=False)
+        vigilante.esperar_vacia()
+        vigilante.detener()
+    else:
+        iniciar_watcher(args.carpeta, args.hilos)
 
 
 if __name__ == "__main__":
-    iniciar_watcher()
+    main()
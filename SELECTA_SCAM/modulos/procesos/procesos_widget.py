@@ -16,50 +16,31 @@ from SELECTA_SCAM.modulos.clientes.clientes_db import ClientesDB
 
 class ProcesosTableModel(QAbstractTableModel):
     error_occurred = pyqtSignal(str)
+    # Mismo orden que las tuplas de ProcesosDB.get_procesos_filtrados
+    COL_ID = 0
+    COL_RADICADO = 1
     def __init__(self, procesos_model_instance, parent=None):
         super().__init__(parent)
         self.procesos_model = procesos_model_instance
         self.headers = [
-            'ID', 'Clase Proceso', 'Descripción', 'Estado',
-            'Fecha Inicio', 'Fecha Fin', 'Radicado', 'Cliente',
-            'ID Cliente', 'Tipo', 'Juzgado', 'Observaciones', 'Activo'
+            'ID', 'Radicado', 'Tipo', 'Cliente', 'Fecha Inicio', 'Fecha Fin',
+            'Estado', 'Juzgado', 'Observaciones', 'ID Cliente'
         ]
         self._data = []
         self.load_data()
     def load_data(self, query=None, filtro_estado=None, filtro_cliente_id=None):
-        raw_data = self.procesos_model.get_all_procesos()
-        filtered_data = []
-        for item in raw_data:
-            match = True
-            if filtro_estado and filtro_estado != "Todos":
-                if item.get('estado') != filtro_estado:
-                    match = False
-            if filtro_cliente_id is not None:
-                if item.get('cliente_id') != filtro_cliente_id:
-                    match = False
-            if query:
-                radicado_item = item.get('radicado', '').lower()
-                if query.lower() not in radicado_item:
-                    match = False
-            if match:
-                row = [
-                    item.get('id'),
-                    item.get('nombre'),
-                    item.get('descripcion'),
-                    item.get('estado'),
-                    item.get('fecha_inicio'),
-                    item.get('fecha_fin'),
-                    item.get('radicado'),
-                    item.get('nombre_cliente'),
-                    item.get('cliente_id'),
-                    item.get('tipo'),
-                    item.get('juzgado'),
-                    item.get('observaciones'),
-                    item.get('activo')
-                ]
-                filtered_data.append(row)
-        self._data = filtered_data
-        self.layoutChanged.emit()
+        """Todos los filtros se resuelven en la base de datos; aquí solo se reemplazan las filas."""
+        estado = filtro_estado if filtro_estado and filtro_estado != "Todos" else None
+        try:
+            filas = self.procesos_model.get_procesos_filtrados(
+                estado=estado, cliente_id=filtro_cliente_id, radicado=(query or "").strip() or None
+            )
+        except Exception as e:
+            self.error_occurred.emit(f"Error al cargar los procesos: {e}")
+            filas = []
+        self.beginResetModel()
+        self._data = filas
+        self.endResetModel()
     def rowCount(self, parent=None):
         return len(self._data)
     def columnCount(self, parent=None):
@@ -70,7 +51,8 @@ class ProcesosTableModel(QAbstractTableModel):
         if role == Qt.DisplayRole:
             if 0 <= index.row() < len(self._data) and \
                0 <= index.column() < len(self.headers):
-                return str(self._data[index.row()][index.column()])
+                valor = self._data[index.row()][index.column()]
+                return "" if valor is None else str(valor)
         return None
     def headerData(self, section, orientation, role=Qt.DisplayRole):
         if role == Qt.DisplayRole and orientation == Qt.Horizontal:
@@ -79,11 +61,11 @@ class ProcesosTableModel(QAbstractTableModel):
         return None
     def get_proceso_id(self, row):
         if 0 <= row < len(self._data):
-            return self._data[row][0]
+            return self._data[row][self.COL_ID]
         return None
     def get_proceso_radicado(self, row):
         if 0 <= row < len(self._data):
-            return self._data[row][6]
+            return self._data[row][self.COL_RADICADO]
         return None
 
 class ProcesosWidget(QWidget):
@@ -92,12 +74,10 @@ class ProcesosWidget(QWidget):
         self.procesos_model_db = procesos_model_instance
         self.clientes_db = clientes_db_instance
         self.user_data = user_data
-        self.procesos_table_model = self.procesos_model_db
+        self.procesos_model_db.error_occurred.connect(self.handle_model_error)
+        # La tabla usa su propio modelo liviano: filas en tuplas filtradas por la base de datos
+        self.procesos_table_model = ProcesosTableModel(self.procesos_model_db, self)
         self.procesos_table_model.error_occurred.connect(self.handle_model_error)
-        self.procesos_table_model.HEADERS = [
-            'ID', 'Radicado', 'Tipo', 'Cliente', 'Fecha Inicio', 'Fecha Fin',
-            'Estado', 'Juzgado', 'Observaciones', 'Fecha Creación', 'Eliminado'
-        ]
         self.selected_proceso_id = None
         self.init_ui()
         self.load_data()
@@ -374,7 +354,8 @@ class ProcesosWidget(QWidget):
             filtro_cliente_id=filtro_cliente_id
         )
     def load_data(self):
-        self.procesos_table_model.load_data()
+        # Recarga respetando los filtros visibles
+        self.filtrar_tabla()
     def _actualizar_seleccion_proceso_desde_tabla(self):
         selected_indexes = self.table_view.selectionModel().selectedRows()
         if not selected_indexes:
@@ -0,0 +1,101 @@
+# SELECTA_SCAM/utils/archivos.py
+import hashlib
+import os
+import re
+import shutil
+import threading
+
+from ..config import settings
+
+_RE_SHA256 = re.compile(r'[0-9a-f]{64}')
+
+
+def calcular_sha256(ruta: str) -> str:
+    """SHA-256 (hex) del contenido del archivo, leído por bloques."""
+    digest = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(settings.ARCHIVOS_TAMANO_BLOQUE), b''):
+            digest.update(bloque)
+    return digest.hexdigest()
+
+
+def sha256_contenido(ruta: str) -> str:
+    """SHA-256 del archivo; los objetos del almacén ya lo llevan en el nombre y no se leen."""
+    nombre = os.path.splitext(os.path.basename(ruta))[0]
+    if _RE_SHA256.fullmatch(nombre):
+        return nombre
+    return calcular_sha256(ruta)
+
+
+def copiar_por_bloques(origen: str, destino: str, progreso=None) -> str:
+    """
+    Copia origen en destino por bloques grandes y calcula el SHA-256 en la misma pasada
+    (una sola lectura del archivo). Hace fsync antes de cerrar para que el contenido esté
+    en disco antes de cualquier renombrado. progreso(copiados, total) es opcional.
+    Retorna el SHA-256 en hexadecimal.
+    """
+    total = os.path.getsize(origen)
+    copiados = 0
+    digest = hashlib.sha256()
+    buffer = bytearray(settings.ARCHIVOS_TAMANO_BLOQUE)
+    vista = memoryview(buffer)
+    with open(origen, 'rb') as entrada, open(destino, 'wb') as salida:
+        while True:
+            leidos = entrada.readinto(buffer)
+            if not leidos:
+                break
+            bloque = vista[:leidos]
+            digest.update(bloque)
+            salida.write(bloque)
+            copiados += leidos
+            if progreso:
+                progreso(copiados, total)
+        salida.flush()
+        os.fsync(salida.fileno())
+    shutil.copystat(origen, destino)  # Conserva fechas y permisos, como shutil.copy2
+    return digest.hexdigest()
+
+
+def _fsync_directorio(directorio: str):
+    # En POSIX el renombrado solo es durable tras sincronizar el directorio; Windows no lo permite.
+    if os.name == 'nt':
+        return
+    fd = os.open(directorio, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def reemplazar_atomico(temporal: str, destino: str):
+    """Mueve temporal a destino con un renombrado atómico: destino nunca queda a medio escribir."""
+    os.replace(temporal, destino)
+    _fsync_directorio(os.path.dirname(os.path.abspath(destino)))
+
+
+def ruta_temporal(destino: str) -> str:
+    """Temporal junto a destino, propio de cada hilo para que dos copias al mismo archivo no se pisen."""
+    return f"{destino}.{os.getpid()}-{threading.get_ident()}.parcial"
+
+
+def eliminar_si_existe(ruta: str):
+    try:
+        os.remove(ruta)
+    except FileNotFoundError:
+        pass
+
+
+def copiar_con_hash(origen: str, destino: str, progreso=None) -> str:
+    """
+    Copia origen en destino (temporal + fsync + renombrado atómico) y retorna el SHA-256
+    del contenido, calculado durante la copia.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(destino)), exist_ok=True)
+    temporal = ruta_temporal(destino)
+    try:
+        sha256 = copiar_por_bloques(origen, temporal, progreso)
+        reemplazar_atomico(temporal, destino)
+    except BaseException:
+        eliminar_si_existe(temporal)
+        raise
+    return sha256
@@ -0,0 +1,52 @@
+# SELECTA_SCAM/utils/busqueda_incremental.py
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BusquedaIncremental:
+    """
+    Recuerda el último resultado de una búsqueda para refinarlo en memoria.
+
+    Si el usuario sigue escribiendo (el término nuevo extiende al anterior) y el resto de
+    filtros no cambió, el resultado nuevo es un subconjunto del anterior: basta con filtrar
+    las filas ya obtenidas. Solo se vuelve a la base de datos cuando el término se amplía
+    (se borra texto), cambia otro filtro o el caché se invalida tras una escritura.
+
+    filtrar(filas, termino) debe aplicar exactamente la misma condición que la consulta SQL.
+    """
+
+    def __init__(self, filtrar):
+        self.filtrar = filtrar
+        self.invalidar()
+
+    def invalidar(self):
+        """Olvida el último resultado (llamar después de insertar, editar o borrar)."""
+        self._filtros = None
+        self._termino = None
+        self._filas = None
+
+    def recordar(self, filtros: dict, termino: str | None, filas: list):
+        """Guarda el resultado obtenido de la base de datos para estos filtros y término."""
+        self._filtros = dict(filtros)
+        self._termino = termino or ""
+        self._filas = list(filas)
+
+    def refinar(self, filtros: dict, termino: str | None) -> list | None:
+        """
+        Devuelve las filas para el término nuevo filtrando el último resultado,
+        o None si hay que consultar la base de datos.
+        """
+        termino = termino or ""
+        if self._filas is None or self._filtros != filtros:
+            return None
+        anterior = self._termino.lower()
+        # Solo un término estrictamente más largo garantiza un subconjunto; el mismo término
+        # vuelve a la base de datos para reflejar cambios hechos desde otro lado.
+        if len(termino) <= len(anterior) or not termino.lower().startswith(anterior):
+            return None
+        filas = self.filtrar(self._filas, termino)
+        logger.debug(f"Búsqueda '{termino}' refinada en memoria: {len(self._filas)} -> {len(filas)} filas.")
+        self._termino = termino
+        self._filas = filas
+        return list(filas)
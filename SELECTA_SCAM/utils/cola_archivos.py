@@ -0,0 +1,326 @@
+# SELECTA_SCAM/utils/cola_archivos.py
+import errno
+import logging
+from contextlib import contextmanager
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from .archivos import copiar_con_hash, eliminar_si_existe
+from .db_manager import get_db_session
+from ..db.models import OperacionArchivo
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+OPERACION_COPIAR = 'copiar'
+OPERACION_ELIMINAR = 'eliminar'
+ESTADO_PENDIENTE = 'pendiente'
+ESTADO_HECHA = 'hecha'
+ESTADO_FALLIDA = 'fallida'
+
+# Errores de Windows cuando otro proceso (p. ej. el cliente de sincronización) tiene el archivo abierto
+_WINERROR_BLOQUEO = {32, 33}  # ERROR_SHARING_VIOLATION, ERROR_LOCK_VIOLATION
+_ERRNO_BLOQUEO = {errno.EACCES, errno.EBUSY, errno.EAGAIN, errno.EPERM}
+
+
+def registrar_operacion(session, tipo: str, origen: str, destino: str | None = None,
+                        documento_id: int | None = None) -> OperacionArchivo:
+    """
+    Añade una operación al diario dentro de la transacción del llamador, para que el
+    registro del documento y su operación de archivo se confirmen (o se pierdan) juntos.
+    La operación se ejecuta después del commit con ColaArchivos.encolar.
+    """
+    operacion = OperacionArchivo(tipo=tipo, origen=origen, destino=destino, documento_id=documento_id,
+                                 estado=ESTADO_PENDIENTE, intentos=0)
+    session.add(operacion)
+    session.flush()
+    return operacion
+
+
+def _copiar(origen, destino, documento_id=None, progreso=None):
+    copiar_con_hash(origen, destino, progreso)
+    return destino
+
+
+def _eliminar(origen, destino=None, documento_id=None, progreso=None):
+    eliminar_si_existe(origen)
+    return origen
+
+
+# Tipo de operación -> función(origen, destino, documento_id, progreso) que la realiza y retorna
+# la ruta resultante. Los módulos pueden añadir tipos propios con registrar_tipo_operacion.
+_EJECUTORES = {OPERACION_COPIAR: _copiar, OPERACION_ELIMINAR: _eliminar}
+
+
+def registrar_tipo_operacion(tipo: str, funcion):
+    """
+    Registra un tipo de operación adicional. Debe registrarse antes de get_cola_archivos() para
+    que las operaciones pendientes de ese tipo puedan retomarse al iniciar.
+    """
+    _EJECUTORES[tipo] = funcion
+
+
+def ejecutar_operacion(tipo: str, origen: str, destino: str | None = None,
+                       documento_id: int | None = None, progreso=None) -> str:
+    """
+    Realiza la operación en disco y retorna la ruta resultante. Es idempotente: repetirla
+    después de un cierre inesperado deja el mismo resultado. Las copias escriben un temporal,
+    hacen fsync y lo renombran: el destino nunca queda a medio escribir.
+    """
+    funcion = _EJECUTORES.get(tipo)
+    if funcion is None:
+        raise ValueError(f"Tipo de operación de archivo desconocido: {tipo}")
+    return funcion(origen, destino, documento_id, progreso)
+
+
+def es_reintentable(error: Exception) -> bool:
+    """True si el error parece un bloqueo temporal del archivo y conviene reintentar."""
+    if isinstance(error, (FileNotFoundError, IsADirectoryError, NotADirectoryError, ValueError)):
+        return False
+    if isinstance(error, PermissionError):
+        return True
+    if isinstance(error, OSError):
+        return getattr(error, 'winerror', None) in _WINERROR_BLOQUEO or error.errno in _ERRNO_BLOQUEO
+    return False
+
+
+class ColaArchivosDB:
+    """Acceso al diario operaciones_archivo."""
+
+    def __init__(self):
+        self.logger = logger
+
+    @contextmanager
+    def get_session(self):
+        """Usa la sesión global del db_manager para garantizar una única conexión."""
+        session = get_db_session()
+        try:
+            yield session
+            session.commit()
+        except Exception as e:
+            self.logger.error("Error en transacción de ColaArchivosDB, haciendo rollback: %s", e, exc_info=True)
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def registrar(self, tipo: str, origen: str, destino: str | None = None, documento_id: int | None = None) -> int:
+        """Registra una operación en su propia transacción y retorna su ID."""
+        with self.get_session() as session:
+            return registrar_operacion(session, tipo, origen, destino, documento_id).id
+
+    def get_operacion(self, op_id: int) -> tuple | None:
+        """Retorna (tipo, origen, destino, documento_id, estado) o None si no existe."""
+        with self.get_session() as session:
+            fila = session.query(
+                OperacionArchivo.tipo, OperacionArchivo.origen, OperacionArchivo.destino,
+                OperacionArchivo.documento_id, OperacionArchivo.estado
+            ).filter(OperacionArchivo.id == op_id).first()
+            return tuple(fila) if fila else None
+
+    def get_pendientes(self) -> list[int]:
+        """IDs de las operaciones que quedaron sin terminar, en orden de registro."""
+        with self.get_session() as session:
+            return [op_id for (op_id,) in session.query(OperacionArchivo.id).filter(
+                OperacionArchivo.estado == ESTADO_PENDIENTE
+            ).order_by(OperacionArchivo.id)]
+
+    def limpiar_hechas(self) -> int:
+        """Borra del diario las operaciones terminadas; las fallidas se conservan para revisión."""
+        with self.get_session() as session:
+            return session.query(OperacionArchivo).filter(
+                OperacionArchivo.estado == ESTADO_HECHA
+            ).delete(synchronize_session=False)
+
+    def marcar(self, op_id: int, estado: str, error: str | None = None):
+        with self.get_session() as session:
+            session.query(OperacionArchivo).filter(OperacionArchivo.id == op_id).update(
+                {OperacionArchivo.estado: estado, OperacionArchivo.ultimo_error: error},
+                synchronize_session=False
+            )
+
+    def sumar_intento(self, op_id: int, error: str) -> int:
+        """Registra un intento fallido y retorna el número de intentos acumulados."""
+        with self.get_session() as session:
+            operacion = session.query(OperacionArchivo).get(op_id)
+            if operacion is None:
+                return 0
+            operacion.intentos = (operacion.intentos or 0) + 1
+            operacion.ultimo_error = error
+            return operacion.intentos
+
+
+def ejecutar_operaciones_ahora(op_ids: list[int], cola_db: ColaArchivosDB | None = None) -> int:
+    """
+    Ejecuta en el hilo actual operaciones ya registradas en el diario (para usos sin interfaz).
+    Las que fallan quedan 'pendiente' para el próximo ColaArchivos.reanudar. Retorna las realizadas.
+    """
+    cola_db = cola_db or ColaArchivosDB()
+    hechas = 0
+    for op_id in op_ids:
+        datos = cola_db.get_operacion(op_id)
+        if datos is None or datos[4] != ESTADO_PENDIENTE:
+            continue
+        tipo, origen, destino, documento_id, _estado = datos
+        try:
+            ejecutar_operacion(tipo, origen, destino, documento_id)
+        except Exception as e:
+            logger.warning(f"Operación de archivo {op_id} ({tipo} '{origen}') falló: {e}")
+            cola_db.sumar_intento(op_id, str(e))
+            continue
+        cola_db.marcar(op_id, ESTADO_HECHA)
+        hechas += 1
+    return hechas
+
+
+class _SenalesArchivo(QObject):
+    # Creado en el hilo de la interfaz: las emisiones desde los workers llegan encoladas.
+    terminada = pyqtSignal(int, str, object, object)        # op_id, tipo, documento_id, destino
+    avance = pyqtSignal(int, object, object)                # op_id, bytes copiados, total
+    fallida = pyqtSignal(int, str, object, int, object)     # op_id, tipo, documento_id, intentos, error
+
+
+class _OperacionRunnable(QRunnable):
+    def __init__(self, cola, op_id: int):
+        super().__init__()
+        self.cola = cola
+        self.op_id = op_id
+
+    def run(self):
+        tipo, documento_id = '', None
+        try:
+            datos = self.cola.db.get_operacion(self.op_id)
+            if datos is None or datos[4] != ESTADO_PENDIENTE:
+                # Ya hecha (o descartada) en una ejecución anterior
+                self.cola._senales.terminada.emit(self.op_id, tipo, documento_id, None)
+                return
+            tipo, origen, destino, documento_id, _estado = datos
+            avance = self.cola._senales.avance
+            ruta = ejecutar_operacion(tipo, origen, destino, documento_id,
+                                      progreso=lambda copiados, total: avance.emit(self.op_id, copiados, total))
+            self.cola.db.marcar(self.op_id, ESTADO_HECHA)
+            self.cola._senales.terminada.emit(self.op_id, tipo, documento_id, ruta)
+        except Exception as e:
+            try:
+                intentos = self.cola.db.sumar_intento(self.op_id, str(e))
+            except Exception:
+                intentos = settings.ARCHIVOS_REINTENTOS
+            self.cola._senales.fallida.emit(self.op_id, tipo, documento_id, intentos, e)
+
+
+class ColaArchivos(QObject):
+    """
+    Cola persistente de copias y borrados de archivos, ejecutada por un pool de hilos propio
+    para no bloquear la interfaz con archivos grandes o carpetas sincronizadas lentas.
+
+    Cada operación se registra en la tabla operaciones_archivo antes de ejecutarse; si la
+    aplicación se cierra a mitad de camino, reanudar() la retoma al iniciar. Si el archivo
+    está bloqueado se reintenta con espera exponencial; al agotar los reintentos la
+    operación queda 'fallida' y se emite operacion_fallida.
+    """
+    progreso = pyqtSignal(int, int)                        # hechas, total
+    avance = pyqtSignal(int, object, object)               # op_id, bytes copiados, total (copia en curso)
+    operacion_terminada = pyqtSignal(int, str, object, object)  # op_id, tipo, documento_id, ruta
+    operacion_fallida = pyqtSignal(int, str, object, str)       # op_id, tipo, documento_id, mensaje
+    cola_vacia = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.db = ColaArchivosDB()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(settings.ARCHIVOS_MAX_HILOS)
+        self._en_curso = set()
+        self._hechas = 0
+        self._total = 0
+        self._senales = _SenalesArchivo()
+        self._senales.terminada.connect(self._on_terminada)
+        self._senales.fallida.connect(self._on_fallida)
+        self._senales.avance.connect(self.avance)
+
+    def copiar(self, origen: str, destino: str, documento_id: int | None = None) -> int:
+        """Registra y encola la copia de origen a destino. Retorna el ID de la operación."""
+        op_id = self.db.registrar(OPERACION_COPIAR, origen, destino, documento_id)
+        self.encolar([op_id])
+        return op_id
+
+    def eliminar(self, ruta: str, documento_id: int | None = None) -> int:
+        """Registra y encola el borrado de un archivo. Retorna el ID de la operación."""
+        op_id = self.db.registrar(OPERACION_ELIMINAR, ruta, None, documento_id)
+        self.encolar([op_id])
+        return op_id
+
+    def encolar(self, op_ids: list[int]):
+        """Encola operaciones ya registradas en el diario (p. ej. con registrar_operacion)."""
+        nuevas = [op_id for op_id in op_ids if op_id not in self._en_curso]
+        if not nuevas:
+            return
+        self._en_curso.update(nuevas)
+        self._total += len(nuevas)
+        for op_id in nuevas:
+            self.pool.start(_OperacionRunnable(self, op_id))
+        self.progreso.emit(self._hechas, self._total)
+
+    def reanudar(self) -> int:
+        """Encola las operaciones que quedaron pendientes de una ejecución anterior."""
+        self.db.limpiar_hechas()
+        pendientes = self.db.get_pendientes()
+        if pendientes:
+            logger.info(f"Cola de archivos: se retoman {len(pendientes)} operaciones pendientes.")
+            self.encolar(pendientes)
+        return len(pendientes)
+
+    def pendientes(self) -> int:
+        return len(self._en_curso)
+
+    def esperar(self, msecs: int = -1) -> bool:
+        """Espera a que terminen las operaciones en ejecución (no las que esperan un reintento)."""
+        return self.pool.waitForDone(msecs)
+
+    def _on_terminada(self, op_id, tipo, documento_id, ruta):
+        self._en_curso.discard(op_id)
+        self._hechas += 1
+        if tipo:
+            self.operacion_terminada.emit(op_id, tipo, documento_id, ruta)
+        self._emitir_progreso()
+
+    def _on_fallida(self, op_id, tipo, documento_id, intentos, error):
+        if es_reintentable(error) and intentos < settings.ARCHIVOS_REINTENTOS:
+            espera = min(settings.ARCHIVOS_ESPERA_INICIAL_MS * 2 ** (intentos - 1), settings.ARCHIVOS_ESPERA_MAXIMA_MS)
+            logger.debug(f"Operación de archivo {op_id} bloqueada ({error}); reintento {intentos} en {espera} ms.")
+            QTimer.singleShot(espera, lambda: self.pool.start(_OperacionRunnable(self, op_id)))
+            return
+        logger.error(f"Operación de archivo {op_id} ({tipo}) falló tras {intentos} intento(s): {error}")
+        try:
+            self.db.marcar(op_id, ESTADO_FALLIDA, str(error))
+        except Exception:
+            logger.exception(f"No se pudo marcar como fallida la operación de archivo {op_id}.")
+        self._en_curso.discard(op_id)
+        self._hechas += 1
+        self.operacion_fallida.emit(op_id, tipo, documento_id, str(error))
+        self._emitir_progreso()
+
+    def _emitir_progreso(self):
+        self.progreso.emit(self._hechas, self._total)
+        if not self._en_curso:
+            self._hechas = 0
+            self._total = 0
+            self.cola_vacia.emit()
+
+
+# Cola compartida por todos los módulos (se crea la primera vez que se usa).
+_cola_archivos = None
+
+
+def get_cola_archivos() -> ColaArchivos:
+    """
+    Devuelve la cola de archivos única. Debe llamarse por primera vez desde el hilo de
+    la interfaz; al crearla se retoman las operaciones pendientes del diario.
+    """
+    global _cola_archivos
+    if _cola_archivos is None:
+        _cola_archivos = ColaArchivos()
+        try:
+            _cola_archivos.reanudar()
+        except Exception:
+            logger.exception("No se pudieron retomar las operaciones de archivo pendientes.")
+    return _cola_archivos
@@ -1,4 +1,6 @@
-import sqlite3
+from SELECTA_SCAM.utils.db_manager import get_raw_connection
 
 def obtener_conexion():
-    return sqlite3.connect("base_de_datos.db")
+    # Conexión sqlite3 del pool del engine único (misma base que el resto de la app).
+    # close() la devuelve al pool.
+    return get_raw_connection()
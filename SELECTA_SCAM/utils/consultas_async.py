@@ -0,0 +1,109 @@
+# SELECTA_SCAM/utils/consultas_async.py
+import logging
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Pool compartido por todos los módulos (se crea la primera vez que se usa).
+_pool_consultas = None
+
+
+def get_pool_consultas() -> QThreadPool:
+    """
+    Devuelve el QThreadPool único donde se ejecutan las consultas de la interfaz.
+    """
+    global _pool_consultas
+    if _pool_consultas is None:
+        _pool_consultas = QThreadPool()
+        _pool_consultas.setMaxThreadCount(settings.CONSULTAS_MAX_HILOS)
+    return _pool_consultas
+
+
+class _SenalesConsulta(QObject):
+    # Se crea en el hilo de la interfaz: al emitir desde un worker, Qt encola la
+    # llamada y el slot se ejecuta en el hilo de la interfaz.
+    terminada = pyqtSignal(str, int, object)
+    fallida = pyqtSignal(str, int, object)
+
+
+class _ConsultaRunnable(QRunnable):
+    def __init__(self, ejecutor, clave: str, generacion: int, funcion, args, kwargs):
+        super().__init__()
+        self.ejecutor = ejecutor
+        self.clave = clave
+        self.generacion = generacion
+        self.funcion = funcion
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        # Si mientras esperaba turno llegó una consulta más nueva, ni se ejecuta.
+        if not self.ejecutor.es_vigente(self.clave, self.generacion):
+            return
+        try:
+            resultado = self.funcion(*self.args, **self.kwargs)
+        except Exception as e:
+            logger.exception(f"Consulta en segundo plano '{self.clave}' falló.")
+            self.ejecutor._senales.fallida.emit(self.clave, self.generacion, e)
+        else:
+            self.ejecutor._senales.terminada.emit(self.clave, self.generacion, resultado)
+
+
+class EjecutorConsultas(QObject):
+    """
+    Ejecuta funciones de consulta fuera del hilo de la interfaz y entrega el resultado
+    en el hilo de la interfaz. Cada consulta tiene una clave ('buscar_documentos', ...):
+    una consulta nueva con la misma clave reemplaza a la anterior, cuyo resultado se descarta.
+
+    La función se ejecuta en otro hilo: debe abrir su propia sesión y devolver datos
+    simples (tuplas, listas, dicts), nunca objetos ORM ligados a una sesión.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._generaciones = {}
+        self._pendientes = {}
+        self._senales = _SenalesConsulta()
+        self._senales.terminada.connect(self._on_terminada)
+        self._senales.fallida.connect(self._on_fallida)
+
+    def ejecutar(self, clave: str, funcion, *args, al_terminar=None, al_fallar=None, **kwargs) -> int:
+        """
+        Encola funcion(*args, **kwargs). al_terminar(resultado) y al_fallar(excepcion)
+        se llaman en el hilo de la interfaz solo si la consulta sigue siendo la más reciente.
+        Retorna la generación asignada a la consulta.
+        """
+        generacion = self._generaciones.get(clave, 0) + 1
+        self._generaciones[clave] = generacion
+        # Las respuestas pendientes de consultas anteriores ya no se entregarán.
+        self._pendientes = {k: v for k, v in self._pendientes.items() if k[0] != clave}
+        self._pendientes[(clave, generacion)] = (al_terminar, al_fallar)
+        get_pool_consultas().start(_ConsultaRunnable(self, clave, generacion, funcion, args, kwargs))
+        return generacion
+
+    def cancelar(self, clave: str):
+        """Descarta la consulta en curso de la clave indicada (si la hay)."""
+        self._generaciones[clave] = self._generaciones.get(clave, 0) + 1
+        self._pendientes = {k: v for k, v in self._pendientes.items() if k[0] != clave}
+
+    def es_vigente(self, clave: str, generacion: int) -> bool:
+        return self._generaciones.get(clave) == generacion
+
+    def _on_terminada(self, clave, generacion, resultado):
+        callbacks = self._pendientes.pop((clave, generacion), None)
+        if callbacks is None or not self.es_vigente(clave, generacion):
+            logger.debug(f"Resultado obsoleto de '{clave}' (generación {generacion}) descartado.")
+            return
+        al_terminar, _ = callbacks
+        if al_terminar:
+            al_terminar(resultado)
+
+    def _on_fallida(self, clave, generacion, error):
+        callbacks = self._pendientes.pop((clave, generacion), None)
+        if callbacks is None or not self.es_vigente(clave, generacion):
+            return
+        _, al_fallar = callbacks
+        if al_fallar:
+            al_fallar(error)
@@ -1,34 +1,151 @@
 # SELECTA_SCAM/utils/db_manager.py
 import os
 import logging
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from ..db.base import Base # Importa la Base de los modelos
+from ..db.busqueda import instalar_indices_busqueda
+from ..db.saldos import instalar_saldos
+from ..config import settings
 
 # --- CONFIGURACIÓN CENTRALIZADA DE LA RUTA DE LA BASE DE DATOS ---
-# Esto asegura que la base de datos siempre se cree en el lugar correcto
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-DATABASE_PATH = os.path.join(project_root, 'SELECTA_SCAM', 'data', 'base_oficial.db')
+# La única fuente de verdad es config/settings.py. Todos los módulos (SQLAlchemy o
+# sqlite3 "crudo") deben pasar por este archivo para no leer bases de datos obsoletas.
+DATABASE_PATH = settings.DATABASE_PATH
+DATABASE_URL = settings.SQLALCHEMY_DATABASE_URL
 db_dir = os.path.dirname(DATABASE_PATH)
 os.makedirs(db_dir, exist_ok=True)
 # --- FIN DE LA CONFIGURACIÓN ---
 
-engine = create_engine(f"sqlite:///{DATABASE_PATH}", connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Registro de engines por URL: cada base de datos tiene un único engine (y un único pool).
+_engines = {}
+
+
+def _sqlite_pragmas() -> list[str]:
+    """
+    Construye la lista de PRAGMAs del perfil de rendimiento a partir de config/settings.py.
+    """
+    pragmas = [
+        f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT_MS)}",
+        f"PRAGMA journal_mode = {settings.SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}",
+        # Un valor negativo indica el tamaño en KiB en lugar de número de páginas.
+        f"PRAGMA cache_size = -{int(settings.SQLITE_CACHE_SIZE_KB)}",
+        f"PRAGMA mmap_size = {int(settings.SQLITE_MMAP_SIZE)}",
+        f"PRAGMA temp_store = {settings.SQLITE_TEMP_STORE}",
+        f"PRAGMA foreign_keys = {'ON' if settings.SQLITE_FOREIGN_KEYS else 'OFF'}",
+    ]
+    return pragmas
+
+
+def _configurar_conexion_sqlite(dbapi_connection, connection_record):
+    """
+    Listener 'connect': aplica el perfil de PRAGMAs a cada conexión nueva del pool.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _sqlite_pragmas():
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def _revisar_claves_foraneas(dbapi_connection, connection_record):
+    """
+    Listener 'first_connect': una sola vez por engine, busca filas huérfanas con
+    PRAGMA foreign_key_check. Las bases creadas antes de activar foreign_keys pueden
+    tenerlas; se informan en el log para repararlas (no se borra nada automáticamente).
+    """
+    if not settings.SQLITE_FOREIGN_KEYS:
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        huerfanas = cursor.execute("PRAGMA foreign_key_check").fetchall()
+    finally:
+        cursor.close()
+    if not huerfanas:
+        return
+    # Filas de la forma (tabla, rowid, tabla padre, id de la clave foránea)
+    por_relacion = {}
+    for tabla, rowid, padre, _fkid in huerfanas:
+        por_relacion.setdefault((tabla, padre), []).append(rowid)
+    for (tabla, padre), rowids in sorted(por_relacion.items()):
+        muestra = ", ".join(str(r) for r in rowids[:10])
+        logger.warning(
+            f"Integridad: {len(rowids)} filas de '{tabla}' apuntan a '{padre}' inexistente "
+            f"(rowid: {muestra}{'...' if len(rowids) > 10 else ''})."
+        )
+
+
+def get_engine(url: str = DATABASE_URL):
+    """
+    Devuelve el engine registrado para la URL indicada, creándolo la primera vez.
+    Todas las llamadas con la misma URL comparten el mismo pool de conexiones
+    y la misma caché de sentencias compiladas.
+    """
+    if url not in _engines:
+        nuevo_engine = create_engine(
+            url,
+            poolclass=QueuePool,
+            pool_size=settings.SQLALCHEMY_POOL_SIZE,
+            max_overflow=settings.SQLALCHEMY_MAX_OVERFLOW,
+            query_cache_size=settings.SQLALCHEMY_QUERY_CACHE_SIZE,
+            connect_args={
+                "check_same_thread": False,
+                "cached_statements": settings.SQLITE_CACHED_STATEMENTS,
+            },
+        )
+        event.listen(nuevo_engine, "connect", _configurar_conexion_sqlite)
+        event.listen(nuevo_engine, "first_connect", _revisar_claves_foraneas)
+        _engines[url] = nuevo_engine
+        logger.info(f"Engine de base de datos registrado para: {url}")
+    return _engines[url]
+
+
+engine = get_engine()
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
 def create_all_tables():
     """
     Función global para crear todas las tablas definidas en los modelos.
     """
     logger.info("Creando todas las tablas en la base de datos...")
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        instalar_indices_busqueda(connection)
+        instalar_saldos(connection)
     logger.info("Tablas creadas exitosamente.")
 
 def get_db_session():
     """
     Función global para obtener una nueva sesión de base de datos.
     """
-    return SessionLocal()
\ No newline at end of file
+    return SessionLocal()
+
+def get_raw_connection():
+    """
+    Devuelve una conexión DBAPI (sqlite3) tomada del pool del engine único.
+    Al llamar a close() la conexión vuelve al pool en lugar de cerrarse.
+    """
+    return engine.raw_connection()
+
+@contextmanager
+def raw_connection():
+    """
+    Context manager para código que necesita un cursor sqlite3 directo.
+    Hace commit al salir sin errores y rollback en caso de excepción.
+    """
+    conn = get_raw_connection()
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
@@ -0,0 +1,188 @@
+# SELECTA_SCAM/utils/ocr.py
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from PyQt5.QtCore import QCoreApplication
+
+from ..config import settings
+from .archivos import sha256_contenido, eliminar_si_existe
+
+try:
+    import fitz
+except ImportError:
+    fitz = None
+
+try:
+    import pytesseract
+    from PIL import Image
+    if os.path.exists(settings.TESSERACT_CMD):
+        pytesseract.pytesseract.tesseract_cmd = settings.TESSERACT_CMD
+except ImportError:
+    pytesseract = None
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# Pool de procesos compartido (se crea la primera vez que se usa).
+_pool_ocr = None
+
+
+def get_pool_ocr() -> ProcessPoolExecutor:
+    """Procesos para OCR: tesseract usa CPU de verdad, los hilos no servirían por el GIL."""
+    global _pool_ocr
+    if _pool_ocr is None:
+        _pool_ocr = ProcessPoolExecutor(max_workers=settings.OCR_PROCESOS or os.cpu_count() or 1)
+        # En la aplicación se cierra al salir; sin Qt (el vigilante) lo cierra quien lo usa
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(cerrar_pool_ocr)
+    return _pool_ocr
+
+
+def cerrar_pool_ocr():
+    """Cancela las páginas encargadas que no empezaron y libera los procesos."""
+    global _pool_ocr
+    if _pool_ocr is not None:
+        _pool_ocr.shutdown(wait=False, cancel_futures=True)
+        _pool_ocr = None
+
+
+def ocr_disponible() -> bool:
+    return fitz is not None and pytesseract is not None
+
+
+def contar_paginas(ruta: str) -> int:
+    with fitz.open(ruta) as doc:
+        return doc.page_count
+
+
+def _palabras(imagen, idioma: str, escala: float) -> list[tuple]:
+    """Palabras con su caja en puntos de la página, en el formato de page.get_text("words")."""
+    datos = pytesseract.image_to_data(imagen, lang=idioma, output_type=pytesseract.Output.DICT)
+    palabras = []
+    for i, texto in enumerate(datos['text']):
+        if not texto.strip():
+            continue
+        x0 = datos['left'][i] / escala
+        y0 = datos['top'][i] / escala
+        x1 = x0 + datos['width'][i] / escala
+        y1 = y0 + datos['height'][i] / escala
+        # (x0, y0, x1, y1, palabra, bloque, línea, n.º de palabra)
+        linea = datos['par_num'][i] * 1000 + datos['line_num'][i]
+        palabras.append((x0, y0, x1, y1, texto, datos['block_num'][i], linea, datos['word_num'][i]))
+    return palabras
+
+
+def _ocr_pagina(ruta: str, numero: int, dpi: int, idioma: str, palabras: bool):
+    """
+    Se ejecuta en un proceso del pool: abre el documento, rasteriza solo esta página y la
+    reconoce. Ninguna página rasterizada vuelve al proceso principal, solo el resultado.
+    """
+    with fitz.open(ruta) as doc:
+        pix = doc.load_page(numero).get_pixmap(dpi=dpi, colorspace=fitz.csGRAY, alpha=False)
+    imagen = Image.frombytes('L', (pix.width, pix.height), pix.samples)
+    if palabras:
+        return _palabras(imagen, idioma, dpi / 72)
+    return pytesseract.image_to_string(imagen, lang=idioma)
+
+
+# --- Caché de resultados por (contenido, página) ---
+
+def _ruta_cache(sha256: str, numero: int, dpi: int, idioma: str, palabras: bool) -> str:
+    modo = 'palabras' if palabras else 'texto'
+    return os.path.join(settings.OCR_CACHE_DIR, sha256[:2], sha256, f"{numero}-{dpi}-{idioma}-{modo}.json")
+
+
+def _leer_cache(ruta_cache: str):
+    try:
+        with open(ruta_cache, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Resultado de OCR ilegible en caché ({ruta_cache}), se repite: {e}")
+        return None
+
+
+def _guardar_cache(ruta_cache: str, resultado):
+    os.makedirs(os.path.dirname(ruta_cache), exist_ok=True)
+    temporal = f"{ruta_cache}.{os.getpid()}.parcial"
+    try:
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, ensure_ascii=False)
+        os.replace(temporal, ruta_cache)
+    except OSError as e:
+        eliminar_si_existe(temporal)
+        logger.warning(f"No se pudo guardar el OCR en caché ({ruta_cache}): {e}")
+
+
+def ocr_paginas(ruta: str, paginas=None, palabras: bool = False, dpi: int = None, idioma: str = 'spa',
+                progreso=None, cancelado=None) -> dict:
+    """
+    Reconoce las páginas indicadas (todas si es None) de un PDF o imagen en el pool de procesos.
+    Retorna {pagina: texto} o, con palabras=True, {pagina: [(x0, y0, x1, y1, palabra, bloque, línea, n.º), ...]}.
+
+    Las páginas se reparten de a poco (OCR_PAGINAS_EN_CURSO por proceso): nunca se rasteriza
+    el documento entero de una vez. Cada resultado se guarda por (SHA-256 del contenido, página),
+    así que repetir el OCR del mismo archivo, aunque se haya movido o renombrado, es inmediato.
+    progreso(hechas, total) y cancelado() son opcionales.
+    """
+    if not ocr_disponible():
+        logger.warning("OCR no disponible: faltan PyMuPDF, pytesseract o Pillow.")
+        return {}
+    dpi = dpi or settings.OCR_DPI
+    if paginas is None:
+        paginas = range(contar_paginas(ruta))
+    paginas = list(paginas)
+    sha256 = sha256_contenido(ruta)
+    resultados = {}
+    por_hacer = []
+    for numero in paginas:
+        guardado = _leer_cache(_ruta_cache(sha256, numero, dpi, idioma, palabras))
+        if guardado is not None:
+            resultados[numero] = [tuple(p) for p in guardado] if palabras else guardado
+        else:
+            por_hacer.append(numero)
+    total = len(paginas)
+    if progreso and resultados:
+        progreso(len(resultados), total)
+    if not por_hacer:
+        return resultados
+
+    pool = get_pool_ocr()
+    limite = max(1, (settings.OCR_PROCESOS or os.cpu_count() or 1) * settings.OCR_PAGINAS_EN_CURSO)
+    pendientes = iter(por_hacer)
+    en_curso = {}
+    try:
+        while True:
+            while len(en_curso) < limite and not (cancelado and cancelado()):
+                numero = next(pendientes, None)
+                if numero is None:
+                    break
+                en_curso[pool.submit(_ocr_pagina, ruta, numero, dpi, idioma, palabras)] = numero
+            if not en_curso:
+                break
+            hechos, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+            for future in hechos:
+                numero = en_curso.pop(future)
+                try:
+                    resultado = future.result()
+                except Exception as e:
+                    logger.error(f"OCR de la página {numero + 1} de '{ruta}' falló: {e}")
+                    continue
+                _guardar_cache(_ruta_cache(sha256, numero, dpi, idioma, palabras), resultado)
+                resultados[numero] = resultado
+                if progreso:
+                    progreso(len(resultados), total)
+    finally:
+        for future in en_curso:
+            future.cancel()
+    return resultados
+
+
+def ocr_texto(ruta: str, dpi: int = None, idioma: str = 'spa', progreso=None) -> str:
+    """Texto de todas las páginas, en orden, separadas por saltos de línea."""
+    resultados = ocr_paginas(ruta, dpi=dpi, idioma=idioma, progreso=progreso)
+    return "\n".join(resultados[n] for n in sorted(resultados))
@@ -0,0 +1,71 @@
+# alembic/env.py
+from logging.config import fileConfig
+
+from sqlalchemy import pool
+from alembic import context
+
+from SELECTA_SCAM.config import settings
+from SELECTA_SCAM.db.base import Base
+from SELECTA_SCAM.db import models  # noqa: F401  (registra los modelos en Base.metadata)
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+# La URL sale de config/settings.py para que las migraciones apunten a la misma
+# base de datos que usa la aplicación (la de alembic.ini es solo un valor por defecto).
+config.set_main_option("sqlalchemy.url", settings.SQLALCHEMY_DATABASE_URL)
+
+target_metadata = Base.metadata
+
+
+def include_object(objeto, nombre, tipo, reflejado, comparado_con):
+    """
+    Excluye del autogenerate los índices FTS5 (tablas virtuales *_fts y sus tablas
+    internas *_fts_data, _idx, _docsize, _config): no están en los modelos y los
+    gestiona db/busqueda.py; sin este filtro se generarían drop_table para ellos.
+    """
+    if tipo == "table" and nombre and "_fts" in nombre:
+        return False
+    return True
+
+
+def run_migrations_offline() -> None:
+    """Genera el SQL de las migraciones sin conectarse a la base de datos."""
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+        include_object=include_object,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Ejecuta las migraciones usando el engine único de la aplicación."""
+    from SELECTA_SCAM.utils.db_manager import get_engine
+
+    connectable = get_engine(config.get_main_option("sqlalchemy.url"))
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            # SQLite no soporta la mayoría de ALTER TABLE; batch recrea la tabla.
+            render_as_batch=True,
+            include_object=include_object,
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
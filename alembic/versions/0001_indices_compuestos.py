@@ -0,0 +1,44 @@
+"""Índices compuestos para los filtros frecuentes de documentos, contabilidad, procesos y eventos
+
+Revision ID: 0001_indices_compuestos
+Revises:
+Create Date: 2026-10-18 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_indices_compuestos'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDICES = [
+    ('ix_documentos_eliminado_cliente_tipo_fecha', 'documentos',
+     ['eliminado', 'cliente_id', 'tipo_documento', 'fecha_subida']),
+    ('ix_documentos_eliminado_fecha', 'documentos', ['eliminado', 'fecha_subida']),
+    ('ix_contabilidad_cliente_proceso_tipo_fecha', 'contabilidad',
+     ['cliente_id', 'proceso_id', 'tipo_contable_id', 'fecha']),
+    ('ix_contabilidad_fecha', 'contabilidad', ['fecha']),
+    ('ix_procesos_cliente_eliminado', 'procesos', ['cliente_id', 'eliminado']),
+    ('ix_eventos_fecha_evento', 'eventos', ['fecha_evento']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for nombre, tabla, columnas in INDICES:
+        # Las bases creadas con create_all() después de este cambio ya tienen los índices.
+        op.create_index(nombre, tabla, columnas, if_not_exists=True)
+    # Actualiza las estadísticas para que el planificador elija los índices nuevos.
+    op.execute('ANALYZE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for nombre, tabla, _columnas in reversed(INDICES):
+        op.drop_index(nombre, table_name=tabla, if_exists=True)
@@ -0,0 +1,100 @@
+"""Índices de texto completo (FTS5) para documentos, procesos y clientes
+
+Revision ID: 0002_busqueda_fts5
+Revises: 0001_indices_compuestos
+Create Date: 2026-10-18 11:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_busqueda_fts5'
+down_revision: Union[str, Sequence[str], None] = '0001_indices_compuestos'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# SQL copiado tal como estaba al crear esta revisión: una migración no debe cambiar si
+# después se modifica db/busqueda.py. Los cambios a ese SQL van en una revisión nueva.
+SENTENCIAS_INSTALACION = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS clientes_fts USING fts5(nombre, numero_identificacion, "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3 4')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS documentos_fts USING fts5(nombre, "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3 4')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS procesos_fts USING fts5(radicado, tipo, estado, juzgado, cliente_nombre, "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3 4')",
+    """CREATE TRIGGER IF NOT EXISTS clientes_fts_ai AFTER INSERT ON clientes BEGIN
+        INSERT INTO clientes_fts(rowid, nombre, numero_identificacion)
+        VALUES (new.id, new.nombre, new.numero_identificacion);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS clientes_fts_ad AFTER DELETE ON clientes BEGIN
+        DELETE FROM clientes_fts WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS clientes_fts_au AFTER UPDATE OF nombre, numero_identificacion ON clientes BEGIN
+        DELETE FROM clientes_fts WHERE rowid = old.id;
+        INSERT INTO clientes_fts(rowid, nombre, numero_identificacion)
+        VALUES (new.id, new.nombre, new.numero_identificacion);
+        UPDATE procesos_fts SET cliente_nombre = new.nombre
+        WHERE rowid IN (SELECT id FROM procesos WHERE cliente_id = new.id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS documentos_fts_ai AFTER INSERT ON documentos BEGIN
+        INSERT INTO documentos_fts(rowid, nombre) VALUES (new.id, new.nombre);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS documentos_fts_ad AFTER DELETE ON documentos BEGIN
+        DELETE FROM documentos_fts WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS documentos_fts_au AFTER UPDATE OF nombre ON documentos BEGIN
+        DELETE FROM documentos_fts WHERE rowid = old.id;
+        INSERT INTO documentos_fts(rowid, nombre) VALUES (new.id, new.nombre);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS procesos_fts_ai AFTER INSERT ON procesos BEGIN
+        INSERT INTO procesos_fts(rowid, radicado, tipo, estado, juzgado, cliente_nombre)
+        VALUES (new.id, new.radicado, new.tipo, new.estado, new.juzgado,
+                (SELECT nombre FROM clientes WHERE id = new.cliente_id));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS procesos_fts_ad AFTER DELETE ON procesos BEGIN
+        DELETE FROM procesos_fts WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS procesos_fts_au
+    AFTER UPDATE OF radicado, tipo, estado, juzgado, cliente_id ON procesos BEGIN
+        DELETE FROM procesos_fts WHERE rowid = old.id;
+        INSERT INTO procesos_fts(rowid, radicado, tipo, estado, juzgado, cliente_nombre)
+        VALUES (new.id, new.radicado, new.tipo, new.estado, new.juzgado,
+                (SELECT nombre FROM clientes WHERE id = new.cliente_id));
+    END""",
+]
+
+SENTENCIAS_RECONSTRUCCION = [
+    "DELETE FROM clientes_fts",
+    """INSERT INTO clientes_fts(rowid, nombre, numero_identificacion)
+       SELECT id, nombre, numero_identificacion FROM clientes""",
+    "DELETE FROM documentos_fts",
+    "INSERT INTO documentos_fts(rowid, nombre) SELECT id, nombre FROM documentos",
+    "DELETE FROM procesos_fts",
+    """INSERT INTO procesos_fts(rowid, radicado, tipo, estado, juzgado, cliente_nombre)
+       SELECT p.id, p.radicado, p.tipo, p.estado, p.juzgado, c.nombre
+       FROM procesos p LEFT JOIN clientes c ON c.id = p.cliente_id""",
+]
+
+TABLAS_FTS = ['clientes_fts', 'documentos_fts', 'procesos_fts']
+TRIGGERS = [
+    'clientes_fts_ai', 'clientes_fts_ad', 'clientes_fts_au',
+    'documentos_fts_ai', 'documentos_fts_ad', 'documentos_fts_au',
+    'procesos_fts_ai', 'procesos_fts_ad', 'procesos_fts_au',
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for sentencia in SENTENCIAS_INSTALACION + SENTENCIAS_RECONSTRUCCION:
+        op.execute(sentencia)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger in TRIGGERS:
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    for tabla in TABLAS_FTS:
+        op.execute(f'DROP TABLE IF EXISTS {tabla}')
@@ -0,0 +1,69 @@
+"""Tabla documento_texto e índice FTS5 del contenido de los archivos
+
+Revision ID: 0003_documento_texto
+Revises: 0002_busqueda_fts5
+Create Date: 2026-10-18 14:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_documento_texto'
+down_revision: Union[str, Sequence[str], None] = '0002_busqueda_fts5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# SQL copiado tal como estaba al crear esta revisión: una migración no debe cambiar si
+# después se modifica db/busqueda.py. Los cambios a ese SQL van en una revisión nueva.
+SENTENCIAS_INSTALACION_CONTENIDO = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS documento_texto_fts USING fts5(texto, "
+    "content='documento_texto', content_rowid='documento_id', tokenize='unicode61 remove_diacritics 2')",
+    """CREATE TRIGGER IF NOT EXISTS documento_texto_fts_ai AFTER INSERT ON documento_texto BEGIN
+        INSERT INTO documento_texto_fts(rowid, texto) VALUES (new.documento_id, new.texto);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS documento_texto_fts_ad AFTER DELETE ON documento_texto BEGIN
+        INSERT INTO documento_texto_fts(documento_texto_fts, rowid, texto)
+        VALUES ('delete', old.documento_id, old.texto);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS documento_texto_fts_au AFTER UPDATE ON documento_texto BEGIN
+        INSERT INTO documento_texto_fts(documento_texto_fts, rowid, texto)
+        VALUES ('delete', old.documento_id, old.texto);
+        INSERT INTO documento_texto_fts(rowid, texto) VALUES (new.documento_id, new.texto);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS documentos_texto_ad AFTER DELETE ON documentos BEGIN
+        DELETE FROM documento_texto WHERE documento_id = old.id;
+    END""",
+]
+
+SENTENCIAS_RECONSTRUCCION_CONTENIDO = [
+    "INSERT INTO documento_texto_fts(documento_texto_fts) VALUES ('rebuild')",
+]
+
+TRIGGERS = ['documento_texto_fts_ai', 'documento_texto_fts_ad', 'documento_texto_fts_au', 'documentos_texto_ad']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'documento_texto',
+        sa.Column('documento_id', sa.Integer(), sa.ForeignKey('documentos.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('texto', sa.Text(), nullable=False),
+        sa.Column('origen', sa.String(), nullable=False),
+        sa.Column('paginas', sa.Integer(), nullable=True),
+        sa.Column('fecha_extraccion', sa.DateTime(), nullable=True),
+        if_not_exists=True,
+    )
+    for sentencia in SENTENCIAS_INSTALACION_CONTENIDO + SENTENCIAS_RECONSTRUCCION_CONTENIDO:
+        op.execute(sentencia)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger in TRIGGERS:
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    op.execute('DROP TABLE IF EXISTS documento_texto_fts')
+    op.drop_table('documento_texto')
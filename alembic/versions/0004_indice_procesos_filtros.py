@@ -0,0 +1,29 @@
+"""Índice compuesto para el listado filtrado de procesos (eliminado, estado, cliente)
+
+Revision ID: 0004_indice_procesos_filtros
+Revises: 0003_documento_texto
+Create Date: 2026-10-18 16:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004_indice_procesos_filtros'
+down_revision: Union[str, Sequence[str], None] = '0003_documento_texto'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_procesos_eliminado_estado_cliente', 'procesos',
+                    ['eliminado', 'estado', 'cliente_id'], if_not_exists=True)
+    op.execute('ANALYZE procesos')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_procesos_eliminado_estado_cliente', table_name='procesos', if_exists=True)
@@ -0,0 +1,45 @@
+"""Tabla operaciones_archivo: diario de la cola de copias y borrados de archivos
+
+Revision ID: 0005_operaciones_archivo
+Revises: 0004_indice_procesos_filtros
+Create Date: 2026-10-18 17:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005_operaciones_archivo'
+down_revision: Union[str, Sequence[str], None] = '0004_indice_procesos_filtros'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'operaciones_archivo',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('tipo', sa.String(), nullable=False),
+        sa.Column('origen', sa.String(), nullable=False),
+        sa.Column('destino', sa.String(), nullable=True),
+        sa.Column('documento_id', sa.Integer(), nullable=True),
+        sa.Column('estado', sa.String(), nullable=False, server_default='pendiente'),
+        sa.Column('intentos', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('ultimo_error', sa.Text(), nullable=True),
+        sa.Column('fecha_creacion', sa.DateTime(), nullable=True),
+        sa.Column('fecha_actualizacion', sa.DateTime(), nullable=True),
+        if_not_exists=True,
+    )
+    op.create_index('ix_operaciones_archivo_id', 'operaciones_archivo', ['id'], if_not_exists=True)
+    op.create_index('ix_operaciones_archivo_estado', 'operaciones_archivo', ['estado'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_operaciones_archivo_estado', table_name='operaciones_archivo', if_exists=True)
+    op.drop_index('ix_operaciones_archivo_id', table_name='operaciones_archivo', if_exists=True)
+    op.drop_table('operaciones_archivo')
@@ -0,0 +1,33 @@
+"""Columna documentos.sha256 para el almacén de archivos direccionado por contenido
+
+Revision ID: 0006_documentos_sha256
+Revises: 0005_operaciones_archivo
+Create Date: 2026-10-18 18:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006_documentos_sha256'
+down_revision: Union[str, Sequence[str], None] = '0005_operaciones_archivo'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Los documentos existentes quedan con sha256 NULL y conservan su ruta en la carpeta del cliente.
+    with op.batch_alter_table('documentos') as batch_op:
+        batch_op.add_column(sa.Column('sha256', sa.String(length=64), nullable=True))
+    op.create_index('ix_documentos_sha256', 'documentos', ['sha256'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_documentos_sha256', table_name='documentos', if_exists=True)
+    with op.batch_alter_table('documentos') as batch_op:
+        batch_op.drop_column('sha256')
@@ -0,0 +1,49 @@
+"""Tabla trabajos_descargas: diario del vigilante de la carpeta de Descargas
+
+Revision ID: 0007_trabajos_descargas
+Revises: 0006_documentos_sha256
+Create Date: 2026-10-18 21:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007_trabajos_descargas'
+down_revision: Union[str, Sequence[str], None] = '0006_documentos_sha256'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'trabajos_descargas',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('ruta_origen', sa.String(), nullable=False),
+        sa.Column('tamano', sa.Integer(), nullable=False),
+        sa.Column('mtime_ns', sa.Integer(), nullable=False),
+        sa.Column('estado', sa.String(), nullable=False, server_default='pendiente'),
+        sa.Column('destino', sa.String(), nullable=True),
+        sa.Column('radicado', sa.String(), nullable=True),
+        sa.Column('intentos', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('ultimo_error', sa.Text(), nullable=True),
+        sa.Column('fecha_creacion', sa.DateTime(), nullable=True),
+        sa.Column('fecha_actualizacion', sa.DateTime(), nullable=True),
+        if_not_exists=True,
+    )
+    op.create_index('ix_trabajos_descargas_id', 'trabajos_descargas', ['id'], if_not_exists=True)
+    op.create_index('ux_trabajos_descargas_archivo', 'trabajos_descargas',
+                    ['ruta_origen', 'tamano', 'mtime_ns'], unique=True, if_not_exists=True)
+    op.create_index('ix_trabajos_descargas_estado', 'trabajos_descargas', ['estado'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_trabajos_descargas_estado', table_name='trabajos_descargas', if_exists=True)
+    op.drop_index('ux_trabajos_descargas_archivo', table_name='trabajos_descargas', if_exists=True)
+    op.drop_index('ix_trabajos_descargas_id', table_name='trabajos_descargas', if_exists=True)
+    op.drop_table('trabajos_descargas')
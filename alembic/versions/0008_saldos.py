@@ -0,0 +1,92 @@
+"""Tabla saldos: totales de contabilidad por cliente, proceso, tipo y mes, mantenidos por triggers
+
+Revision ID: 0008_saldos
+Revises: 0007_trabajos_descargas
+Create Date: 2026-10-18 23:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008_saldos'
+down_revision: Union[str, Sequence[str], None] = '0007_trabajos_descargas'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# SQL copiado tal como estaba al crear esta revisión: una migración no debe cambiar si
+# después se modifica db/saldos.py. Los cambios a ese SQL van en una revisión nueva.
+TRIGGERS = ['contabilidad_saldos_ai', 'contabilidad_saldos_ad', 'contabilidad_saldos_au']
+
+SENTENCIAS_INSTALACION = [
+    """CREATE TRIGGER IF NOT EXISTS contabilidad_saldos_ai AFTER INSERT ON contabilidad BEGIN
+        INSERT INTO saldos(cliente_id, proceso_id, tipo_contable_id, periodo, total, movimientos)
+        VALUES (new.cliente_id, COALESCE(new.proceso_id, 0), new.tipo_contable_id,
+                COALESCE(strftime('%Y-%m', new.fecha), ''), new.monto, 1)
+        ON CONFLICT(cliente_id, proceso_id, tipo_contable_id, periodo)
+        DO UPDATE SET total = total + excluded.total, movimientos = movimientos + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS contabilidad_saldos_ad AFTER DELETE ON contabilidad BEGIN
+        UPDATE saldos SET total = total - old.monto, movimientos = movimientos - 1
+        WHERE cliente_id = old.cliente_id AND proceso_id = COALESCE(old.proceso_id, 0)
+          AND tipo_contable_id = old.tipo_contable_id
+          AND periodo = COALESCE(strftime('%Y-%m', old.fecha), '');
+        DELETE FROM saldos
+        WHERE cliente_id = old.cliente_id AND proceso_id = COALESCE(old.proceso_id, 0)
+          AND tipo_contable_id = old.tipo_contable_id
+          AND periodo = COALESCE(strftime('%Y-%m', old.fecha), '') AND movimientos <= 0;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS contabilidad_saldos_au
+    AFTER UPDATE OF cliente_id, proceso_id, tipo_contable_id, monto, fecha ON contabilidad BEGIN
+        UPDATE saldos SET total = total - old.monto, movimientos = movimientos - 1
+        WHERE cliente_id = old.cliente_id AND proceso_id = COALESCE(old.proceso_id, 0)
+          AND tipo_contable_id = old.tipo_contable_id
+          AND periodo = COALESCE(strftime('%Y-%m', old.fecha), '');
+        DELETE FROM saldos
+        WHERE cliente_id = old.cliente_id AND proceso_id = COALESCE(old.proceso_id, 0)
+          AND tipo_contable_id = old.tipo_contable_id
+          AND periodo = COALESCE(strftime('%Y-%m', old.fecha), '') AND movimientos <= 0;
+        INSERT INTO saldos(cliente_id, proceso_id, tipo_contable_id, periodo, total, movimientos)
+        VALUES (new.cliente_id, COALESCE(new.proceso_id, 0), new.tipo_contable_id,
+                COALESCE(strftime('%Y-%m', new.fecha), ''), new.monto, 1)
+        ON CONFLICT(cliente_id, proceso_id, tipo_contable_id, periodo)
+        DO UPDATE SET total = total + excluded.total, movimientos = movimientos + 1;
+    END""",
+]
+
+SENTENCIAS_RECONSTRUCCION = [
+    "DELETE FROM saldos",
+    """INSERT INTO saldos(cliente_id, proceso_id, tipo_contable_id, periodo, total, movimientos)
+    SELECT contabilidad.cliente_id, COALESCE(contabilidad.proceso_id, 0), contabilidad.tipo_contable_id,
+        COALESCE(strftime('%Y-%m', contabilidad.fecha), ''), SUM(monto), COUNT(*)
+    FROM contabilidad GROUP BY 1, 2, 3, 4""",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'saldos',
+        sa.Column('cliente_id', sa.Integer(), nullable=False),
+        sa.Column('proceso_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('tipo_contable_id', sa.Integer(), nullable=False),
+        sa.Column('periodo', sa.String(), nullable=False),
+        sa.Column('total', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('movimientos', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('cliente_id', 'proceso_id', 'tipo_contable_id', 'periodo'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_saldos_proceso', 'saldos', ['proceso_id'], if_not_exists=True)
+    for sentencia in SENTENCIAS_INSTALACION + SENTENCIAS_RECONSTRUCCION:
+        op.execute(sentencia)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger in TRIGGERS:
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    op.drop_index('ix_saldos_proceso', table_name='saldos', if_exists=True)
+    op.drop_table('saldos')
@@ -0,0 +1,169 @@
+# benchmarks/benchmark_indices.py
+"""
+Benchmark de los índices compuestos (revisión Alembic 0001_indices_compuestos).
+
+Crea una base SQLite temporal con datos sintéticos, ejecuta
+DocumentosDB.get_documentos_filtered_as_tuples y
+ContabilidadDB.get_filtered_contabilidad_records sin y con los índices nuevos,
+y muestra el tiempo medio y el plan de consulta (EXPLAIN QUERY PLAN) del SQL
+que generan esos métodos.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/benchmark_indices.py [--documentos 50000] [--movimientos 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Añade la ruta del proyecto para que las importaciones funcionen
+sys.path.insert(0, os.getcwd())
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from SELECTA_SCAM.db.base import Base
+from SELECTA_SCAM.db.models import Cliente, Proceso, Documento, TipoContable, Contabilidad
+from SELECTA_SCAM.modulos.documentos import documentos_db
+from SELECTA_SCAM.modulos.contabilidad import contabilidad_db
+
+INDICES_NUEVOS = [
+    'ix_documentos_eliminado_cliente_tipo_fecha',
+    'ix_documentos_eliminado_fecha',
+    'ix_contabilidad_cliente_proceso_tipo_fecha',
+    'ix_contabilidad_fecha',
+    'ix_procesos_cliente_eliminado',
+    'ix_eventos_fecha_evento',
+]
+TIPOS_DOCUMENTO = ['Demanda', 'Poder', 'Auto', 'Sentencia', 'Memorial', 'Contrato']
+
+
+def poblar(engine, n_clientes, n_documentos, n_movimientos):
+    """Inserta datos sintéticos con inserciones masivas."""
+    rnd = random.Random(42)
+    inicio = datetime(2020, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(Cliente.__table__.insert(), [
+            {'id': i, 'nombre': f'Cliente {i}', 'tipo_identificacion': 'CC',
+             'numero_identificacion': str(10000000 + i), 'eliminado': False}
+            for i in range(1, n_clientes + 1)
+        ])
+        conn.execute(Proceso.__table__.insert(), [
+            {'id': i, 'cliente_id': rnd.randint(1, n_clientes), 'radicado': f'{i:023d}',
+             'tipo': 'Civil', 'fecha_inicio': inicio.date(), 'estado': 'Activo',
+             'juzgado': 'Juzgado 1', 'eliminado': False}
+            for i in range(1, n_clientes * 3 + 1)
+        ])
+        conn.execute(TipoContable.__table__.insert(), [
+            {'id': 1, 'nombre': 'Ingreso por Servicios', 'es_ingreso': True},
+            {'id': 2, 'nombre': 'Gasto Operativo', 'es_ingreso': False},
+            {'id': 3, 'nombre': 'Ingreso por Honorarios', 'es_ingreso': True},
+        ])
+        conn.execute(Documento.__table__.insert(), [
+            {'cliente_id': rnd.randint(1, n_clientes), 'nombre': f'documento_{i}.pdf',
+             'archivo': f'documento_{i}.pdf', 'ubicacion_archivo': f'Documentos_Guardados/documento_{i}.pdf',
+             'tipo_documento': rnd.choice(TIPOS_DOCUMENTO),
+             'fecha_subida': inicio + timedelta(minutes=i), 'eliminado': rnd.random() < 0.05}
+            for i in range(n_documentos)
+        ])
+        conn.execute(Contabilidad.__table__.insert(), [
+            {'cliente_id': rnd.randint(1, n_clientes), 'proceso_id': rnd.randint(1, n_clientes * 3),
+             'tipo_contable_id': rnd.randint(1, 3), 'descripcion': f'Movimiento {i}',
+             'monto': round(rnd.uniform(10000, 5000000), 2), 'fecha': inicio + timedelta(minutes=i)}
+            for i in range(n_movimientos)
+        ])
+
+
+def casos(n_clientes):
+    """Llamadas representativas de los filtros de los módulos."""
+    cliente = n_clientes // 2
+    return [
+        ('Documentos activos (sin filtro)', lambda: documentos_db.DocumentosDB().get_documentos_filtered_as_tuples(
+            eliminado=False)),
+        ('Documentos por cliente', lambda: documentos_db.DocumentosDB().get_documentos_filtered_as_tuples(
+            eliminado=False, cliente_ids=[cliente])),
+        ('Documentos por cliente y tipo', lambda: documentos_db.DocumentosDB().get_documentos_filtered_as_tuples(
+            eliminado=False, cliente_ids=[cliente], tipo_documento='Poder')),
+        ('Contabilidad por cliente', lambda: contabilidad_db.ContabilidadDB().get_filtered_contabilidad_records(
+            cliente_id=cliente)),
+        ('Contabilidad por cliente y tipo', lambda: contabilidad_db.ContabilidadDB().get_filtered_contabilidad_records(
+            cliente_id=cliente, tipo_id=2)),
+    ]
+
+
+def medir(engine, caso, repeticiones):
+    """Devuelve (segundos promedio, planes de consulta) de un caso."""
+    sentencias = []
+
+    def capturar(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            sentencias.append((statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', capturar)
+    try:
+        caso()
+    finally:
+        event.remove(engine, 'before_cursor_execute', capturar)
+
+    planes = []
+    with engine.connect() as conn:
+        for statement, parameters in sentencias:
+            cursor = conn.connection.cursor()
+            filas = cursor.execute(f'EXPLAIN QUERY PLAN {statement}', parameters).fetchall()
+            planes.extend(fila[-1] for fila in filas)
+
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        caso()
+    return (time.perf_counter() - inicio) / repeticiones, planes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clientes', type=int, default=500)
+    parser.add_argument('--documentos', type=int, default=50000)
+    parser.add_argument('--movimientos', type=int, default=100000)
+    parser.add_argument('--repeticiones', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        engine = create_engine(f"sqlite:///{os.path.join(carpeta, 'benchmark.db')}")
+        Base.metadata.create_all(engine)
+        poblar(engine, args.clientes, args.documentos, args.movimientos)
+
+        # Los módulos DB obtienen sus sesiones de get_db_session(); se redirigen a la base temporal.
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        documentos_db.get_db_session = session_factory
+        contabilidad_db.get_db_session = session_factory
+
+        resultados = {}
+        for fase in ('sin índices', 'con índices'):
+            with engine.begin() as conn:
+                for nombre in INDICES_NUEVOS:
+                    if fase == 'sin índices':
+                        conn.execute(text(f'DROP INDEX IF EXISTS {nombre}'))
+                if fase == 'con índices':
+                    for indice in (i for tabla in Base.metadata.sorted_tables for i in tabla.indexes):
+                        if indice.name in INDICES_NUEVOS:
+                            indice.create(conn, checkfirst=True)
+                conn.execute(text('ANALYZE'))
+
+            print(f'\n=== {fase.upper()} ===')
+            for nombre, caso in casos(args.clientes):
+                segundos, planes = medir(engine, caso, args.repeticiones)
+                resultados.setdefault(nombre, []).append(segundos)
+                print(f'\n{nombre}: {segundos * 1000:.1f} ms')
+                for plan in planes:
+                    print(f'    {plan}')
+
+        print('\n=== RESUMEN ===')
+        for nombre, (antes, despues) in resultados.items():
+            print(f'{nombre:<35} {antes * 1000:>9.1f} ms -> {despues * 1000:>9.1f} ms  (x{antes / despues:.1f})')
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
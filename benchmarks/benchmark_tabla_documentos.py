@@ -0,0 +1,162 @@
+# benchmarks/benchmark_tabla_documentos.py
+"""
+Microbenchmark del repintado de la tabla de documentos (DocumentosTableModel.data).
+
+Compara el modelo actual, que sirve textos y colores precalculados al recibir los datos,
+con la implementación anterior, que formateaba cada celda en cada repintado
+(cadena de comparaciones sobre HEADERS, os.path.splitext, strftime y un QColor nuevo por llamada).
+
+Hace dos mediciones sobre N filas sintéticas:
+  1. Llamadas directas a data() recorriendo la tabla de arriba abajo, una "pantalla" por paso.
+  2. Repintado real de un QTableView (plataforma offscreen) desplazando la barra de scroll.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/benchmark_tabla_documentos.py [--filas 100000] [--filas-visibles 40]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Añade la ruta del proyecto para que las importaciones funcionen
+sys.path.insert(0, os.getcwd())
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QApplication, QTableView
+
+from SELECTA_SCAM.modulos.documentos.documentos_widget import DocumentosTableModel, FILE_TYPE_COLORS
+
+EXTENSIONES = ['.pdf', '.docx', '.xlsx', '.jpg', '.txt', '.png', '.msg']
+TIPOS_DOCUMENTO = ['Demanda', 'Poder', 'Auto', 'Sentencia', 'Memorial', 'Contrato']
+
+
+class ModeloSinCache(DocumentosTableModel):
+    """data() tal como estaba antes del caché de presentación (referencia para comparar)."""
+
+    def _preparar_filas(self, filas):
+        pass  # La versión anterior no precalculaba nada
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self._data)):
+            return None
+
+        doc_tuple = self._data[index.row()]
+        col_name = self.HEADERS[index.column()]
+
+        if role == Qt.DisplayRole:
+            try:
+                if col_name == 'ID Cliente': return str(doc_tuple[0])
+                elif col_name == 'ID': return str(doc_tuple[1])
+                elif col_name == 'Cliente': return str(doc_tuple[2])
+                elif col_name == 'Nombre Documento': return str(doc_tuple[3])
+                elif col_name == 'Tipo Archivo':
+                    ubicacion = doc_tuple[4]
+                    return os.path.splitext(ubicacion)[1].upper().replace('.', '') if ubicacion else "N/A"
+                elif col_name == 'Tipo Documento': return str(doc_tuple[5])
+                elif col_name == 'Fecha Carga':
+                    value = doc_tuple[6]
+                    return value.strftime("%Y-%m-%d %H:%M:%S") if isinstance(value, datetime) else str(value or "")
+                elif col_name == 'Ubicación Archivo': return str(doc_tuple[7])
+                elif col_name == 'Eliminado': return "Sí" if doc_tuple[8] else "No"
+            except IndexError:
+                return ""
+
+        elif role == Qt.ForegroundRole:
+            if col_name == 'Tipo Archivo':
+                try:
+                    ubicacion = doc_tuple[4]
+                    if ubicacion and isinstance(ubicacion, str):
+                        extension = os.path.splitext(ubicacion)[1].upper().replace('.', '')
+                        color_hex = FILE_TYPE_COLORS.get(extension, "#000000")
+                        return QColor(color_hex)
+                except IndexError:
+                    pass
+
+        return None
+
+
+def generar_filas(n):
+    rnd = random.Random(42)
+    inicio = datetime(2020, 1, 1)
+    filas = []
+    for i in range(1, n + 1):
+        cliente_id = rnd.randint(1, 2000)
+        ubicacion = os.path.join('Documentos_Guardados', str(cliente_id), f'documento_{i}{rnd.choice(EXTENSIONES)}')
+        filas.append((
+            cliente_id, i, f'Cliente {cliente_id}', f'Documento {i}', ubicacion,
+            rnd.choice(TIPOS_DOCUMENTO), inicio + timedelta(minutes=rnd.randint(0, 2_000_000)),
+            ubicacion, False,
+        ))
+    return filas
+
+
+def medir_data(modelo, filas_visibles):
+    """Recorre la tabla completa pidiendo todas las celdas visibles en cada paso, como hace la vista."""
+    roles = (Qt.DisplayRole, Qt.ForegroundRole, Qt.BackgroundRole, Qt.FontRole, Qt.TextAlignmentRole)
+    columnas = modelo.columnCount()
+    index = modelo.index
+    data = modelo.data
+    inicio = time.perf_counter()
+    for primera in range(0, modelo.rowCount(), filas_visibles):
+        for fila in range(primera, min(primera + filas_visibles, modelo.rowCount())):
+            for columna in range(columnas):
+                idx = index(fila, columna)
+                for rol in roles:
+                    data(idx, rol)
+    return time.perf_counter() - inicio
+
+
+def medir_repintado(modelo, pasos):
+    """Desplaza un QTableView real y fuerza el repintado del viewport en cada paso."""
+    vista = QTableView()
+    vista.resize(1400, 900)
+    vista.setModel(modelo)
+    vista.show()
+    QApplication.processEvents()
+    barra = vista.verticalScrollBar()
+    maximo = barra.maximum()
+    inicio = time.perf_counter()
+    for paso in range(pasos):
+        barra.setValue(maximo * paso // max(pasos - 1, 1))
+        vista.viewport().grab()  # Pinta el viewport completo en un pixmap
+    transcurrido = time.perf_counter() - inicio
+    vista.close()
+    return transcurrido
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filas', type=int, default=100_000)
+    parser.add_argument('--filas-visibles', type=int, default=40)
+    parser.add_argument('--pasos-repintado', type=int, default=500)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    filas = generar_filas(args.filas)
+    print(f"{args.filas} filas sintéticas, {args.filas_visibles} filas visibles por pantalla\n")
+
+    resultados = {}
+    for nombre, clase in (("sin caché", ModeloSinCache), ("con caché", DocumentosTableModel)):
+        modelo = clase(None)
+        inicio = time.perf_counter()
+        modelo.set_data(filas)
+        carga = time.perf_counter() - inicio
+        t_data = medir_data(modelo, args.filas_visibles)
+        t_repintado = medir_repintado(modelo, args.pasos_repintado)
+        resultados[nombre] = (carga, t_data, t_repintado)
+        print(f"{nombre:>10}: set_data {carga * 1000:8.1f} ms | "
+              f"data() scroll completo {t_data * 1000:9.1f} ms | "
+              f"{args.pasos_repintado} repintados {t_repintado * 1000:8.1f} ms "
+              f"({t_repintado / args.pasos_repintado * 1000:.2f} ms/frame)")
+
+    antes, despues = resultados["sin caché"], resultados["con caché"]
+    print(f"\nAceleración data(): {antes[1] / despues[1]:.1f}x | repintado: {antes[2] / despues[2]:.1f}x")
+    app.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,30 +1,38 @@
-import sqlite3
-import bcrypt
+# crear_usuario_admin.py
+import sys
+import os
 
-DATABASE_PATH = "data/base_datos.db"  # Ajusta si usas otro nombre o ruta
+# Añade la ruta del proyecto para que las importaciones funcionen
+sys.path.insert(0, os.getcwd())
+
+from SELECTA_SCAM.utils.db_manager import get_db_session
+from SELECTA_SCAM.db.usuarios_db import UsuariosDB
+from SELECTA_SCAM.usuarios.seguridad import hash_password
 
-def crear_usuario_admin():
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
 
+def crear_usuario_admin():
+    """
+    Crea el usuario administrador inicial en la base de datos configurada en
+    config/settings.py (la misma que usa la aplicación).
+    """
     username = "admin"
     password = "admin123"
-    role = "administrador"
-
-    # Encriptar la contraseña correctamente
-    hashed_password = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
 
+    usuarios_db = UsuariosDB()
+    session = get_db_session()
     try:
-        cursor.execute(
-            "INSERT INTO usuarios (usuario, contrasena, rol) VALUES (?, ?, ?)",
-            (username, hashed_password, role)
-        )
-        conn.commit()
-        print("✅ Usuario 'admin' creado con éxito.")
-    except sqlite3.IntegrityError:
-        print("⚠️ El usuario 'admin' ya existe.")
-
-    conn.close()
+        if usuarios_db.usuario_existe(session, username):
+            print(f"⚠️ El usuario '{username}' ya existe.")
+            return
+        # El hash debe ser el mismo que verifica el login (usuarios/seguridad.py)
+        if usuarios_db.insertar_usuario(session, username, hash_password(password), es_admin=True):
+            session.commit()
+            print(f"✅ Usuario '{username}' creado con éxito.")
+    except Exception as e:
+        session.rollback()
+        print(f"Ocurrió un error al crear el usuario '{username}': {e}")
+    finally:
+        session.close()
 
 if __name__ == "__main__":
     crear_usuario_admin()
@@ -0,0 +1,48 @@
+# tests/test_procesos_watcher.py
+
+import pytest
+
+pytest.importorskip("watchdog")
+pytest.importorskip("PyPDF2")
+
+from SELECTA_SCAM.config import settings
+from SELECTA_SCAM.modulos.procesos.procesos_watcher import VigilanteDescargas
+
+
+@pytest.fixture
+def vigilante(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "WATCHER_ESTABILIDAD_S", 0)
+    return VigilanteDescargas(str(tmp_path), hilos=1, trabajos_db=object())
+
+
+def test_pdf_vacio_sale_de_la_espera(vigilante, tmp_path):
+    ruta = tmp_path / "vacio.pdf"
+    ruta.write_bytes(b"")
+    vigilante.detectado(str(ruta))
+
+    assert vigilante._revisar_candidatos() == []  # Primera revisión: anota tamaño y fecha
+    assert vigilante._revisar_candidatos() == []  # Sin cambios y vacío: se descarta
+    assert not vigilante._hay_por_clasificar()
+
+
+def test_pdf_estable_pasa_a_la_cola(vigilante, tmp_path):
+    ruta = tmp_path / "lleno.pdf"
+    ruta.write_bytes(b"%PDF-1.4")
+    vigilante.detectado(str(ruta))
+
+    assert vigilante._revisar_candidatos() == []
+    assert vigilante._revisar_candidatos() == [str(ruta)]
+    assert not vigilante._candidatos
+
+
+def test_pdf_vacio_que_luego_se_escribe_se_procesa(vigilante, tmp_path):
+    ruta = tmp_path / "descarga.pdf"
+    ruta.write_bytes(b"")
+    vigilante.detectado(str(ruta))
+    vigilante._revisar_candidatos()
+    vigilante._revisar_candidatos()
+
+    ruta.write_bytes(b"%PDF-1.4")
+    vigilante.detectado(str(ruta))  # Lo que haría on_modified
+    vigilante._revisar_candidatos()
+    assert vigilante._revisar_candidatos() == [str(ruta)]